@@ -1,11 +1,120 @@
 from azure.identity import DefaultAzureCredential
 from azure.keyvault.secrets import SecretClient
+import base64
+import json
 import logging
+import os
+import threading
+import time
+
+# Seconds a secret is served from memory before the vault is asked again
+DEFAULT_SECRET_TTL = 900
+
+# Seconds a secret stays valid in the encrypted on-disk cache
+DEFAULT_DISK_CACHE_TTL = 86400
+
+class LocalSecret:
+    """Minimal stand-in for azure.keyvault.secrets.KeyVaultSecret"""
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+class LocalSecretClient:
+    """Dictionary-backed secret client for tests and offline development
+
+    Can be passed to AzureKeyVaultClient(secret_client=...) in place of the
+    Azure SecretClient. Counts lookups so tests can assert on cache hits.
+    """
+    def __init__(self, secrets=None):
+        self.secrets = dict(secrets or {})
+        self.calls = 0
+
+    def get_secret(self, secret_name):
+        """Return a secret object with a .value attribute"""
+        self.calls += 1
+        if secret_name not in self.secrets:
+            raise KeyError(f"Secret '{secret_name}' not found")
+        return LocalSecret(secret_name, self.secrets[secret_name])
+
+class EncryptedSecretFile:
+    """On-disk secret cache encrypted with the Windows Data Protection API
+
+    Values are encrypted for the current Windows user. When DPAPI is not
+    available the cache is disabled and every method is a no-op.
+    """
+    def __init__(self, path, ttl=DEFAULT_DISK_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        try:
+            import win32crypt
+            self._crypt = win32crypt
+        except ImportError:
+            self._crypt = None
+            logging.info("win32crypt not available, encrypted secret cache disabled")
+
+    @property
+    def enabled(self):
+        return self._crypt is not None and bool(self.path)
+
+    def load(self):
+        """Load the unexpired entries as {name: (value, expires_at)}"""
+        if not self.enabled or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'rb') as f:
+                encrypted = base64.b64decode(f.read())
+            _, decrypted = self._crypt.CryptUnprotectData(encrypted, None, None, None, 0)
+            entries = json.loads(decrypted.decode('utf-8'))
+            now = time.time()
+            return {name: (value, expires_at) for name, (value, expires_at) in entries.items() if expires_at > now}
+        except Exception as e:
+            logging.warning(f"Could not read encrypted secret cache: {str(e)}")
+            return {}
+
+    def save(self, entries):
+        """Encrypt and write {name: (value, expires_at)} entries"""
+        if not self.enabled:
+            return
+        try:
+            data = json.dumps(entries).encode('utf-8')
+            encrypted = self._crypt.CryptProtectData(data, "MPR Separator secrets", None, None, None, 0)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'wb') as f:
+                f.write(base64.b64encode(encrypted))
+        except Exception as e:
+            logging.warning(f"Could not write encrypted secret cache: {str(e)}")
+
+    def clear(self):
+        """Delete the cache file"""
+        if self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logging.warning(f"Could not delete encrypted secret cache: {str(e)}")
 
 class AzureKeyVaultClient:
-    def __init__(self, vault_url="https://mprkv2024az.vault.azure.net/"):
-        """Initialize Azure Key Vault client with the specified vault URL"""
+    def __init__(self, vault_url="https://mprkv2024az.vault.azure.net/", secret_client=None,
+                 ttl=DEFAULT_SECRET_TTL, cache_path=None):
+        """Initialize Azure Key Vault client with the specified vault URL
+
+        Args:
+            vault_url (str): URL of the Key Vault
+            secret_client: Optional client with get_secret(name), e.g. LocalSecretClient
+            ttl (float): Seconds a secret is cached in memory
+            cache_path (str): Optional path of the encrypted on-disk cache
+        """
         self.vault_url = vault_url
+        self.ttl = ttl
+        self._cache = {}  # name -> (value, expires_at)
+        self._disk_expiry = {}  # name -> expires_at in the on-disk cache
+        self._lock = threading.Lock()
+        self.disk_cache = EncryptedSecretFile(cache_path) if cache_path else None
+
+        if secret_client is not None:
+            self.credential = None
+            self.client = secret_client
+            return
+
         try:
             self.credential = DefaultAzureCredential()
             self.client = SecretClient(vault_url=self.vault_url, credential=self.credential)
@@ -13,15 +122,62 @@ class AzureKeyVaultClient:
             logging.error(f"Failed to initialize Azure Key Vault client: {str(e)}")
             raise
 
+        # Warm the memory cache from disk so cold starts don't wait on the vault
+        if self.disk_cache and self.disk_cache.enabled:
+            expires_at = time.time() + self.ttl
+            for name, (value, disk_expires_at) in self.disk_cache.load().items():
+                self._cache[name] = (value, expires_at)
+                self._disk_expiry[name] = disk_expires_at
+
     def get_secret(self, secret_name):
-        """Retrieve a secret from Azure Key Vault by name"""
+        """Retrieve a secret from Azure Key Vault by name, served from cache while fresh"""
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(secret_name)
+            if cached and cached[1] > now:
+                return cached[0]
+
         try:
             secret = self.client.get_secret(secret_name)
-            return secret.value
         except Exception as e:
             logging.error(f"Failed to retrieve secret '{secret_name}': {str(e)}")
             raise
 
+        with self._lock:
+            self._cache[secret_name] = (secret.value, now + self.ttl)
+            self._disk_expiry[secret_name] = now + (self.disk_cache.ttl if self.disk_cache else self.ttl)
+        self._save_disk_cache()
+        return secret.value
+
+    def invalidate(self, secret_name=None):
+        """Drop cached secrets, e.g. after the database rejected the credentials
+
+        Args:
+            secret_name (str): Secret to drop, or None to drop every secret
+        """
+        with self._lock:
+            if secret_name is None:
+                self._cache.clear()
+                self._disk_expiry.clear()
+            else:
+                self._cache.pop(secret_name, None)
+                self._disk_expiry.pop(secret_name, None)
+
+        if self.disk_cache:
+            if secret_name is None:
+                self.disk_cache.clear()
+            else:
+                self._save_disk_cache()
+
+    def _save_disk_cache(self):
+        """Persist the current secrets with their on-disk expiry times"""
+        if not self.disk_cache or not self.disk_cache.enabled:
+            return
+        with self._lock:
+            entries = {name: (value, self._disk_expiry[name])
+                       for name, (value, _) in self._cache.items() if name in self._disk_expiry}
+        self.disk_cache.save(entries)
+
 def get_sql_connection_string():
     """Get SQL connection string from Azure Key Vault"""
     try:
@@ -40,4 +196,4 @@ if __name__ == "__main__":
         print(f"Successfully retrieved connection string")
         # Don't print the actual connection string in production code
     except Exception as e:
-        print(f"Error: {str(e)}")
\ No newline at end of file
+        print(f"Error: {str(e)}")
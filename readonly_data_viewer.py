@@ -3,6 +3,8 @@ from pathlib import Path
 import pandas as pd
 from datetime import datetime, timedelta
 import os
+import shutil
+import tempfile
 from dotenv import load_dotenv
 
 # Import the read-only SQL service
@@ -29,9 +31,10 @@ def main():
             print("3. Search by date range")
             print("4. Search by order number")
             print("5. Search by separator name")
-            print("6. Exit")
+            print("6. Separator productivity report")
+            print("7. Exit")
             
-            choice = input("\nSelect an option (1-6): ")
+            choice = input("\nSelect an option (1-7): ")
             
             if choice == "1":
                 # Load recent data
@@ -39,9 +42,8 @@ def main():
                 display_data(df)
             
             elif choice == "2":
-                # Load all data
-                df = sql_service.load_all_data()
-                display_data(df)
+                # Stream all data in chunks
+                display_chunks(sql_service.fetch_iter())
             
             elif choice == "3":
                 # Search by date range
@@ -72,6 +74,27 @@ def main():
                 display_data(df)
             
             elif choice == "6":
+                # Summary grouped on the server
+                from_date = input("Enter start date (YYYY-MM-DD, blank for last 30 days): ").strip()
+                to_date = input("Enter end date (YYYY-MM-DD, blank for today): ").strip()
+                by_day = input("One row per day? (y/n): ").lower() == 'y'
+                
+                # Validate dates
+                try:
+                    if from_date:
+                        pd.to_datetime(from_date)
+                    else:
+                        from_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+                    if to_date:
+                        pd.to_datetime(to_date)
+                except:
+                    print("Invalid date format. Please use YYYY-MM-DD.")
+                    continue
+                
+                df = sql_service.fetch_separator_summary(from_date=from_date, to_date=to_date or None, by_day=by_day)
+                display_summary(df)
+            
+            elif choice == "7":
                 print("Exiting application.")
                 break
             
@@ -111,5 +134,76 @@ def display_data(df):
         df.to_excel(filename, index=False)
         print(f"Data exported to {filename}")
 
+def display_summary(df):
+    """Display a separator productivity summary"""
+    if df.empty:
+        print("No data found.")
+        return
+    
+    # Format the summary for display
+    df_display = df.copy()
+    if 'Day' in df_display.columns:
+        df_display['Day'] = df_display['Day'].dt.strftime('%Y-%m-%d')
+    df_display['AnalysisRatio'] = (df_display['AnalysisRatio'] * 100).map('{:.1f}%'.format)
+    if 'OrdersPerDay' in df_display.columns:
+        df_display['OrdersPerDay'] = df_display['OrdersPerDay'].round(1)
+    
+    print(f"\n{int(df['Orders'].sum())} orders in {len(df)} summary rows:")
+    pd.set_option('display.width', 120)    # Set width for better display
+    print(df_display.to_string(index=False))
+    
+    # Export option
+    export = input("\nExport to Excel? (y/n): ")
+    if export.lower() == 'y':
+        filename = f"separator_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        df.to_excel(filename, index=False)
+        print(f"Summary exported to {filename}")
+
+def display_chunks(chunks, preview_rows=20):
+    """Display records streamed in chunks without holding the full result in memory
+    
+    The first rows are printed and every chunk is spooled to a temporary CSV
+    file, so the complete result can still be exported afterwards.
+    """
+    total = 0
+    preview = None
+    spool = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='', encoding='utf-8')
+    try:
+        with spool:
+            for chunk in chunks:
+                if preview is None:
+                    preview = chunk.head(preview_rows).copy()
+                chunk.to_csv(spool, index=False, header=(total == 0))
+                total += len(chunk)
+                print(f"\rLoaded {total} records...", end='')
+        print()
+        
+        if total == 0:
+            print("No data found.")
+            return
+        
+        # Format dates for display
+        if 'DateOfSeparation' in preview.columns:
+            preview['DateOfSeparation'] = preview['DateOfSeparation'].dt.strftime('%Y-%m-%d')
+        
+        # Display data
+        print(f"\nFound {total} records:")
+        pd.set_option('display.width', 120)    # Set width for better display
+        print(preview)
+        
+        if total > len(preview):
+            print(f"(Showing {len(preview)} of {total} records)")
+        
+        # Export option (CSV, since large results exceed Excel's row limit)
+        export = input("\nExport to CSV? (y/n): ")
+        if export.lower() == 'y':
+            filename = f"separator_data_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            shutil.move(spool.name, filename)
+            print(f"Data exported to {filename}")
+    finally:
+        # Remove the spool file unless it was exported, also when reading fails or is interrupted
+        if os.path.exists(spool.name):
+            os.remove(spool.name)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,12 +4,19 @@ import os
 from datetime import datetime
 import logging
 
+from src.services.connection_pool import get_pool
+from src.services.record_queries import build_fetch_query
+from src.services.reports import (
+    build_summary_query, can_use_daily_summary, daily_summary_exists, summary_to_dataframe
+)
+
 class ReadOnlySQLService:
     """A read-only version of the SQL service for retrieving data without modification capabilities"""
     
     def __init__(self):
         self.connection = None
         self.cursor = None
+        self.pool = None
         
         # Set up logging
         logging.basicConfig(
@@ -18,53 +25,90 @@ class ReadOnlySQLService:
         )
         self.logger = logging.getLogger(__name__)
         
+    def _get_connection_string(self):
+        """Build the read-only connection string from environment variables"""
+        # Get database connection details from environment variables
+        server = os.environ.get("DB_SERVER", "")
+        database = os.environ.get("DB_NAME", "")
+        username = os.environ.get("DB_USERNAME", "readonlyuser")  # Default to readonly user
+        password = os.environ.get("DB_PASSWORD", "")
+        
+        if not server or not database or not password:
+            raise ValueError("Database connection environment variables not set properly")
+        
+        # Create connection string
+        return (
+            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+            f"SERVER={server};"
+            f"DATABASE={database};"
+            f"UID={username};"
+            f"PWD={password};"
+            f"Encrypt=yes;TrustServerCertificate=no;Connection Timeout=30;"
+        )
+    
     def connect(self):
         """Connect to the SQL Server database using read-only credentials"""
         try:
-            # Get database connection details from environment variables
-            server = os.environ.get("DB_SERVER", "")
-            database = os.environ.get("DB_NAME", "")
-            username = os.environ.get("DB_USERNAME", "readonlyuser")  # Default to readonly user
-            password = os.environ.get("DB_PASSWORD", "")
-            
-            if not server or not database or not password:
-                raise ValueError("Database connection environment variables not set properly")
-            
-            # Create connection string
-            conn_str = (
-                f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-                f"SERVER={server};"
-                f"DATABASE={database};"
-                f"UID={username};"
-                f"PWD={password};"
-                f"Encrypt=yes;TrustServerCertificate=no;Connection Timeout=30;"
-            )
+            conn_str = self._get_connection_string()
             
-            # Connect to the database
-            self.connection = pyodbc.connect(conn_str)
+            # Borrow a warm connection from the shared pool
+            self.pool = get_pool(conn_str)
+            self.connection = self.pool.acquire()
             self.cursor = self.connection.cursor()
             
-            self.logger.info(f"Connected to SQL Server database successfully as {username}")
+            self.logger.debug(f"Connected to SQL Server database successfully as {os.environ.get('DB_USERNAME', 'readonlyuser')}")
             return True
             
         except Exception as e:
             self.logger.error(f"Database connection error: {str(e)}")
+            if self.connection and self.pool:
+                self.pool.release(self.connection, discard=True)
             self.connection = None
             self.cursor = None
             raise
     
     def disconnect(self):
-        """Close the database connection"""
+        """Return the database connection to the pool"""
         if self.cursor:
-            self.cursor.close()
+            try:
+                self.cursor.close()
+            except pyodbc.Error:
+                pass
         
         if self.connection:
-            self.connection.close()
-            self.logger.info("Disconnected from SQL Server database")
+            if self.pool:
+                self.pool.release(self.connection)
+            else:
+                self.connection.close()
+            self.logger.debug("Released SQL Server database connection")
             
         self.cursor = None
         self.connection = None
     
+    def _build_fetch_query(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False):
+        """Build the filtered SELECT used by fetch_data and fetch_iter"""
+        # Get the table name from environment variables, with a default
+        table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+        
+        # Same query as SQLService, ordered by date descending
+        return build_fetch_query(table_name, from_date, to_date, order_number, separator_name, analysis_only)
+    
+    def _rows_to_dataframe(self, rows, cursor):
+        """Convert fetched pyodbc rows into a DataFrame with typed columns"""
+        # Convert to pandas DataFrame
+        columns = [column[0] for column in cursor.description]
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        
+        # Convert 'DateOfSeparation' to datetime
+        if 'DateOfSeparation' in df.columns:
+            df['DateOfSeparation'] = pd.to_datetime(df['DateOfSeparation'])
+        
+        # Convert 'Analysis' to boolean
+        if 'Analysis' in df.columns:
+            df['Analysis'] = df['Analysis'].astype(bool)
+        
+        return df
+    
     def fetch_data(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False):
         """Fetch data from the database with optional filters"""
         try:
@@ -73,38 +117,7 @@ class ReadOnlySQLService:
                 if not self.connect():
                     raise ValueError("Failed to establish database connection")
             
-            # Get the table name from environment variables, with a default
-            table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
-            
-            # Build the SQL query with filters
-            query = f"SELECT Id, OrderNumber, SeparatorName, DateOfSeparation, Analysis FROM {table_name} WHERE 1=1"
-            params = []
-            
-            # Add date filters if specified
-            if from_date:
-                query += " AND DateOfSeparation >= ?"
-                params.append(from_date)
-            
-            if to_date:
-                query += " AND DateOfSeparation <= ?"
-                params.append(to_date)
-            
-            # Add order number filter if specified
-            if order_number:
-                query += " AND OrderNumber LIKE ?"
-                params.append(f"%{order_number}%")
-            
-            # Add separator name filter if specified
-            if separator_name:
-                query += " AND SeparatorName LIKE ?"
-                params.append(f"%{separator_name}%")
-            
-            # Add analysis filter if specified
-            if analysis_only:
-                query += " AND Analysis = 1"
-            
-            # Order by date descending
-            query += " ORDER BY DateOfSeparation DESC"
+            query, params = self._build_fetch_query(from_date, to_date, order_number, separator_name, analysis_only)
             
             # Check if cursor is available before executing
             if not self.cursor:
@@ -121,17 +134,7 @@ class ReadOnlySQLService:
                 self.logger.error("No description available for cursor")
                 return pd.DataFrame()
                 
-            # Convert to pandas DataFrame
-            columns = [column[0] for column in self.cursor.description]
-            df = pd.DataFrame.from_records(rows, columns=columns)
-            
-            # Convert 'DateOfSeparation' to datetime
-            if 'DateOfSeparation' in df.columns:
-                df['DateOfSeparation'] = pd.to_datetime(df['DateOfSeparation'])
-            
-            # Convert 'Analysis' to boolean
-            if 'Analysis' in df.columns:
-                df['Analysis'] = df['Analysis'].astype(bool)
+            df = self._rows_to_dataframe(rows, self.cursor)
             
             self.logger.info(f"Successfully fetched {len(df)} records from database")
             return df
@@ -144,6 +147,79 @@ class ReadOnlySQLService:
             # Disconnect from the database
             self.disconnect()
     
+    def fetch_iter(self, from_date=None, to_date=None, order_number=None, separator_name=None,
+                   analysis_only=False, chunk_size=10000):
+        """Yield query results as DataFrame chunks of at most chunk_size rows
+        
+        The generator uses its own pooled connection; stopping early cancels
+        the pending query and returns the connection to the pool.
+        """
+        query, params = self._build_fetch_query(from_date, to_date, order_number, separator_name, analysis_only)
+        pool = get_pool(self._get_connection_string())
+        connection = pool.acquire()
+        cursor = None
+        exhausted = False
+        
+        try:
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    exhausted = True
+                    break
+                yield self._rows_to_dataframe(rows, cursor)
+                
+        except Exception as e:
+            self.logger.error(f"Error fetching data from database: {str(e)}")
+            raise
+            
+        finally:
+            if cursor:
+                try:
+                    # Stop the server from streaming rows nobody will read
+                    if not exhausted:
+                        cursor.cancel()
+                    cursor.close()
+                except pyodbc.Error:
+                    pass
+            pool.release(connection)
+    
+    def fetch_separator_summary(self, from_date=None, to_date=None, separator_name=None, by_day=True):
+        """Count orders and analyses per separator (and per day) on the server"""
+        try:
+            # Connect to the database
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    raise ValueError("Failed to establish database connection")
+            
+            table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+            
+            # Read the rollup table instead of the records when it is enabled, exists and the filters allow
+            use_daily_summary = (
+                can_use_daily_summary(from_date, to_date)
+                and daily_summary_exists(self.cursor, table_name)
+            )
+            query, params = build_summary_query(table_name, from_date, to_date, separator_name, by_day,
+                                                use_daily_summary)
+            
+            self.cursor.execute(query, params)
+            rows = self.cursor.fetchall()
+            columns = [column[0] for column in self.cursor.description]
+            df = summary_to_dataframe(rows, columns, by_day)
+            
+            self.logger.info(f"Successfully fetched {len(df)} summary rows from database")
+            return df
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching separator summary from database: {str(e)}")
+            raise
+            
+        finally:
+            # Disconnect from the database
+            self.disconnect()
+    
     def load_data(self, days=7):
         """Load data from the last N days"""
         from_date = (datetime.now() - pd.Timedelta(days=days)).strftime('%Y-%m-%d')
@@ -0,0 +1,178 @@
+"""Script de manutenção do banco de dados do MPR Separator"""
+# Este script executa tarefas de manutenção no banco de dados do MPR Separator:
+# cria a tabela e os índices usados pelo aplicativo, verifica índices ausentes,
+# mede as consultas de busca e reconstrói a tabela de resumo diário.
+#
+# Uso: python setup_database.py <comando> [argumentos]
+#   create-schema                      Cria a tabela, o índice de datas e a chave única (se não existirem)
+#   check-indexes                      Lista os índices da tabela e os índices sugeridos pelo SQL Server
+#   profile [data_inicial] [pedido]    Executa a busca do aplicativo com SET STATISTICS IO/TIME/PROFILE
+#   rebuild-summary                    Cria (se necessário) e recalcula a tabela de resumo diário
+import os
+import sys
+import logging
+from datetime import datetime, timedelta
+
+from src.services.reports import daily_summary_table
+from src.services.schema import (
+    build_create_table, build_date_index, build_duplicate_key, count_duplicate_keys,
+    date_index_name, duplicate_key_name, list_indexes, missing_indexes, profile_query
+)
+from src.services.sql_service import DUPLICATE_KEY_COLUMNS, SQLService
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def create_schema():
+    """Cria a tabela de registros, o índice de datas e a chave única de duplicados"""
+    table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+    service = SQLService()
+
+    try:
+        service.connect()
+        cursor = service.cursor
+
+        print(f"Criando a tabela {table_name} (se não existir)...")
+        cursor.execute(build_create_table(table_name))
+
+        print(f"Criando o índice {date_index_name(table_name)} (DateOfSeparation DESC, Id DESC)...")
+        cursor.execute(build_date_index(table_name))
+
+        # A chave única só pode ser criada quando não há registros duplicados
+        duplicates = count_duplicate_keys(cursor, table_name)
+        if duplicates:
+            print(f"AVISO: Existem {duplicates} chaves ({', '.join(DUPLICATE_KEY_COLUMNS)}) duplicadas.")
+            print(f"A chave única {duplicate_key_name(table_name)} não foi criada. Remova os duplicados e execute novamente.")
+        else:
+            print(f"Criando a chave única {duplicate_key_name(table_name)}...")
+            cursor.execute(build_duplicate_key(table_name))
+
+        service.connection.commit()
+        print("Esquema do banco de dados verificado com sucesso.")
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao criar o esquema do banco de dados: {str(e)}")
+        if service.connection:
+            service.connection.rollback()
+        return False
+    finally:
+        service.disconnect()
+
+def check_indexes():
+    """Lista os índices existentes e os índices ausentes sugeridos pelo SQL Server"""
+    table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+    service = SQLService()
+
+    try:
+        service.connect()
+        cursor = service.cursor
+
+        print(f"Índices da tabela {table_name}:")
+        for index in list_indexes(cursor, table_name):
+            unique = " UNIQUE" if index['unique'] else ""
+            included = f" INCLUDE ({', '.join(index['included'])})" if index['included'] else ""
+            print(f"  {index['name']} ({index['type']}{unique}): {', '.join(index['keys'])}{included}")
+
+        # As sugestões exigem a permissão VIEW SERVER STATE (VIEW DATABASE STATE no Azure SQL)
+        try:
+            suggestions = missing_indexes(cursor, table_name)
+        except Exception as dmv_error:
+            print(f"AVISO: Não foi possível ler os índices ausentes: {str(dmv_error)}")
+            return True
+
+        if not suggestions:
+            print("Nenhum índice ausente sugerido pelo SQL Server.")
+            return True
+
+        print("\nÍndices ausentes sugeridos pelo SQL Server (maior ganho primeiro):")
+        for suggestion in suggestions:
+            print(f"  {suggestion['statement']}")
+            print(f"    buscas: {suggestion['seeks']}, varreduras: {suggestion['scans']}, "
+                  f"impacto estimado: {suggestion['impact']:.0f}%")
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao verificar os índices: {str(e)}")
+        return False
+    finally:
+        service.disconnect()
+
+def profile(from_date=None, order_number=None):
+    """Executa a busca do aplicativo e mostra as leituras, os tempos e o plano executado"""
+    if not from_date:
+        from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+    service = SQLService()
+
+    try:
+        service.connect()
+        query, params = service._build_fetch_query(from_date=from_date, order_number=order_number)
+        print(f"Consulta: {query}")
+        print(f"Parâmetros: {params}")
+
+        result = profile_query(service.cursor, query, params)
+        print(f"\nRegistros retornados: {result['rows']}")
+
+        print("\nEstatísticas (SET STATISTICS IO/TIME):")
+        for message in result['messages']:
+            print(f"  {message}")
+
+        print("\nPlano executado (linhas, execuções, operador):")
+        for rows, executes, operator in result['plan']:
+            print(f"  {str(rows):>10} {str(executes):>6}  {operator}")
+
+        # Varreduras na tabela indicam que o índice de datas não está sendo usado
+        if any('Table Scan' in (operator or '') or 'Clustered Index Scan' in (operator or '')
+               for _, _, operator in result['plan']):
+            print("\nAVISO: A consulta varre a tabela inteira. Execute 'python setup_database.py create-schema'.")
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao medir a consulta: {str(e)}")
+        return False
+    finally:
+        service.disconnect()
+
+def rebuild_summary():
+    """Cria a tabela de resumo diário (se não existir) e recalcula todas as linhas"""
+    table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+    summary_table = daily_summary_table(table_name)
+    print(f"Reconstruindo a tabela de resumo {summary_table} a partir de {table_name}...")
+
+    try:
+        summary_rows = SQLService().rebuild_daily_summary()
+        print(f"Tabela {summary_table} reconstruída com {summary_rows} linhas (dia x separador).")
+        print("Importações, edições e exclusões feitas pelo aplicativo passam a atualizá-la automaticamente.")
+        print("Defina MPR_DAILY_SUMMARY=1 no .env para que os relatórios a usem. Alterações feitas por scripts SQL")
+        print("ou por outros programas não a atualizam; nesse caso, execute este comando novamente.")
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao reconstruir a tabela de resumo: {str(e)}")
+        return False
+
+# Comandos disponíveis
+COMMANDS = {
+    "create-schema": create_schema,
+    "check-indexes": check_indexes,
+    "profile": profile,
+    "rebuild-summary": rebuild_summary,
+}
+
+def main():
+    """Função principal para executar um comando de manutenção"""
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print("Uso: python setup_database.py <comando> [argumentos]")
+        print(f"Comandos disponíveis: {', '.join(COMMANDS)}")
+        return False
+
+    return COMMANDS[sys.argv[1]](*sys.argv[2:])
+
+if __name__ == "__main__":
+    try:
+        success = main()
+        sys.exit(0 if success else 1)
+    except Exception as e:
+        logger.error(f"Erro não tratado durante a manutenção do banco de dados: {str(e)}")
+        print(f"ERRO: {str(e)}")
+        sys.exit(1)
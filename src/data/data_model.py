@@ -1,96 +1,435 @@
 import pandas as pd
 from datetime import datetime, timedelta
 import numpy as np
+import os
 
-class DataModel:
-    def __init__(self):
-        self.original_df = None
-        self.filtered_df = None
-    
-    def set_dataframe(self, df):
-        """Set the data from a dataframe and standardize column names"""
-        # Standardize column names (case-insensitive)
-        std_columns = {
-            'id': 'Id',
-            'record_id': 'Id',
-            'recordid': 'Id',
-            'ordernumber': 'OrderNumber',
-            'order': 'OrderNumber',
-            'order number': 'OrderNumber',
-            'order_number': 'OrderNumber',
-            'separatorname': 'SeparatorName',
-            'separator': 'SeparatorName',
-            'separator name': 'SeparatorName',
-            'separator_name': 'SeparatorName',
-            'dateofseparation': 'DateOfSeparation',
-            'date': 'DateOfSeparation',
-            'date of separation': 'DateOfSeparation',
-            'separation date': 'DateOfSeparation',
-            'separation_date': 'DateOfSeparation',
-            'analysis': 'Analysis',
-            'analisys': 'Analysis'
-        }
-        
-        # Rename columns (case insensitive)
-        df.columns = [col.strip() for col in df.columns]
-        for i, col in enumerate(df.columns):
-            lower_col = col.lower()
-            if lower_col in std_columns:
-                df = df.rename(columns={col: std_columns[lower_col]})
+from src.data.ngram_index import NGramIndex
+
+# Standardize column names (case-insensitive)
+STD_COLUMNS = {
+    'id': 'Id',
+    'record_id': 'Id',
+    'recordid': 'Id',
+    'ordernumber': 'OrderNumber',
+    'order': 'OrderNumber',
+    'order number': 'OrderNumber',
+    'order_number': 'OrderNumber',
+    'separatorname': 'SeparatorName',
+    'separator': 'SeparatorName',
+    'separator name': 'SeparatorName',
+    'separator_name': 'SeparatorName',
+    'dateofseparation': 'DateOfSeparation',
+    'date': 'DateOfSeparation',
+    'date of separation': 'DateOfSeparation',
+    'separation date': 'DateOfSeparation',
+    'separation_date': 'DateOfSeparation',
+    'analysis': 'Analysis',
+    'analisys': 'Analysis'
+}
+
+# Columns every record must have after normalization
+REQUIRED_COLUMNS = ['OrderNumber', 'SeparatorName', 'DateOfSeparation', 'Analysis']
+
+# Columns searched by substring, each backed by an NGramIndex
+TEXT_INDEX_COLUMNS = ('OrderNumber', 'SeparatorName')
+
+# Store OrderNumber as Arrow-backed strings when pyarrow is installed (MPR_ARROW_STRINGS=0 disables)
+ARROW_STRINGS = os.getenv("MPR_ARROW_STRINGS", "1") != "0"
+
+# SeparatorName becomes categorical when it has at most this share of distinct values
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Text accepted as a true/false Analysis flag (compared lowercased and stripped)
+TRUE_VALUES = ('yes', 'true', 't', 'y', '1')
+FALSE_VALUES = ('no', 'false', 'f', 'n', '0')
+
+# Date formats tried in order; the Brazilian dd-MM-yyyy forms come from
+# spreadsheets converted with excel-date-converter.js
+DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%d-%m-%Y',
+    '%d/%m/%Y',
+    '%d-%m-%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M:%S',
+    '%d-%m-%Y %H:%M:%S.%f',
+]
+
+def infer_date_format(values, sample_size=100):
+    """Find the first DATE_FORMATS entry that parses a sample of the values
+    
+    Returns:
+        str: The matching format, or None when no single format fits the sample
+    """
+    sample = values.dropna().astype(str).str.strip()
+    sample = sample[sample != ''].head(sample_size)
+    if sample.empty:
+        return None
+    
+    for date_format in DATE_FORMATS:
+        if pd.to_datetime(sample, format=date_format, errors='coerce').notna().all():
+            return date_format
+    return None
+
+def parse_dates(values, date_format=None):
+    """Parse a column of dates written in any of DATE_FORMATS
+    
+    Dates repeat a lot, so each distinct value is parsed once. Formats are
+    applied vectorized to the values still unparsed, starting with
+    date_format when given, so a column mixing ISO and dd-MM-yyyy dates is
+    read without per-row guessing.
+    
+    Args:
+        values: Series of strings, dates or datetimes
+        date_format (str): Optional format to try first, e.g. from infer_date_format
         
-        # Check for required columns and add if missing
-        required_columns = ['OrderNumber', 'SeparatorName', 'DateOfSeparation', 'Analysis']
-        for col in required_columns:
-            if col not in df.columns:
-                if col == 'Analysis':
-                    df[col] = False  # Default: no analysis
-                else:
-                    df[col] = ''
+    Returns:
+        Series: datetime64 values, NaT where nothing matched
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, errors='coerce')
+    
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+    pending = text != ''
+    
+    formats = DATE_FORMATS
+    if date_format:
+        formats = [date_format] + [f for f in DATE_FORMATS if f != date_format]
+    
+    for fmt in formats:
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+        pending &= parsed.isna()
+    
+    # Anything left gets pandas' own inference, day first as in Brazil
+    if pending.any():
+        parsed[pending] = pd.to_datetime(text[pending], errors='coerce', dayfirst=True)
+    
+    # Code -1 (missing value) picks the NaT appended at the end
+    lookup = np.append(parsed.to_numpy(), np.datetime64('NaT', 'ns'))
+    return pd.Series(lookup[codes], index=values.index)
+
+def _arrow_string_dtype():
+    """Arrow-backed string dtype, or None when pyarrow isn't installed or is disabled"""
+    if not ARROW_STRINGS:
+        return None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return pd.StringDtype("pyarrow")
+
+def memory_report(before, after):
+    """Compare the memory used by each column of two versions of a frame
+    
+    Args:
+        before: DataFrame as loaded
+        after: The same rows after compaction
         
-        # Convert DateOfSeparation to datetime if it's not already
-        if 'DateOfSeparation' in df.columns:
-            df['DateOfSeparation'] = pd.to_datetime(df['DateOfSeparation'], errors='coerce')
+    Returns:
+        str: Table with the dtype and bytes of each column, and the totals
+    """
+    before_bytes = before.memory_usage(deep=True, index=False)
+    after_bytes = after.memory_usage(deep=True, index=False)
+    
+    lines = [f"{'Column':<18}{'Before':>16}{'After':>16}{'Bytes before':>15}{'Bytes after':>15}"]
+    for column in after.columns:
+        old_dtype = str(before[column].dtype) if column in before.columns else '-'
+        old_bytes = int(before_bytes.get(column, 0))
+        lines.append(f"{column:<18}{old_dtype:>16}{str(after[column].dtype):>16}"
+                     f"{old_bytes:>15,}{int(after_bytes[column]):>15,}")
+    
+    total_before = int(before_bytes.sum())
+    total_after = int(after_bytes.sum())
+    saved = 100 * (1 - total_after / total_before) if total_before else 0
+    lines.append(f"{'Total':<50}{total_before:>15,}{total_after:>15,}  ({saved:.0f}% smaller)")
+    return "\n".join(lines)
+
+def concat_chunks(chunks):
+    """Concatenate an iterable of DataFrame chunks, returning None when there are no rows"""
+    frames = [chunk for chunk in chunks if chunk is not None and not chunk.empty]
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+class DataModel:
+    """Holds the loaded records and the rows selected by the current filters
+    
+    Filters never copy the data: they compose one boolean mask over the
+    columns of original_df and keep the matching row positions. filtered_df
+    is only built from those positions when it is read.
+    """
+    def __init__(self):
+        self._original_df = None
+        self._pages = []  # Frames added by append_dataframe, merged into original_df when it is read
+        self._selection = None  # Row positions in original_df, None for all rows
+        self._filtered_df = None  # filtered_df, built on first access
+        self._text_indexes = {}  # Column -> NGramIndex, built on first search
+        self._date_keys = None  # Sorted DateOfSeparation values as int64 nanoseconds
+        self._date_order = None  # Row positions in the order of _date_keys
+        self._date_format = None  # Cached by normalize_dataframe
+        self._id_positions = None  # Hash index of record IDs (as text) over original_df, built on first edit
+    
+    @property
+    def original_df(self):
+        """Every loaded record, with the appended pages merged in"""
+        if self._pages:
+            self._merge_pages()
+        return self._original_df
+    
+    @original_df.setter
+    def original_df(self, df):
+        self._original_df = df
+        self._pages = []
+    
+    @property
+    def filtered_df(self):
+        """The rows of original_df selected by the current filters
         
-        # Convert Analysis to boolean if it's not already
-        if 'Analysis' in df.columns:
-            # Determine the best way to convert to boolean
-            if df['Analysis'].dtype == bool:
-                pass  # Already boolean
-            elif df['Analysis'].dtype in [int, float]:
-                df['Analysis'] = df['Analysis'].astype(bool)
+        Always a separate frame, even when every row is selected, so
+        changes made through it never reach original_df. With every row
+        selected it is a full copy: pandas before 3.0 doesn't copy on write
+        by default, so a shallow copy would still share the column data.
+        """
+        if self._filtered_df is None and self.original_df is not None:
+            if self._selection is None:
+                self._filtered_df = self.original_df.copy()
             else:
-                # Convert various string representations to boolean
-                df['Analysis'] = df['Analysis'].apply(self._str_to_bool)
+                self._filtered_df = self.original_df.take(self._selection)
+        return self._filtered_df
+    
+    @filtered_df.setter
+    def filtered_df(self, df):
+        self._selection = None
+        self._filtered_df = df
+    
+    def _select_positions(self, positions):
+        """Select rows of original_df by position (None selects every row)"""
+        self._selection = positions
+        self._filtered_df = None
+    
+    def filtered_count(self):
+        """Number of rows selected by the current filters, without building filtered_df"""
+        if self._original_df is None:
+            return 0
+        if self._selection is None:
+            return self._row_count()
+        return len(self._selection)
+    
+    def _row_count(self):
+        """Number of loaded rows, including pages not merged yet"""
+        return len(self._original_df) + sum(len(page) for page in self._pages)
+    
+    def set_dataframe(self, df, select_all=False):
+        """Set the data from a dataframe and standardize column names
+        
+        Args:
+            df: DataFrame read from a file or the database
+            select_all (bool): Show every row instead of applying the default
+                filters (used for search results, which the server already filtered)
+        """
+        df = self.normalize_dataframe(df)
         
         # Store the original dataframe
         self.original_df = df
+        self._reset_indexes()
         
         # Check if this is a small sample dataset (less than 100 records)
         # If it's small, show all records. Otherwise, apply default filters
-        if len(df) < 100:
+        if select_all or len(df) < 100:
             # For small datasets, show all records
-            self.filtered_df = df.copy()
+            self._select_positions(None)
         else:
             # For large datasets, apply the 7-day filter
             self.apply_default_filters()
             
         # Check if the filtered data is empty after applying date filters
         # This happens if all data is outside the default date range
-        if self.filtered_df is None or self.filtered_df.empty:
+        if self.filtered_count() == 0:
             # If filtered data is empty, just show all data
-            self.filtered_df = df.copy()
+            self._select_positions(None)
+    
+    def append_dataframe(self, df):
+        """Add rows, such as the next page of a search, to the loaded records
+        
+        Only the new rows are normalized and compacted. They wait in a list
+        until original_df is read, then every waiting page is concatenated
+        once and the built search indexes are extended with the new rows,
+        so loading page after page never copies or re-indexes the rows
+        already loaded.
+        
+        Returns:
+            DataFrame: The normalized new rows
+        """
+        df = self.normalize_dataframe(df)
+        if self._original_df is None:
+            self.set_dataframe(df, select_all=True)
+            return df
+        if df.empty:
+            return df
+        
+        start = self._row_count()
+        self._pages.append(df)
+        
+        if self._selection is None:
+            self._select_positions(None)
+        else:
+            self._select_positions(np.concatenate([self._selection, np.arange(start, start + len(df))]))
+        return df
+    
+    def _merge_pages(self):
+        """Concatenate the appended pages onto original_df and extend the indexes"""
+        pages = self._pages
+        self._pages = []
+        frames = [self._original_df] + pages
+        
+        # Give every part the same categories, so the concatenated column stays categorical
+        names = [frame['SeparatorName'] for frame in frames]
+        if all(isinstance(column.dtype, pd.CategoricalDtype) for column in names):
+            categories = names[0].cat.categories.append([column.cat.categories for column in names[1:]]).unique()
+            frames = [
+                frame if frame['SeparatorName'].cat.categories.equals(categories)
+                else frame.assign(SeparatorName=frame['SeparatorName'].cat.set_categories(categories))
+                for frame in frames
+            ]
+        
+        start = len(self._original_df)
+        self._original_df = pd.concat(frames, ignore_index=True)
+        
+        # Index the new rows only
+        new_rows = self._original_df.iloc[start:]
+        for column, index in self._text_indexes.items():
+            index.append(new_rows[column])
+        if self._id_positions is not None:
+            self._id_positions = self._id_positions.append(
+                pd.Index(new_rows['Id'].astype(str).to_numpy(dtype=object))
+            )
+        # Rebuilt on the next date filter
+        self._date_keys = None
+        self._date_order = None
+        self._filtered_df = None
+    
+    def _reset_indexes(self):
+        """Drop the search indexes so they are rebuilt for the current data"""
+        self._text_indexes = {}
+        self._date_keys = None
+        self._date_order = None
+        self._id_positions = None
+    
+    def normalize_dataframe(self, df, compact=True):
+        """Standardize column names and types without storing the data
+        
+        Used by set_dataframe and by the streaming importer for each chunk.
+        
+        Args:
+            df: DataFrame read from a file or the database
+            compact (bool): Whether to store columns in compact dtypes (see compact_dataframe)
+            
+        Returns:
+            DataFrame: Frame with OrderNumber, SeparatorName, DateOfSeparation and Analysis
+        """
+        # Rename columns (case insensitive) with a single mapping
+        df = df.rename(columns=lambda col: STD_COLUMNS.get(str(col).strip().lower(), str(col).strip()))
+        
+        # Check for required columns and add if missing
+        for col in REQUIRED_COLUMNS:
+            if col not in df.columns:
+                if col == 'Analysis':
+                    df[col] = False  # Default: no analysis
+                else:
+                    df[col] = ''
+        
+        # Convert DateOfSeparation to datetime if it's not already
+        if 'DateOfSeparation' in df.columns:
+            dates = df['DateOfSeparation']
+            # Infer the file's date format once and reuse it for later chunks
+            if self._date_format is None and not pd.api.types.is_datetime64_any_dtype(dates):
+                self._date_format = infer_date_format(dates)
+            df['DateOfSeparation'] = parse_dates(dates, self._date_format)
+        
+        # Convert Analysis to boolean if it's not already
+        if 'Analysis' in df.columns:
+            df['Analysis'] = self._to_bool(df['Analysis'])
+        
+        if compact:
+            df = self.compact_dataframe(df)
+        
+        return df
+    
+    def compact_dataframe(self, df):
+        """Store the record columns in compact dtypes
+        
+        Id becomes int32 (int64 when the values don't fit), SeparatorName a
+        category since a few dozen names repeat across all rows, and
+        OrderNumber Arrow-backed strings when pyarrow is available.
+        DateOfSeparation and Analysis are already datetime64 and bool.
+        
+        Args:
+            df: Normalized DataFrame
+            
+        Returns:
+            DataFrame: The same frame with compact columns
+        """
+        if 'Id' in df.columns and not pd.api.types.is_integer_dtype(df['Id']):
+            ids = pd.to_numeric(df['Id'], errors='coerce')
+            # Only convert when every ID is a whole number
+            if ids.notna().all() and (ids % 1 == 0).all():
+                df['Id'] = ids.astype(np.int64)
+        if 'Id' in df.columns and pd.api.types.is_integer_dtype(df['Id']) and len(df):
+            if df['Id'].min() >= np.iinfo(np.int32).min and df['Id'].max() <= np.iinfo(np.int32).max:
+                df['Id'] = df['Id'].astype(np.int32)
+        
+        names = df['SeparatorName']
+        if not isinstance(names.dtype, pd.CategoricalDtype) and len(df):
+            if names.nunique(dropna=False) <= len(df) * CATEGORY_MAX_UNIQUE_RATIO:
+                df['SeparatorName'] = names.astype('category')
+        
+        string_dtype = _arrow_string_dtype()
+        if string_dtype is not None and df['OrderNumber'].dtype != string_dtype:
+            df['OrderNumber'] = df['OrderNumber'].astype(string_dtype)
+        
+        return df
+    
+    def _to_bool(self, values):
+        """Convert a column of flags to boolean
+        
+        The column only holds a handful of distinct values, so each one is
+        converted once with _str_to_bool and the results are mapped back.
+        """
+        # Determine the best way to convert to boolean
+        if values.dtype == bool:
+            return values  # Already boolean
+        # Also nullable boolean/Int64 columns, whose missing values mean no analysis
+        if pd.api.types.is_bool_dtype(values):
+            return values.fillna(False).astype(bool)
+        if pd.api.types.is_numeric_dtype(values):
+            return values.fillna(0).astype(bool)
+        
+        # Convert various string representations to boolean
+        codes, uniques = pd.factorize(values)
+        # Code -1 (missing value) picks the False appended at the end
+        lookup = np.array([self._str_to_bool(value) for value in uniques] + [False], dtype=bool)
+        return pd.Series(lookup[codes], index=values.index)
     
     def _str_to_bool(self, value):
         """Convert various string representations to boolean"""
+        if isinstance(value, np.generic):
+            value = value.item()  # numpy scalars from factorized or object columns
         if isinstance(value, bool):
             return value
         if isinstance(value, (int, float)):
             return bool(value)
         if isinstance(value, str):
             lower_value = value.lower().strip()
-            if lower_value in ('yes', 'true', 't', 'y', '1'):
+            if lower_value in TRUE_VALUES:
                 return True
-            elif lower_value in ('no', 'false', 'f', 'n', '0'):
+            elif lower_value in FALSE_VALUES:
                 return False
         return False
     
@@ -108,41 +447,141 @@ class DataModel:
         start_date = end_date - timedelta(days=7)
         
         # Apply filter
-        mask = (self.original_df['DateOfSeparation'] >= start_date) & (self.original_df['DateOfSeparation'] <= end_date)
-        self.filtered_df = self.original_df[mask].copy()
+        self._select_positions(np.sort(self._date_range(start_date, end_date, include_end=True)))
     
     def apply_filters(self, from_date=None, to_date=None, order_number=None, separator_name=None, record_id=None, analysis_only=False):
-        """Apply filters to the data"""
+        """Apply filters to the data
+        
+        The date range is answered by binary search on a sorted copy of the
+        dates, and the other predicates only look at the rows inside it.
+        Order number and separator name are matched as case-insensitive
+        substrings through an n-gram index instead of scanning the column.
+        """
         if self.original_df is None:
             return
         
-        # Start with the original data
-        filtered_df = self.original_df.copy()
+        df = self.original_df
         
         # Apply date filter if specified
-        if from_date is not None:
-            filtered_df = filtered_df[filtered_df['DateOfSeparation'] >= pd.Timestamp(from_date)]
-        
-        if to_date is not None:
+        if from_date is not None or to_date is not None:
             # Add one day to include the end date fully
-            to_date_inclusive = pd.Timestamp(to_date) + pd.Timedelta(days=1)
-            filtered_df = filtered_df[filtered_df['DateOfSeparation'] < to_date_inclusive]
+            to_date_exclusive = pd.Timestamp(to_date) + pd.Timedelta(days=1) if to_date is not None else None
+            positions = np.sort(self._date_range(from_date, to_date_exclusive))
+        else:
+            positions = np.arange(len(df))
+        
+        # Apply analysis filter if specified
+        if analysis_only:
+            positions = positions[df['Analysis'].to_numpy(dtype=bool)[positions]]
         
         # Apply record ID filter if specified
-        if record_id and 'Id' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['Id'].astype(str) == record_id]
+        if record_id and 'Id' in df.columns:
+            positions = positions[(df['Id'].iloc[positions].astype(str) == record_id).to_numpy()]
         
         # Apply order number filter if specified
         if order_number:
-            filtered_df = filtered_df[filtered_df['OrderNumber'].astype(str).str.contains(order_number, case=False)]
+            positions = positions[self._text_index('OrderNumber').match(order_number)[positions]]
         
         # Apply separator name filter if specified
         if separator_name:
-            filtered_df = filtered_df[filtered_df['SeparatorName'].astype(str).str.contains(separator_name, case=False)]
+            positions = positions[self._text_index('SeparatorName').match(separator_name)[positions]]
         
-        # Apply analysis filter if specified
-        if analysis_only:
-            filtered_df = filtered_df[filtered_df['Analysis'] == True]
+        # Update the selected rows
+        self._select_positions(positions)
+    
+    def _date_range(self, start=None, end=None, include_end=False):
+        """Find the rows whose DateOfSeparation falls in a range
+        
+        Args:
+            start: First date included, or None for no lower bound
+            end: Upper bound, or None for no upper bound
+            include_end (bool): Whether rows dated exactly at end are included
+            
+        Returns:
+            numpy.ndarray: Row positions in date order (rows without a date never match)
+        """
+        if self._date_keys is None:
+            dates = self.original_df['DateOfSeparation'].to_numpy(dtype='datetime64[ns]')
+            valid = np.flatnonzero(~np.isnat(dates))
+            keys = dates[valid].astype(np.int64)
+            order = np.argsort(keys, kind='stable')
+            self._date_keys = keys[order]
+            self._date_order = valid[order]
+        
+        low = 0
+        high = len(self._date_keys)
+        if start is not None:
+            low = np.searchsorted(self._date_keys, pd.Timestamp(start).value, side='left')
+        if end is not None:
+            high = np.searchsorted(self._date_keys, pd.Timestamp(end).value, side='right' if include_end else 'left')
+        
+        return self._date_order[low:max(low, high)]
+    
+    def _text_index(self, column):
+        """Get the substring index of a column, building it on first use"""
+        if column not in self._text_indexes:
+            self._text_indexes[column] = NGramIndex(self.original_df[column])
+        return self._text_indexes[column]
+    
+    def _positions_of(self, record_ids):
+        """Find the rows of original_df holding some record IDs
+        
+        Uses a hash index from ID to row positions, built once per load, so
+        each lookup costs the same however many rows are loaded.
+        
+        Returns:
+            numpy.ndarray: Sorted row positions
+        """
+        if self._id_positions is None:
+            self._id_positions = pd.Index(self.original_df['Id'].astype(str).to_numpy(dtype=object))
+        
+        keys = [str(record_id) for record_id in record_ids]
+        if self._id_positions.is_unique:
+            positions = self._id_positions.get_indexer(keys)
+        else:
+            positions = self._id_positions.get_indexer_non_unique(keys)[0]
+        return np.unique(positions[positions >= 0])
+    
+    def update_rows(self, record_ids, data):
+        """Apply edited values to the loaded records in place
+        
+        The current filter selection is kept and the text indexes are
+        updated for the changed rows only.
+        
+        Args:
+            record_ids: IDs of the records to update
+            data: Dictionary with the changed fields
+            
+        Returns:
+            int: Number of rows updated
+        """
+        if self.original_df is None or 'Id' not in self.original_df.columns:
+            return 0
+        
+        df = self.original_df
+        positions = self._positions_of(record_ids)
+        if not len(positions):
+            return 0
+        
+        for key, value in data.items():
+            if key not in df.columns:
+                continue
+            if key == 'DateOfSeparation':
+                value = pd.to_datetime(value, errors='coerce')
+            elif key == 'Analysis':
+                value = bool(value)
+            elif isinstance(df[key].dtype, pd.CategoricalDtype) and value not in df[key].cat.categories:
+                # A categorical column only accepts values it already has
+                df[key] = df[key].cat.add_categories([value])
+            df.iloc[positions, df.columns.get_loc(key)] = value
+            
+            if key in self._text_indexes:
+                self._text_indexes[key].update(positions, [value] * len(positions))
+            if key == 'DateOfSeparation':
+                # Rebuilt on the next date filter
+                self._date_keys = None
+                self._date_order = None
         
-        # Update the filtered dataframe
-        self.filtered_df = filtered_df 
\ No newline at end of file
+        # filtered_df is rebuilt from the edited rows on next access
+        self._filtered_df = None
+        return len(positions)
@@ -0,0 +1,165 @@
+import queue
+import threading
+import logging
+
+from src.data.readers import iter_file_chunks
+
+# Number of rows read, normalized and saved per chunk
+DEFAULT_IMPORT_CHUNK_SIZE = 5000
+
+# Number of parsed chunks the reader may run ahead of the database writer
+DEFAULT_QUEUE_SIZE = 2
+
+# Rows per chunk when scanning a file for the preview validation report
+DEFAULT_SCAN_CHUNK_SIZE = 20000
+
+# Key columns whose missing values are reported before an import
+VALIDATED_COLUMNS = ['OrderNumber', 'SeparatorName', 'DateOfSeparation']
+
+# Marks the end of the chunk stream in the queue
+_END = object()
+
+def scan_missing_values(file_path, data_model, chunk_size=DEFAULT_SCAN_CHUNK_SIZE, engine=None, stop=None):
+    """Count rows missing key values, yielding running totals after each chunk
+
+    Args:
+        file_path (str): CSV or XLSX file to scan
+        data_model: DataModel whose normalize_dataframe is applied to each chunk
+        chunk_size (int): Number of rows per chunk
+        engine (str): Optional reader engine name, see readers.get_reader
+        stop: Optional threading.Event that ends the scan early
+
+    Yields:
+        dict: {'rows', 'fraction', 'OrderNumber', 'SeparatorName', 'DateOfSeparation'}
+        with the number of rows scanned so far and the missing count per column
+    """
+    counts = {'rows': 0, 'fraction': 0.0}
+    counts.update({column: 0 for column in VALIDATED_COLUMNS})
+
+    for chunk, fraction in iter_file_chunks(file_path, chunk_size, engine):
+        if stop is not None and stop.is_set():
+            return
+
+        chunk = data_model.normalize_dataframe(chunk)
+        counts['rows'] += len(chunk)
+        counts['fraction'] = fraction if fraction is not None else counts['fraction']
+
+        # Blank text counts as missing; unparseable dates are NaT after normalizing
+        for column in ('OrderNumber', 'SeparatorName'):
+            values = chunk[column]
+            counts[column] += int((values.isna() | (values.astype(str).str.strip() == '')).sum())
+        counts['DateOfSeparation'] += int(chunk['DateOfSeparation'].isna().sum())
+
+        yield dict(counts)
+
+class StreamingImporter:
+    """Imports a file by reading, normalizing and saving it chunk by chunk
+
+    A reader thread parses and normalizes chunks while the calling thread
+    writes the previous chunk to the database. The queue between them holds
+    at most queue_size chunks, so peak memory stays at a few chunks no matter
+    how large the file is.
+    """
+    def __init__(self, file_path, data_model, writer, chunk_size=DEFAULT_IMPORT_CHUNK_SIZE,
+                 queue_size=DEFAULT_QUEUE_SIZE, engine=None):
+        """Initialize the importer
+
+        Args:
+            file_path (str): CSV or XLSX file to import
+            data_model: DataModel whose normalize_dataframe is applied to each chunk; it
+                is used from the reader thread, so pass one nothing else uses
+            writer: Callable saving a chunk, e.g. SQLService.merge_data
+            chunk_size (int): Number of rows per chunk
+            queue_size (int): Number of chunks the reader may run ahead
+            engine (str): Optional reader engine name, see readers.get_reader
+        """
+        self.file_path = file_path
+        self.data_model = data_model
+        self.writer = writer
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.engine = engine
+        self.logger = logging.getLogger(__name__)
+        self.result = {'read': 0, 'inserted': 0, 'skipped': 0}
+
+    def run(self, progress_callback=None):
+        """Import the whole file
+
+        Args:
+            progress_callback: Optional function called with a percentage after each
+                chunk is saved; returning False cancels the import
+
+        Returns:
+            dict: {'read': rows read, 'inserted': rows saved, 'skipped': duplicate rows}
+        """
+        self.result = {'read': 0, 'inserted': 0, 'skipped': 0}
+        chunks = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        reader = threading.Thread(target=self._read_chunks, args=(chunks, stop), daemon=True)
+        reader.start()
+
+        try:
+            while True:
+                item = chunks.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                chunk, fraction = item
+                self._count(chunk, self.writer(chunk))
+
+                # Report progress if callback provided
+                if progress_callback:
+                    percent = (fraction or 0) * 100
+                    # Check if user canceled
+                    if not progress_callback(percent):
+                        self.logger.info("Import canceled by user")
+                        break
+        finally:
+            stop.set()
+            # Unblock the reader if it is waiting on a full queue
+            while reader.is_alive():
+                try:
+                    chunks.get_nowait()
+                except queue.Empty:
+                    pass
+                reader.join(0.05)
+
+        self.logger.info(f"Imported {self.file_path}: {self.result['read']} rows read, "
+                         f"{self.result['inserted']} saved, {self.result['skipped']} skipped")
+        return self.result
+
+    def _count(self, chunk, saved):
+        """Add the writer's result for a chunk to the running totals"""
+        self.result['read'] += len(chunk)
+        if isinstance(saved, dict):
+            self.result['inserted'] += saved.get('inserted', 0)
+            self.result['skipped'] += saved.get('skipped', 0)
+        else:
+            self.result['inserted'] += saved or 0
+            self.result['skipped'] += len(chunk) - (saved or 0)
+
+    def _read_chunks(self, chunks, stop):
+        """Reader thread: parse and normalize chunks into the queue"""
+        try:
+            for chunk, fraction in iter_file_chunks(self.file_path, self.chunk_size, self.engine):
+                if stop.is_set():
+                    return
+                chunk = self.data_model.normalize_dataframe(chunk)
+                if not self._put(chunks, (chunk, fraction), stop):
+                    return
+            self._put(chunks, _END, stop)
+        except Exception as e:
+            self._put(chunks, e, stop)
+
+    def _put(self, chunks, item, stop):
+        """Put an item on the queue, giving up if the import was stopped"""
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
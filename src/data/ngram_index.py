@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+# Bits per character in a packed n-gram key (every Unicode code point fits in 21 bits)
+_CHAR_BITS = 21
+
+class NGramIndex:
+    """Case-insensitive substring index over one text column
+
+    The column is factorized into codes (one per row) and its distinct
+    lowercase values. For every n-gram the index keeps the sorted ids of
+    the distinct values containing it, so a search intersects a few
+    posting lists, confirms the surviving values with a plain substring
+    test and maps them back to rows through the codes.
+
+    Rows can be pointed at new values with update() and added with
+    append(); values not seen before are appended with their n-grams, so
+    the index never has to be rebuilt while the data is edited or grows.
+    """
+    def __init__(self, values, n=3):
+        """Build the index
+
+        Args:
+            values: Series (or array-like) with one value per row
+            n (int): Length of the indexed n-grams (at most 3)
+        """
+        self.n = n
+        codes, uniques = pd.factorize(self._normalize(values))
+        self.codes = codes.astype(np.int64)
+        self._uniques = np.asarray(uniques, dtype=object)
+        self._unique_index = pd.Index(self._uniques)
+        self._unique_text = pd.Series(self._uniques).astype(str)
+
+        # Values added by update() and append(), with the ids of their n-grams
+        self._added = {}  # value -> unique id
+        self._extra_postings = {}  # n-gram key -> list of unique ids
+
+        self._build_postings()
+
+    def _normalize(self, values):
+        """Lowercase text, matching the old astype(str) + case=False search"""
+        return pd.Series(values, dtype=object).astype(str).str.lower()
+
+    def _build_postings(self):
+        """Build sorted posting lists for every n-gram of the distinct values"""
+        n = self.n
+        self._keys = np.empty(0, dtype=np.int64)
+        self._starts = np.zeros(1, dtype=np.int64)
+        self._ids = np.empty(0, dtype=np.int64)
+
+        if not len(self._uniques):
+            return
+
+        # Values of one length at a time, so each fixed-width unicode matrix has no padding
+        lengths = np.fromiter(map(len, self._uniques), dtype=np.int64, count=len(self._uniques))
+        by_length = np.argsort(lengths, kind='stable')
+        bounds = np.searchsorted(lengths[by_length], np.arange(n, lengths.max() + 2))
+        keys = []
+        ids = []
+        for length, start, end in zip(range(n, lengths.max() + 1), bounds[:-1], bounds[1:]):
+            if start == end:
+                continue
+            rows = by_length[start:end]
+            text = self._uniques[rows].astype(f'<U{length}')
+            chars = text.view(np.uint32).reshape(len(rows), length)
+            for position in range(length - n + 1):
+                key = chars[:, position].astype(np.int64)
+                for offset in range(1, n):
+                    key = (key << _CHAR_BITS) | chars[:, position + offset]
+                keys.append(key)
+                ids.append(rows)
+
+        if not keys:
+            return
+        keys = np.concatenate(keys)
+        ids = np.concatenate(ids)
+
+        # Group by n-gram with ascending ids, dropping n-grams repeated inside a value
+        order = np.lexsort((ids, keys))
+        keys = keys[order]
+        ids = ids[order]
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+        keys = keys[keep]
+
+        self._keys, starts = np.unique(keys, return_index=True)
+        self._starts = np.append(starts, len(keys)).astype(np.int64)
+        self._ids = ids[keep]
+
+    def _gram_keys(self, text):
+        """Packed keys of the distinct n-grams of a string"""
+        keys = set()
+        for position in range(len(text) - self.n + 1):
+            key = 0
+            for char in text[position:position + self.n]:
+                key = (key << _CHAR_BITS) | ord(char)
+            keys.add(key)
+        return keys
+
+    def _postings(self, key):
+        """Sorted ids of the distinct values containing an n-gram"""
+        i = np.searchsorted(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            ids = self._ids[self._starts[i]:self._starts[i + 1]]
+        else:
+            ids = self._ids[:0]
+
+        extra = self._extra_postings.get(key)
+        if extra:
+            # Added values always have higher ids, so the result stays sorted
+            ids = np.concatenate([ids, np.asarray(extra, dtype=np.int64)])
+        return ids
+
+    def match(self, pattern):
+        """Find the rows whose value contains pattern (case-insensitive)
+
+        Args:
+            pattern (str): Text to look for
+
+        Returns:
+            numpy.ndarray: Boolean mask with one entry per row
+        """
+        pattern = str(pattern).lower()
+
+        if len(pattern) >= self.n:
+            # Intersect the shortest posting lists first; stop once testing the
+            # remaining candidates directly is cheaper than intersecting more
+            postings = sorted((self._postings(key) for key in self._gram_keys(pattern)), key=len)
+            candidates = postings[0]
+            for ids in postings[1:]:
+                if len(candidates) <= 64 or len(candidates) > len(self._uniques) // 2:
+                    break
+                candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        else:
+            # Too short for an n-gram; test every distinct value
+            candidates = np.arange(len(self._uniques))
+
+        # The n-grams only say the pieces occur somewhere in the value
+        if len(candidates):
+            found = self._unique_text.iloc[candidates].str.contains(pattern, regex=False)
+            candidates = candidates[found.to_numpy(dtype=bool)]
+
+        matched = np.zeros(len(self._uniques), dtype=bool)
+        matched[candidates] = True
+        return matched[self.codes]
+
+    def _value_ids(self, values):
+        """Unique ids of some values, adding the ones not seen before"""
+        text = self._normalize(values).tolist()
+        ids = self._unique_index.get_indexer(text)
+
+        new_values = []
+        for i, value in enumerate(text):
+            if ids[i] != -1:
+                continue
+            if value not in self._added:
+                self._added[value] = len(self._uniques) + len(new_values)
+                new_values.append(value)
+                for key in self._gram_keys(value):
+                    self._extra_postings.setdefault(key, []).append(self._added[value])
+            ids[i] = self._added[value]
+
+        if new_values:
+            self._uniques = np.concatenate([self._uniques, np.asarray(new_values, dtype=object)])
+            self._unique_text = pd.Series(self._uniques).astype(str)
+        return ids.astype(np.int64)
+
+    def update(self, positions, values):
+        """Point rows at new values
+
+        Args:
+            positions: Row positions to change
+            values: New value for each position
+        """
+        self.codes[np.asarray(positions, dtype=np.int64)] = self._value_ids(values)
+
+    def append(self, values):
+        """Add rows after the indexed ones
+
+        Args:
+            values: Series (or array-like) with one value per new row
+        """
+        self.codes = np.concatenate([self.codes, self._value_ids(values)])
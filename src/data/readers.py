@@ -0,0 +1,221 @@
+import os
+import logging
+
+import pandas as pd
+
+from src.data.data_model import STD_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+def select_columns(names):
+    """Pick the file columns that map to a standard column
+
+    Args:
+        names: Column names from the file header
+
+    Returns:
+        list: Matching names, or every name when none match (so the preview
+        still shows what the file contains)
+    """
+    selected = [name for name in names if str(name).strip().lower() in STD_COLUMNS]
+    return selected or list(names)
+
+def _header_names(header):
+    """Turn a header row into column names, naming blank cells like pandas does"""
+    return [str(name) if name not in (None, '') else f"Unnamed: {i}" for i, name in enumerate(header)]
+
+class PandasCsvReader:
+    """CSV reader using the pandas C parser in chunks (always available)"""
+    name = 'pandas'
+    extensions = ('.csv',)
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def iter_chunks(self, file_path, chunk_size):
+        """Yield (chunk, fraction_read) pairs"""
+        columns = select_columns(pd.read_csv(file_path, nrows=0).columns)
+        total_bytes = os.path.getsize(file_path) or 1
+        with open(file_path, 'rb') as f:
+            for chunk in pd.read_csv(f, chunksize=chunk_size, usecols=columns):
+                yield chunk, min(1.0, f.tell() / total_bytes)
+
+class ArrowCsvReader:
+    """CSV reader using the multithreaded pyarrow streaming parser"""
+    name = 'pyarrow'
+    extensions = ('.csv',)
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import pyarrow.csv  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def iter_chunks(self, file_path, chunk_size):
+        """Yield (chunk, fraction_read) pairs"""
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        columns = select_columns(pd.read_csv(file_path, nrows=0).columns)
+        total_bytes = os.path.getsize(file_path) or 1
+
+        # Read everything as text; normalize_dataframe parses dates and flags the
+        # same way for every engine, and type inference per block can't conflict
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={name: pa.string() for name in columns},
+            strings_can_be_null=True
+        )
+        # Roughly chunk_size rows per block, assuming short records
+        read_options = pa_csv.ReadOptions(block_size=max(1 << 16, chunk_size * 64))
+
+        with open(file_path, 'rb') as f:
+            reader = pa_csv.open_csv(f, read_options=read_options, convert_options=convert_options)
+            for batch in reader:
+                if batch.num_rows:
+                    yield batch.to_pandas(), min(1.0, f.tell() / total_bytes)
+
+class CalamineReader:
+    """XLSX reader using the Rust calamine parser (python-calamine)"""
+    name = 'calamine'
+    extensions = ('.xlsx',)
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import python_calamine  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def iter_chunks(self, file_path, chunk_size):
+        """Yield (chunk, fraction_read) pairs"""
+        from python_calamine import CalamineWorkbook
+
+        sheet = CalamineWorkbook.from_path(file_path).get_sheet_by_index(0)
+        # calamine returns '' for empty cells
+        yield from _iter_row_chunks(sheet.iter_rows(), chunk_size, sheet.height - 1, blank='')
+
+class OpenpyxlReader:
+    """XLSX reader streaming rows with openpyxl in read-only mode"""
+    name = 'openpyxl'
+    extensions = ('.xlsx',)
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import openpyxl  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def iter_chunks(self, file_path, chunk_size):
+        """Yield (chunk, fraction_read) pairs"""
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            # max_row comes from the sheet dimension and may be missing
+            total_rows = (sheet.max_row or 0) - 1
+            yield from _iter_row_chunks(sheet.iter_rows(values_only=True), chunk_size, total_rows, blank=None)
+        finally:
+            workbook.close()
+
+def _convert_cell(value):
+    """Turn whole-number floats back into ints, like pd.read_excel does
+
+    XLSX stores every number as a double, so calamine returns 5.0 for a cell
+    showing 5; without this, order numbers would import as "5.0".
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _iter_row_chunks(rows, chunk_size, total_rows, blank):
+    """Group spreadsheet rows into DataFrame chunks of the standard columns
+
+    Args:
+        rows: Iterator of row value sequences, header first
+        chunk_size (int): Number of rows per chunk
+        total_rows (int): Expected number of data rows, for progress
+        blank: Value the engine uses for empty cells
+    """
+    header = next(rows, None)
+    if header is None:
+        return
+
+    names = _header_names(header)
+    columns = select_columns(names)
+    positions = [names.index(name) for name in columns]
+
+    rows_read = 0
+    batch = []
+    for row in rows:
+        values = [row[i] if i < len(row) else None for i in positions]
+        # Skip rows that are empty in every column we keep
+        if all(value is None or value == blank for value in values):
+            continue
+        values = [None if blank is not None and value == blank else _convert_cell(value) for value in values]
+
+        batch.append(values)
+        if len(batch) >= chunk_size:
+            rows_read += len(batch)
+            fraction = min(1.0, rows_read / total_rows) if total_rows > 0 else None
+            yield pd.DataFrame.from_records(batch, columns=columns), fraction
+            batch = []
+
+    if batch:
+        yield pd.DataFrame.from_records(batch, columns=columns), 1.0
+
+# Engines in order of preference for each file type. For CSV the pandas C
+# parser is as fast as pyarrow at import chunk sizes (see
+# tools/benchmark_readers.py), so pyarrow is only used when asked for.
+READERS = [PandasCsvReader, ArrowCsvReader, CalamineReader, OpenpyxlReader]
+
+def available_readers(file_path):
+    """List the installed reader classes able to read a file, fastest first"""
+    extension = os.path.splitext(file_path)[1].lower()
+    return [reader for reader in READERS if extension in reader.extensions and reader.is_available()]
+
+def get_reader(file_path, engine=None):
+    """Get a reader for a file
+
+    Args:
+        file_path (str): CSV or XLSX file
+        engine (str): Optional engine name ('pyarrow', 'pandas', 'calamine', 'openpyxl');
+            defaults to the MPR_READER_ENGINE environment variable, then the fastest installed
+
+    Returns:
+        Reader instance with iter_chunks(file_path, chunk_size)
+    """
+    readers = available_readers(file_path)
+    if not readers:
+        raise ValueError("Unsupported file format")
+
+    engine = engine or os.getenv("MPR_READER_ENGINE")
+    if engine:
+        for reader in readers:
+            if reader.name == engine:
+                return reader()
+        logger.warning(f"Reader engine '{engine}' not available for {file_path}, using {readers[0].name}")
+
+    return readers[0]()
+
+def iter_file_chunks(file_path, chunk_size, engine=None):
+    """Yield (chunk, fraction_read) pairs from a CSV or XLSX file"""
+    return get_reader(file_path, engine).iter_chunks(file_path, chunk_size)
+
+def read_head(file_path, nrows, engine=None):
+    """Read only the first nrows rows of a CSV or XLSX file"""
+    chunks = iter_file_chunks(file_path, nrows, engine)
+    try:
+        for chunk, _ in chunks:
+            # Block-based engines may return more rows than asked for
+            return chunk.head(nrows)
+    finally:
+        chunks.close()
+    return pd.DataFrame()
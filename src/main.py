@@ -14,6 +14,7 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTranslator, QLocale
 from src.ui.main_window import MainWindow
 from src.services.translator import LanguageManager
+from src.services.connection_pool import close_all_pools
 
 def main() -> None:
     """Main entry point for the application."""
@@ -21,6 +22,9 @@ def main() -> None:
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Set a consistent style
     
+    # Close pooled database connections when the application exits
+    app.aboutToQuit.connect(close_all_pools)
+    
     # Print debug information
     print(f"Application directory: {project_root}")
     print(f"Translation directory: {project_root / 'translations'}")
@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+
+import pyodbc
+
+# Maximum number of open connections per connection string
+DEFAULT_POOL_SIZE = 4
+
+# Seconds an idle connection is kept before it is closed
+DEFAULT_IDLE_TIMEOUT = 300
+
+# Seconds to wait for a free connection when the pool is exhausted
+DEFAULT_ACQUIRE_TIMEOUT = 30
+
+
+class ConnectionPool:
+    """Small thread-safe pool of pyodbc connections for a single connection string
+
+    Connections are health-checked when borrowed and closed once they have been
+    idle for longer than idle_timeout seconds.
+    """
+
+    def __init__(self, conn_str, size=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT, connect_func=None):
+        """Initialize the pool
+
+        Args:
+            conn_str (str): ODBC connection string used for new connections
+            size (int): Maximum number of connections open at the same time
+            idle_timeout (float): Seconds before an idle connection is closed
+            connect_func: Optional factory used instead of pyodbc.connect
+        """
+        self.conn_str = conn_str
+        self.size = max(1, int(size))
+        self.idle_timeout = idle_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._connect = connect_func or pyodbc.connect
+        self._idle = []  # List of (connection, last_used) tuples, most recent last
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def acquire(self, timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        """Borrow a connection from the pool, opening a new one if needed
+
+        Args:
+            timeout (float): Seconds to wait when every connection is in use
+
+        Returns:
+            pyodbc.Connection: A healthy connection with autocommit disabled
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        stale = []
+        connection = None
+
+        with self._available:
+            while True:
+                stale.extend(self._take_expired())
+
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    self._in_use += 1
+                    break
+
+                if self._in_use < self.size:
+                    self._in_use += 1
+                    break
+
+                # Wait for another thread to release a connection
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a database connection from the pool")
+                self._available.wait(remaining)
+
+        for stale_connection in stale:
+            self._close_quietly(stale_connection)
+
+        # Discard a reused connection that no longer answers
+        if connection is not None and not self._is_healthy(connection):
+            self.logger.info("Discarding broken pooled connection")
+            self._close_quietly(connection)
+            connection = None
+
+        if connection is None:
+            try:
+                connection = self._connect(self.conn_str)
+                self.logger.info("Opened new pooled database connection")
+            except Exception:
+                with self._available:
+                    self._in_use -= 1
+                    self._available.notify()
+                raise
+
+        return connection
+
+    def release(self, connection, discard=False):
+        """Return a borrowed connection to the pool
+
+        Any open transaction is rolled back so the next borrower starts clean.
+
+        Args:
+            connection: Connection previously returned by acquire()
+            discard (bool): Close the connection instead of keeping it
+        """
+        if connection is None:
+            return
+
+        if not discard:
+            try:
+                connection.rollback()
+            except Exception as e:
+                self.logger.warning(f"Discarding pooled connection after failed rollback: {str(e)}")
+                discard = True
+
+        with self._available:
+            self._in_use = max(0, self._in_use - 1)
+            if not discard:
+                self._idle.append((connection, time.monotonic()))
+            self._available.notify()
+
+        if discard:
+            self._close_quietly(connection)
+
+    def close_all(self):
+        """Close every idle connection in the pool"""
+        with self._available:
+            idle = [connection for connection, _ in self._idle]
+            self._idle = []
+
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def _take_expired(self):
+        """Remove connections idle for longer than the timeout (lock must be held)"""
+        if self.idle_timeout is None:
+            return []
+
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [connection for connection, last_used in self._idle if last_used < cutoff]
+        if expired:
+            self._idle = [(connection, last_used) for connection, last_used in self._idle if last_used >= cutoff]
+        return expired
+
+    def _is_healthy(self, connection):
+        """Check that a connection still answers a trivial query"""
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _close_quietly(self, connection):
+        """Close a connection, ignoring errors from already broken links"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(conn_str, size=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Get the shared pool for a connection string, creating it on first use
+
+    Args:
+        conn_str (str): ODBC connection string
+        size (int): Pool size used when the pool is created
+        idle_timeout (float): Idle timeout used when the pool is created
+
+    Returns:
+        ConnectionPool: The pool shared by every service using this connection string
+    """
+    with _pools_lock:
+        pool = _pools.get(conn_str)
+        if pool is None:
+            pool = ConnectionPool(conn_str, size=size, idle_timeout=idle_timeout)
+            _pools[conn_str] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close the idle connections of every shared pool (call on application exit)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+
+    for pool in pools:
+        pool.close_all()
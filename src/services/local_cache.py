@@ -0,0 +1,566 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Seconds between delta pulls of new records from SQL Server
+DEFAULT_SYNC_INTERVAL = 30
+
+# Seconds between checksum reconciliations that pick up edited and deleted records
+DEFAULT_RECONCILE_INTERVAL = 900
+
+# Seconds between encrypted snapshots of a changed mirror written to disk
+DEFAULT_SNAPSHOT_INTERVAL = 300
+
+# Records per checksum bucket (a changed bucket is pulled again as a whole)
+DEFAULT_BUCKET_SIZE = 1000
+
+# Rows fetched from SQL Server per round trip while syncing
+DEFAULT_SYNC_CHUNK_SIZE = 10000
+
+# IDs per statement when edits are applied to the mirror (SQLite allows 999 parameters)
+DEFAULT_APPLY_CHUNK_SIZE = 500
+
+# Columns copied from the records table
+MIRROR_COLUMNS = ['Id', 'OrderNumber', 'SeparatorName', 'DateOfSeparation', 'Analysis', 'CreatedAt']
+
+# Version of the mirror tables; a snapshot with another version is filled again
+SCHEMA_VERSION = '2'
+
+
+@lru_cache(maxsize=4096)
+def _text_key(value):
+    """Sort key of a case-insensitive, accent-sensitive collation like the server's
+
+    Case is folded for every letter (SQLite's NOCASE only folds ASCII), and
+    accents only break ties, so "ana" < "Ána" < "anb".
+    """
+    folded = value.casefold()
+    base = ''.join(char for char in unicodedata.normalize('NFD', folded) if not unicodedata.combining(char))
+    return base, folded
+
+
+def _compare_text(left, right):
+    """SQLite collation comparing text like the server collation"""
+    left_key, right_key = _text_key(left), _text_key(right)
+    return (left_key > right_key) - (left_key < right_key)
+
+
+@lru_cache(maxsize=256)
+def _like_pattern(pattern):
+    """Compile a LIKE pattern (% and _ wildcards) into a case-insensitive regex"""
+    regex = ''.join('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern)
+    return re.compile(regex, re.IGNORECASE | re.DOTALL)
+
+
+def _like(pattern, value):
+    """LIKE for the mirror, ignoring case for every letter like the server"""
+    if pattern is None or value is None:
+        return None
+    return _like_pattern(pattern).fullmatch(str(value)) is not None
+
+
+def date_bound(value):
+    """Convert a date filter to the ISO text SQL Server compares DateOfSeparation with
+
+    Text is converted to DATE by the server, so a time part in a string is
+    dropped ('2025-04-03 00:00:00' is the day '2025-04-03'). A datetime or
+    Timestamp parameter instead turns the DATE column into midnight of its
+    day, so its time is kept after the day: 'YYYY-MM-DD' sorts before
+    'YYYY-MM-DD hh:mm:ss' in the mirror just like midnight sorts before
+    that time on the server.
+
+    Args:
+        value: str, date, datetime, pandas Timestamp or numpy datetime64 (or None)
+
+    Returns:
+        str: 'YYYY-MM-DD', plus ' hh:mm:ss[.ffffff]' for a datetime past midnight
+    """
+    if value is None:
+        return None
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    if isinstance(value, datetime):
+        if pd.isna(value):
+            return None
+        day = value.strftime('%Y-%m-%d')
+        if (value.hour, value.minute, value.second, value.microsecond) == (0, 0, 0, 0):
+            return day
+        return f"{day} {value.strftime('%H:%M:%S.%f')}"
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    try:
+        return pd.Timestamp(str(value).strip()).strftime('%Y-%m-%d')
+    except (ValueError, TypeError):
+        return str(value)[:10]
+
+
+def remove_database_files(path):
+    """Delete an SQLite database file and its WAL/journal files (e.g. an old unencrypted mirror)"""
+    for file_path in (path, f"{path}-wal", f"{path}-shm", f"{path}-journal"):
+        if os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                logging.warning(f"Could not delete {file_path}: {str(e)}")
+
+
+class LocalCache:
+    """In-memory SQLite mirror of the records table, saved encrypted under the data path
+
+    New records are pulled by delta sync: every row with an Id above the
+    highest Id already mirrored (the identity column only grows, and
+    CreatedAt is copied along). Edits and deletes made elsewhere are found
+    by reconciliation: SQL Server returns a count and CHECKSUM_AGG per
+    bucket of DEFAULT_BUCKET_SIZE Ids, and only the buckets whose checksum
+    changed since the last run are pulled again.
+
+    The first fill copies the whole table, so it runs on a background
+    thread (start_fill) and the mirror only answers once it is complete.
+
+    Records never reach the disk in clear text: the mirror lives in memory
+    and is saved as a snapshot encrypted for the current Windows user with
+    DPAPI, like the secret cache. Without DPAPI (or before Python 3.11,
+    which lacks sqlite3 serialize) nothing is saved and the mirror is
+    filled again each session.
+
+    Record queries use the same WHERE/ORDER BY clauses as SQL Server: text
+    columns compare and LIKE ignoring case like the server collation, dates
+    are ISO text and SQLite orders NULL the same way.
+    """
+
+    def __init__(self, path, table_name, sync_interval=DEFAULT_SYNC_INTERVAL,
+                 reconcile_interval=DEFAULT_RECONCILE_INTERVAL, bucket_size=DEFAULT_BUCKET_SIZE,
+                 snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL):
+        """Open the mirror, loading the encrypted snapshot when there is one
+
+        Args:
+            path (str): Encrypted snapshot file
+            table_name (str): Records table on SQL Server
+            sync_interval (float): Seconds a delta pull is reused before the next one
+            reconcile_interval (float): Seconds between reconciliations
+            bucket_size (int): Records per checksum bucket
+            snapshot_interval (float): Seconds between snapshots of a changed mirror
+        """
+        self.path = path
+        self.table_name = table_name
+        self.sync_interval = sync_interval
+        self.reconcile_interval = reconcile_interval
+        self.bucket_size = max(1, int(bucket_size))
+        self.snapshot_interval = snapshot_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._sync_lock = threading.Lock()
+        self._last_sync = None  # time.monotonic() of the last delta pull attempt
+
+        self._fill_lock = threading.Lock()
+        self._fill_thread = None
+
+        self._dirty = False  # Changed since the last snapshot
+        self._last_snapshot = time.monotonic()
+
+        try:
+            import win32crypt
+            self._crypt = win32crypt
+        except ImportError:
+            self._crypt = None
+            self.logger.info("win32crypt not available, the local record cache is kept in memory only")
+
+        # One connection shared by every thread, guarded by a lock
+        self._db_lock = threading.RLock()
+        self._db = self._open_database()
+        self._load_snapshot()
+        self._create_schema()
+
+    def _open_database(self):
+        """Open the in-memory database with the server-like text functions"""
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        connection.create_collation('SERVER_CI', _compare_text)
+        connection.create_function('like', 2, _like, deterministic=True)
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        """Lock the mirror and run the block in one SQLite transaction"""
+        with self._db_lock:
+            with self._db:
+                yield self._db
+
+    def _can_snapshot(self):
+        return self._crypt is not None and bool(self.path) and hasattr(self._db, 'serialize')
+
+    def _load_snapshot(self):
+        """Load the mirror saved by a previous session"""
+        if not self._can_snapshot() or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                encrypted = f.read()
+            _, data = self._crypt.CryptUnprotectData(encrypted, None, None, None, 0)
+            with self._db_lock:
+                self._db.deserialize(data)
+        except Exception as e:
+            self.logger.warning(f"Could not read the local record cache, it will be filled again: {str(e)}")
+            with self._db_lock:
+                self._db.close()
+                self._db = self._open_database()
+
+    def _save_snapshot(self, force=False):
+        """Encrypt and write the mirror when it changed and the snapshot interval has passed"""
+        if not self._can_snapshot() or not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_snapshot < self.snapshot_interval:
+            return
+        try:
+            with self._db_lock:
+                data = self._db.serialize()
+                self._dirty = False
+            encrypted = self._crypt.CryptProtectData(data, "MPR Separator records", None, None, None, 0)
+
+            # Replace the file in one step so a crash never leaves half a snapshot
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(encrypted)
+            os.replace(temp_path, self.path)
+            self._last_snapshot = time.monotonic()
+        except Exception as e:
+            self._dirty = True
+            self.logger.warning(f"Could not save the local record cache: {str(e)}")
+
+    def _create_schema(self):
+        """Create the mirror tables, starting over if they mirror another table or schema"""
+        with self._transaction() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS sync_state (Name TEXT PRIMARY KEY, Value TEXT)")
+            source = self._get_state(connection, 'source')
+            schema = self._get_state(connection, 'schema')
+            if source is not None and (source != self.table_name or schema != SCHEMA_VERSION):
+                self.logger.info(f"Local cache mirrored {source} (schema {schema}), rebuilding it for {self.table_name}")
+                connection.execute("DROP TABLE IF EXISTS records")
+                connection.execute("DROP TABLE IF EXISTS buckets")
+                connection.execute("DELETE FROM sync_state")
+
+            connection.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                Id INTEGER PRIMARY KEY,
+                OrderNumber TEXT COLLATE SERVER_CI,
+                SeparatorName TEXT COLLATE SERVER_CI,
+                DateOfSeparation TEXT,
+                Analysis INTEGER,
+                CreatedAt TEXT
+            )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS IX_records_Date ON records (DateOfSeparation, Id)")
+            connection.execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                Bucket INTEGER PRIMARY KEY,
+                RecordCount INTEGER,
+                RecordChecksum INTEGER
+            )
+            """)
+            self._set_state(connection, 'source', self.table_name)
+            self._set_state(connection, 'schema', SCHEMA_VERSION)
+
+    def _get_state(self, connection, name, default=None):
+        row = connection.execute("SELECT Value FROM sync_state WHERE Name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_state(self, connection, name, value):
+        connection.execute("INSERT OR REPLACE INTO sync_state (Name, Value) VALUES (?, ?)", (name, str(value)))
+
+    def _state(self, name, default=None):
+        """Read one sync_state value"""
+        with self._db_lock:
+            return self._get_state(self._db, name, default)
+
+    def is_ready(self):
+        """Check whether the mirror has completed its first full pull"""
+        return self._state('filled') is not None
+
+    def expire(self):
+        """Make the next query pull new records first (e.g. after an import)"""
+        self._last_sync = None
+
+    def start_fill(self, service):
+        """Fill the mirror for the first time on a background thread
+
+        Queries keep going to SQL Server until is_ready() turns True. Calling
+        this again while a fill is running, or within sync_interval of a
+        failed one, does nothing.
+
+        Args:
+            service: SQLService whose connection pool is used
+        """
+        with self._fill_lock:
+            if self._fill_thread is not None and self._fill_thread.is_alive():
+                return
+            if self._last_sync is not None and time.monotonic() - self._last_sync < self.sync_interval:
+                # The last attempt failed recently; don't retry on every search
+                return
+            self._fill_thread = threading.Thread(
+                target=self._fill, args=(service.clone(),), name="LocalCacheFill", daemon=True
+            )
+            self._fill_thread.start()
+
+    def _fill(self, service):
+        """Run the first sync (on the fill thread)"""
+        try:
+            self.sync(service, force=True)
+            self.logger.info("Local record cache is ready")
+        except Exception as e:
+            self.logger.warning(f"Could not fill the local record cache: {str(e)}")
+
+    def sync(self, service, force=False):
+        """Bring the mirror up to date with SQL Server
+
+        Pulls the records added since the last sync (at most once per
+        sync_interval unless force is set) and reconciles edits and deletes
+        once per reconcile_interval.
+
+        Args:
+            service: SQLService whose connection pool is used
+            force (bool): Pull even when the last sync is recent
+        """
+        with self._sync_lock:
+            if not force and self._last_sync is not None and time.monotonic() - self._last_sync < self.sync_interval:
+                return
+
+            # Counted from the attempt, so an unreachable server is only retried once per
+            # sync_interval instead of every search waiting for the connection timeout
+            self._last_sync = time.monotonic()
+            pool, remote = service._acquire_connection()
+            try:
+                first_pull = not self.is_ready()
+                changed = self._pull_new_records(remote)
+
+                last_reconcile = float(self._state('last_reconcile', 0))
+                if first_pull or time.time() - last_reconcile >= self.reconcile_interval:
+                    # After the first pull the checksums are only recorded
+                    changed = self._reconcile(remote, record_only=first_pull) or changed
+
+                if first_pull:
+                    with self._transaction() as local:
+                        self._set_state(local, 'filled', 1)
+            finally:
+                pool.release(remote)
+
+            if changed or first_pull:
+                self._dirty = True
+            self._save_snapshot(force=first_pull)
+
+    def _pull_new_records(self, remote):
+        """Copy the records above the Id watermark
+
+        Returns:
+            bool: True when records were pulled
+        """
+        last_id = int(self._state('last_id', 0))
+        columns = ', '.join(MIRROR_COLUMNS)
+
+        cursor = remote.cursor()
+        try:
+            cursor.execute(f"SELECT {columns} FROM {self.table_name} WHERE Id > ? ORDER BY Id", [last_id])
+            pulled = 0
+            while True:
+                rows = cursor.fetchmany(DEFAULT_SYNC_CHUNK_SIZE)
+                if not rows:
+                    break
+                # Lock per chunk so edits from other threads don't wait for the whole pull
+                with self._transaction() as local:
+                    self._store_rows(local, rows)
+                    last_id = rows[-1][0]
+                    self._set_state(local, 'last_id', last_id)
+                pulled += len(rows)
+        finally:
+            cursor.close()
+
+        with self._transaction() as local:
+            self._set_state(local, 'last_id', last_id)
+        if pulled:
+            self.logger.info(f"Local cache pulled {pulled} new records (up to Id {last_id})")
+        return pulled > 0
+
+    def _store_rows(self, local, rows):
+        """Insert or replace SQL Server rows in the mirror"""
+        local.executemany(
+            f"INSERT OR REPLACE INTO records ({', '.join(MIRROR_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            [(row[0], row[1], row[2], self._date_text(row[3]), None if row[4] is None else int(row[4]),
+              None if row[5] is None else str(row[5]))
+             for row in rows]
+        )
+
+    def _date_text(self, value):
+        """Convert a date from SQL Server or a query parameter to the mirror's ISO text"""
+        if value is None:
+            return None
+        if isinstance(value, date):
+            return value.strftime('%Y-%m-%d')
+        return str(value)[:10]
+
+    def _reconcile(self, remote, record_only=False):
+        """Pull again the buckets whose count or checksum changed on SQL Server
+
+        Args:
+            record_only (bool): Only store the current checksums (the mirror was just filled)
+
+        Returns:
+            bool: True when buckets were pulled again
+        """
+        last_id = int(self._state('last_id', 0))
+        bucket_size = self.bucket_size
+
+        cursor = remote.cursor()
+        try:
+            cursor.execute(f"""
+            SELECT Id / {bucket_size} AS Bucket, COUNT(*) AS RecordCount,
+                   CHECKSUM_AGG(CHECKSUM(Id, OrderNumber, SeparatorName, DateOfSeparation, Analysis)) AS RecordChecksum
+            FROM {self.table_name}
+            WHERE Id <= ?
+            GROUP BY Id / {bucket_size}
+            """, [last_id])
+            remote_buckets = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+        with self._db_lock:
+            stored_buckets = {row[0]: (row[1], row[2]) for row in self._db.execute(
+                "SELECT Bucket, RecordCount, RecordChecksum FROM buckets")}
+
+        changed = [] if record_only else sorted(
+            bucket for bucket in set(remote_buckets) | set(stored_buckets)
+            if remote_buckets.get(bucket) != stored_buckets.get(bucket)
+        )
+
+        columns = ', '.join(MIRROR_COLUMNS)
+        for bucket in changed:
+            start = bucket * bucket_size
+            end = min(start + bucket_size - 1, last_id)
+            rows = []
+            if bucket in remote_buckets:
+                cursor = remote.cursor()
+                try:
+                    cursor.execute(f"SELECT {columns} FROM {self.table_name} WHERE Id BETWEEN ? AND ?", [start, end])
+                    rows = cursor.fetchall()
+                finally:
+                    cursor.close()
+
+            # Replace the whole bucket, which also drops records deleted on the server
+            with self._transaction() as local:
+                local.execute("DELETE FROM records WHERE Id BETWEEN ? AND ?", (start, end))
+                self._store_rows(local, rows)
+
+        with self._transaction() as local:
+            local.execute("DELETE FROM buckets")
+            local.executemany(
+                "INSERT INTO buckets (Bucket, RecordCount, RecordChecksum) VALUES (?, ?, ?)",
+                [(bucket, count, checksum) for bucket, (count, checksum) in remote_buckets.items()]
+            )
+            self._set_state(local, 'last_reconcile', time.time())
+
+        if changed:
+            self.logger.info(f"Local cache refreshed {len(changed)} changed buckets of {bucket_size} records")
+        return bool(changed)
+
+    def _to_sqlite(self, value):
+        """Convert a query parameter (dates, numpy scalars) to a SQLite value
+
+        Text date filters must already be converted with date_bound, since
+        they can't be told apart from the other text parameters here.
+        """
+        if isinstance(value, np.datetime64):
+            return date_bound(value)
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, (date, pd.Timestamp)):
+            return date_bound(value)
+        return value
+
+    def query(self, where, params, order_by, limit=None):
+        """Run a record query against the mirror
+
+        Args:
+            where (str): WHERE clause built by SQLService._build_where (plus keyset conditions)
+            params (list): Parameters of the WHERE clause
+            order_by (str): ORDER BY clause built by SQLService._order_by
+            limit (int): Optional maximum number of rows
+
+        Returns:
+            DataFrame: Records with the columns of a SQL Server query
+        """
+        query = f"SELECT Id, OrderNumber, SeparatorName, DateOfSeparation, Analysis FROM records{where}{order_by}"
+        params = [self._to_sqlite(value) for value in params]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._db_lock:
+            rows = self._db.execute(query, params).fetchall()
+
+        df = pd.DataFrame.from_records(
+            rows, columns=['Id', 'OrderNumber', 'SeparatorName', 'DateOfSeparation', 'Analysis'])
+        if not df.empty:
+            df['DateOfSeparation'] = pd.to_datetime(df['DateOfSeparation'], format='%Y-%m-%d', errors='coerce')
+            df['Analysis'] = df['Analysis'].fillna(0).astype(bool)
+        return df
+
+    def apply_update(self, record_ids, set_clause, parameters):
+        """Apply an edit committed on SQL Server to the mirrored records
+
+        Args:
+            record_ids: IDs of the edited records
+            set_clause (str): SET clause built by SQLService._build_set_clause
+            parameters (list): Parameters of the SET clause
+        """
+        ids = [int(record_id) for record_id in record_ids]
+        with self._transaction() as connection:
+            for start in range(0, len(ids), DEFAULT_APPLY_CHUNK_SIZE):
+                chunk = ids[start:start + DEFAULT_APPLY_CHUNK_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                connection.execute(
+                    f"UPDATE records SET {set_clause} WHERE Id IN ({placeholders})",
+                    [self._to_sqlite(value) for value in parameters] + chunk
+                )
+        self._dirty = True
+
+    def apply_delete(self, record_ids):
+        """Remove records deleted on SQL Server from the mirror"""
+        ids = [int(record_id) for record_id in record_ids]
+        with self._transaction() as connection:
+            for start in range(0, len(ids), DEFAULT_APPLY_CHUNK_SIZE):
+                chunk = ids[start:start + DEFAULT_APPLY_CHUNK_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                connection.execute(f"DELETE FROM records WHERE Id IN ({placeholders})", chunk)
+        self._dirty = True
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_local_cache(path, table_name):
+    """Get the shared mirror for a snapshot file, creating it on first use
+
+    Args:
+        path (str): Encrypted snapshot file
+        table_name (str): Records table on SQL Server
+
+    Returns:
+        LocalCache: The mirror shared by every service using this file
+    """
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None or cache.table_name != table_name:
+            cache = LocalCache(path, table_name)
+            _caches[path] = cache
+        return cache
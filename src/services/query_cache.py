@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# Seconds a cached result is served before the query runs again
+DEFAULT_TTL = 60
+
+# Total DataFrame bytes kept before the least recently used results are evicted
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Maximum number of cached results
+DEFAULT_MAX_ENTRIES = 64
+
+
+class QueryCache:
+    """Thread-safe LRU cache of query results with a TTL and a memory budget
+
+    Results are stored under a key built from the normalized query
+    parameters (see make_key). Each entry expires ttl seconds after it was
+    stored. When the DataFrames together use more than max_bytes, or there
+    are more than max_entries of them, the least recently used ones are
+    evicted. Callers get a copy, so they may modify what they receive.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, max_entries=DEFAULT_MAX_ENTRIES):
+        """Initialize the cache
+
+        Args:
+            ttl (float): Seconds an entry stays valid
+            max_bytes (int): Memory budget for the cached DataFrames
+            max_entries (int): Maximum number of entries
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max(1, int(max_entries))
+        self.logger = logging.getLogger(__name__)
+
+        self._entries = OrderedDict()  # key -> (expires, size, value), most recently used last
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Get a copy of a cached result
+
+        Returns:
+            The cached value (DataFrame, or tuple starting with one), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                # Expired
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[2]
+
+        return self._copy(value)
+
+    def put(self, key, value):
+        """Store a query result
+
+        Args:
+            key: Key from make_key
+            value: DataFrame, or tuple whose first item is a DataFrame
+        """
+        size = self._size(value)
+        if size > self.max_bytes:
+            # Too big to be worth keeping
+            return
+
+        value = self._copy(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every cached result (called whenever records change)"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Get the hit/miss counters and current size
+
+        Returns:
+            dict: hits, misses, hit_ratio, evictions, invalidations, entries, bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _remove(self, key):
+        """Remove an entry (lock must be held)"""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _size(self, value):
+        """Bytes used by the DataFrame in a cached value"""
+        df = value[0] if isinstance(value, tuple) else value
+        if isinstance(df, pd.DataFrame):
+            return int(df.memory_usage(index=True, deep=True).sum())
+        return 0
+
+    def _copy(self, value):
+        """Copy the DataFrame in a value so the cache and callers don't share it"""
+        if isinstance(value, tuple):
+            return (self._copy(value[0]),) + value[1:]
+        if isinstance(value, pd.DataFrame):
+            return value.copy()
+        return value
+
+
+def _normalize(value):
+    """Normalize one query parameter so equivalent calls share a key"""
+    if value is None or isinstance(value, (bool, int)):
+        return value
+    if isinstance(value, str):
+        # Not stripped: ' ABC' and 'ABC' run different LIKE queries
+        return value or None
+    if isinstance(value, tuple):
+        return tuple(_normalize(item) for item in value)
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def make_key(name, **params):
+    """Build a cache key from a query name and its parameters
+
+    Empty text counts as no filter and falsy flags as False, so
+    fetch_data(order_number='') and fetch_data() share an entry. Other
+    text is kept exactly, since it is sent to the query as given.
+    """
+    normalized = []
+    for param, value in sorted(params.items()):
+        value = _normalize(value)
+        if param.endswith('_only'):
+            value = bool(value)
+        normalized.append((param, value))
+    return (name,) + tuple(normalized)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache():
+    """Get the query cache shared by every service, creating it on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = QueryCache()
+        return _cache
@@ -0,0 +1,109 @@
+import logging
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+class QueryWorkerSignals(QObject):
+    """Signals for QueryWorker (QRunnable can't define signals itself)"""
+    finished = Signal(int, object)  # request id, result
+    failed = Signal(int, str)       # request id, error message
+
+class QueryWorker(QRunnable):
+    """Runs a database call on a thread pool thread and reports back through signals"""
+    def __init__(self, request_id, sql_service, func):
+        """Initialize the worker
+
+        Args:
+            request_id (int): Identifier echoed back with the result
+            sql_service: Service instance used only by this worker
+            func: Callable taking the service and returning the result
+        """
+        super().__init__()
+        self.request_id = request_id
+        self.sql_service = sql_service
+        self.func = func
+        self.cancelled = False
+        self.signals = QueryWorkerSignals()
+
+    def run(self):
+        """Run the query"""
+        try:
+            result = self.func(self.sql_service)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(self.request_id, str(e))
+            return
+
+        if not self.cancelled:
+            self.signals.finished.emit(self.request_id, result)
+
+    def cancel(self):
+        """Cancel the statement running on the worker's connection"""
+        self.cancelled = True
+        self.sql_service.cancel()
+
+class QueryRunner(QObject):
+    """Runs one query at a time in the background
+
+    Starting a new query cancels the one in flight, and results that arrive
+    from a superseded query are dropped.
+    """
+    result_ready = Signal(object, object)  # result, context
+    error = Signal(str, object)            # error message, context
+
+    def __init__(self, sql_service, parent=None):
+        super().__init__(parent)
+        self.sql_service = sql_service
+        self.thread_pool = QThreadPool.globalInstance()
+        self.logger = logging.getLogger(__name__)
+        self._request_id = 0
+        self._active_worker = None
+        self._contexts = {}
+
+    def run(self, func, context=None):
+        """Start a query, superseding any query still running
+
+        Args:
+            func: Callable taking a SQLService and returning the result
+            context: Any value passed back with the result or error
+
+        Returns:
+            int: The request id of the new query
+        """
+        self.cancel()
+
+        self._request_id += 1
+        self._contexts = {self._request_id: context}
+
+        # Each worker gets its own service so cursors are never shared between threads
+        worker = QueryWorker(self._request_id, self.sql_service.clone(), func)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        self._active_worker = worker
+
+        self.thread_pool.start(worker)
+        return self._request_id
+
+    def cancel(self):
+        """Cancel the query in flight, if any"""
+        if self._active_worker is not None:
+            self._active_worker.cancel()
+            self._active_worker = None
+
+    def is_running(self):
+        """Check whether a query is still in flight"""
+        return self._active_worker is not None
+
+    def _on_finished(self, request_id, result):
+        if request_id != self._request_id:
+            self.logger.info(f"Dropping stale result of query {request_id}")
+            return
+
+        self._active_worker = None
+        self.result_ready.emit(result, self._contexts.pop(request_id, None))
+
+    def _on_failed(self, request_id, message):
+        if request_id != self._request_id:
+            return
+
+        self._active_worker = None
+        self.error.emit(message, self._contexts.pop(request_id, None))
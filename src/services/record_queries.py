@@ -0,0 +1,76 @@
+# Columns results may be ordered by (anything else is rejected before reaching SQL)
+SORT_COLUMNS = ('Id', 'OrderNumber', 'SeparatorName', 'DateOfSeparation', 'Analysis')
+DEFAULT_SORT_COLUMN = 'DateOfSeparation'
+
+# Columns returned by record queries
+RECORD_COLUMNS = ['Id', 'OrderNumber', 'SeparatorName', 'DateOfSeparation', 'Analysis']
+
+
+def build_where(from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False):
+    """Build the WHERE clause shared by the record queries
+
+    Returns:
+        tuple: (where_clause, params)
+    """
+    where = " WHERE 1=1"
+    params = []
+
+    # Add date filters if specified
+    if from_date:
+        where += " AND DateOfSeparation >= ?"
+        params.append(from_date)
+
+    if to_date:
+        where += " AND DateOfSeparation <= ?"
+        params.append(to_date)
+
+    # Add order number filter if specified
+    if order_number:
+        where += " AND OrderNumber LIKE ?"
+        params.append(f"%{order_number}%")
+
+    # Add separator name filter if specified
+    if separator_name:
+        where += " AND SeparatorName LIKE ?"
+        params.append(f"%{separator_name}%")
+
+    # Add analysis filter if specified
+    if analysis_only:
+        where += " AND Analysis = 1"
+
+    return where, params
+
+
+def build_order_by(sort_column=DEFAULT_SORT_COLUMN, descending=True):
+    """Build the ORDER BY clause, with Id as the tie-breaker
+
+    Args:
+        sort_column (str): One of SORT_COLUMNS
+        descending (bool): Sort direction
+    """
+    if sort_column not in SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by column '{sort_column}'")
+
+    direction = "DESC" if descending else "ASC"
+    if sort_column == 'Id':
+        return f" ORDER BY Id {direction}"
+    return f" ORDER BY {sort_column} {direction}, Id {direction}"
+
+
+def build_fetch_query(table_name, from_date=None, to_date=None, order_number=None, separator_name=None,
+                      analysis_only=False, sort_column=DEFAULT_SORT_COLUMN, descending=True):
+    """Build the filtered SELECT used by fetch_data and fetch_iter of both SQL services
+
+    Args:
+        table_name (str): Records table
+
+    Returns:
+        tuple: (query, params)
+    """
+    where, params = build_where(from_date, to_date, order_number, separator_name, analysis_only)
+    query = f"SELECT {', '.join(RECORD_COLUMNS)} FROM {table_name}{where}"
+
+    # Order by date descending unless another sort was asked for
+    query += build_order_by(sort_column, descending)
+
+    return query, params
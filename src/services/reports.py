@@ -0,0 +1,239 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+
+# Columns of a per-day summary (one row per separator and day)
+DAILY_SUMMARY_COLUMNS = ['SeparatorName', 'Day', 'Orders', 'AnalysisCount', 'AnalysisRatio']
+
+# Columns of a per-separator summary over the whole period
+SEPARATOR_SUMMARY_COLUMNS = ['SeparatorName', 'Days', 'Orders', 'OrdersPerDay', 'AnalysisCount', 'AnalysisRatio']
+
+# Suffix of the optional rollup table (one row per day and separator) kept next to the records table
+DAILY_SUMMARY_SUFFIX = "DailySummary"
+
+# Session temp table collecting the (day, separator) keys touched by a write
+SUMMARY_KEYS_TABLE = "#SeparatorSummaryKeys"
+
+
+def daily_summary_table(table_name):
+    """Name of the rollup table of a records table"""
+    return f"{table_name}{DAILY_SUMMARY_SUFFIX}"
+
+
+def daily_summary_exists(cursor, table_name):
+    """Check whether the rollup table has been created (see setup_database.py)
+
+    Args:
+        cursor: Open pyodbc cursor
+        table_name (str): Records table
+
+    Returns:
+        bool: True when the rollup table exists
+    """
+    cursor.execute("SELECT OBJECT_ID(?, 'U')", (daily_summary_table(table_name),))
+    row = cursor.fetchone()
+    return row is not None and row[0] is not None
+
+
+def _is_whole_day(value):
+    """Whether a date filter falls on midnight, so it can be answered per day"""
+    if value is None:
+        return True
+    if isinstance(value, datetime):
+        return value.time() == datetime.min.time()
+    if isinstance(value, str):
+        value = value.strip()
+        return len(value) <= 10 or pd.Timestamp(value) == pd.Timestamp(value).normalize()
+    return True
+
+
+def daily_summary_enabled():
+    """Whether reports may read the rollup table (MPR_DAILY_SUMMARY=1, off by default)
+
+    Only SQLService keeps the rollup in step with the records; changes made
+    by SQL scripts, the read-only tools or older clients leave it behind
+    until it is rebuilt with setup_database.py.
+    """
+    return os.environ.get("MPR_DAILY_SUMMARY", "0") == "1"
+
+
+def can_use_daily_summary(from_date=None, to_date=None):
+    """Whether the rollup table can answer a summary with these filters
+
+    Reading it must be enabled (see daily_summary_enabled), and the rollup
+    only knows whole days, so filters with a time of day must read the
+    records table.
+    """
+    if not daily_summary_enabled():
+        return False
+    try:
+        return _is_whole_day(from_date) and _is_whole_day(to_date)
+    except (ValueError, TypeError):
+        return False
+
+
+def build_summary_query(table_name, from_date=None, to_date=None, separator_name=None, by_day=True,
+                        use_daily_summary=False):
+    """Build the GROUP BY query counting orders and analyses per separator
+
+    The grouping runs on SQL Server, so a month of records comes back as a
+    few hundred summary rows instead of every record. With use_daily_summary
+    the counts are read from the rollup table instead of the records.
+
+    Args:
+        table_name (str): Records table
+        from_date (str): Optional first day (yyyy-MM-dd)
+        to_date (str): Optional last day (yyyy-MM-dd)
+        separator_name (str): Optional separator name filter (substring)
+        by_day (bool): One row per separator and day instead of per separator
+        use_daily_summary (bool): Read the rollup table (see can_use_daily_summary)
+
+    Returns:
+        tuple: (query, params)
+    """
+    if use_daily_summary:
+        source = daily_summary_table(table_name)
+        day = "Day"
+        counts = "SUM(Orders) AS Orders, SUM(AnalysisCount) AS AnalysisCount"
+    else:
+        source = table_name
+        day = "CAST(DateOfSeparation AS date)"
+        counts = ("COUNT(*) AS Orders, "
+                  "SUM(CASE WHEN Analysis = 1 THEN 1 ELSE 0 END) AS AnalysisCount")
+    date_column = "Day" if use_daily_summary else "DateOfSeparation"
+
+    where = " WHERE 1=1"
+    params = []
+
+    # Add date filters if specified
+    if from_date:
+        where += f" AND {date_column} >= ?"
+        params.append(from_date)
+
+    if to_date:
+        where += f" AND {date_column} <= ?"
+        params.append(to_date)
+
+    # Add separator name filter if specified
+    if separator_name:
+        where += " AND SeparatorName LIKE ?"
+        params.append(f"%{separator_name}%")
+
+    if by_day:
+        query = (f"SELECT SeparatorName, {day} AS Day, {counts} "
+                 f"FROM {source}{where} "
+                 f"GROUP BY SeparatorName, {day} "
+                 f"ORDER BY Day DESC, SeparatorName")
+    else:
+        query = (f"SELECT SeparatorName, COUNT(DISTINCT {day}) AS Days, {counts} "
+                 f"FROM {source}{where} "
+                 f"GROUP BY SeparatorName "
+                 f"ORDER BY Orders DESC, SeparatorName")
+
+    return query, params
+
+
+def build_summary_refresh(table_name):
+    """Build the MERGE recounting the rollup rows of the keys in SUMMARY_KEYS_TABLE
+
+    Each collected (day, separator) key is counted again from the records
+    table, so inserts, edits and deletes are all handled the same way. Keys
+    left without records are removed. NULL days and names are keys too.
+
+    Args:
+        table_name (str): Records table
+
+    Returns:
+        str: MERGE statement
+    """
+    summary = daily_summary_table(table_name)
+    return f"""
+    MERGE {summary} WITH (HOLDLOCK) AS target
+    USING (
+        SELECT k.Day, k.SeparatorName,
+               COUNT(r.Id) AS Orders,
+               ISNULL(SUM(CASE WHEN r.Analysis = 1 THEN 1 ELSE 0 END), 0) AS AnalysisCount
+        FROM (SELECT DISTINCT Day, SeparatorName FROM {SUMMARY_KEYS_TABLE}) k
+        LEFT JOIN {table_name} r
+          ON (r.DateOfSeparation = k.Day OR (r.DateOfSeparation IS NULL AND k.Day IS NULL))
+         AND (r.SeparatorName = k.SeparatorName OR (r.SeparatorName IS NULL AND k.SeparatorName IS NULL))
+        GROUP BY k.Day, k.SeparatorName
+    ) AS source
+    ON EXISTS (SELECT target.Day, target.SeparatorName INTERSECT SELECT source.Day, source.SeparatorName)
+    WHEN MATCHED AND source.Orders = 0 THEN
+        DELETE
+    WHEN MATCHED THEN
+        UPDATE SET Orders = source.Orders, AnalysisCount = source.AnalysisCount
+    WHEN NOT MATCHED BY TARGET AND source.Orders > 0 THEN
+        INSERT (Day, SeparatorName, Orders, AnalysisCount)
+        VALUES (source.Day, source.SeparatorName, source.Orders, source.AnalysisCount);
+    """
+
+
+def build_summary_rebuild(table_name):
+    """Build the statements creating the rollup table and recounting it from scratch
+
+    The records table is read under a shared table lock held until commit,
+    so writes made during the rebuild wait instead of being missed.
+
+    Args:
+        table_name (str): Records table
+
+    Returns:
+        list: SQL statements to run in one transaction
+    """
+    summary = daily_summary_table(table_name)
+    return [
+        f"""
+        IF OBJECT_ID(N'{summary}', N'U') IS NULL
+        CREATE TABLE {summary} (
+            Day DATE NULL,
+            SeparatorName NVARCHAR(255) NULL,
+            Orders INT NOT NULL,
+            AnalysisCount INT NOT NULL
+        )
+        """,
+        f"""
+        IF NOT EXISTS (SELECT 1 FROM sys.indexes
+                       WHERE object_id = OBJECT_ID(N'{summary}') AND name = N'UX_{summary}_Day_SeparatorName')
+        CREATE UNIQUE CLUSTERED INDEX UX_{summary}_Day_SeparatorName ON {summary} (Day, SeparatorName)
+        """,
+        f"DELETE FROM {summary} WITH (TABLOCKX)",
+        f"""
+        INSERT INTO {summary} (Day, SeparatorName, Orders, AnalysisCount)
+        SELECT DateOfSeparation, SeparatorName, COUNT(*),
+               SUM(CASE WHEN Analysis = 1 THEN 1 ELSE 0 END)
+        FROM {table_name} WITH (TABLOCK, HOLDLOCK)
+        GROUP BY DateOfSeparation, SeparatorName
+        """,
+    ]
+
+
+def summary_to_dataframe(rows, columns, by_day=True):
+    """Convert summary rows into a DataFrame with the derived rate columns
+
+    Args:
+        rows: Rows returned by the summary query
+        columns: Column names from cursor.description
+        by_day (bool): Whether the query was grouped by day
+
+    Returns:
+        DataFrame: DAILY_SUMMARY_COLUMNS or SEPARATOR_SUMMARY_COLUMNS
+    """
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    if df.empty:
+        return pd.DataFrame(columns=DAILY_SUMMARY_COLUMNS if by_day else SEPARATOR_SUMMARY_COLUMNS)
+
+    df['Orders'] = df['Orders'].astype('int64')
+    df['AnalysisCount'] = df['AnalysisCount'].fillna(0).astype('int64')
+    df['AnalysisRatio'] = df['AnalysisCount'] / df['Orders']
+
+    if by_day:
+        df['Day'] = pd.to_datetime(df['Day'], errors='coerce')
+        return df[DAILY_SUMMARY_COLUMNS]
+
+    df['Days'] = df['Days'].astype('int64')
+    # Records without a date don't count as a day worked
+    df['OrdersPerDay'] = df['Orders'] / df['Days'].where(df['Days'] > 0)
+    return df[SEPARATOR_SUMMARY_COLUMNS]
@@ -0,0 +1,226 @@
+from src.services.sql_service import DUPLICATE_KEY_COLUMNS
+
+# Non-key columns stored in the date index, so fetch_data never looks up the base table
+COVERING_INCLUDE_COLUMNS = ('OrderNumber', 'SeparatorName', 'Analysis')
+
+# Missing-index suggestions recorded by SQL Server for a table, most useful first
+MISSING_INDEX_QUERY = """
+SELECT d.equality_columns, d.inequality_columns, d.included_columns,
+       s.user_seeks, s.user_scans, s.avg_total_user_cost, s.avg_user_impact,
+       s.user_seeks * s.avg_total_user_cost * (s.avg_user_impact / 100.0) AS improvement
+FROM sys.dm_db_missing_index_details d
+INNER JOIN sys.dm_db_missing_index_groups g ON g.index_handle = d.index_handle
+INNER JOIN sys.dm_db_missing_index_group_stats s ON s.group_handle = g.index_group_handle
+WHERE d.database_id = DB_ID() AND d.object_id = OBJECT_ID(?)
+ORDER BY improvement DESC
+"""
+
+# Columns of every index on a table, in key order
+INDEX_COLUMNS_QUERY = """
+SELECT i.name, i.type_desc, i.is_unique, c.name, ic.is_descending_key, ic.is_included_column
+FROM sys.indexes i
+INNER JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+INNER JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+WHERE i.object_id = OBJECT_ID(?)
+ORDER BY i.index_id, ic.is_included_column, ic.key_ordinal, ic.index_column_id
+"""
+
+
+def date_index_name(table_name):
+    """Name of the covering index used by the date filtered record queries"""
+    return f"IX_{table_name}_DateOfSeparation_Id"
+
+
+def duplicate_key_name(table_name):
+    """Name of the unique index on DUPLICATE_KEY_COLUMNS"""
+    return f"UX_{table_name}_{'_'.join(DUPLICATE_KEY_COLUMNS)}"
+
+
+def build_create_table(table_name):
+    """Build the statement creating the records table when it doesn't exist
+
+    Args:
+        table_name (str): Records table
+
+    Returns:
+        str: CREATE TABLE statement
+    """
+    return f"""
+    IF OBJECT_ID(N'{table_name}', N'U') IS NULL
+    CREATE TABLE {table_name} (
+        Id INT IDENTITY(1,1) PRIMARY KEY,
+        OrderNumber NVARCHAR(100) NOT NULL,
+        SeparatorName NVARCHAR(255) NOT NULL,
+        DateOfSeparation DATE,
+        Analysis BIT DEFAULT 0,
+        CreatedAt DATETIME DEFAULT GETDATE()
+    )
+    """
+
+
+def _create_index_if_missing(table_name, index_name, definition):
+    """Wrap a CREATE INDEX so it only runs when the index doesn't exist yet"""
+    return f"""
+    IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID(N'{table_name}') AND name = N'{index_name}')
+    {definition}
+    """
+
+
+def build_date_index(table_name):
+    """Build the covering index for date range searches ordered by date
+
+    The keys follow the ORDER BY DateOfSeparation DESC, Id DESC used by
+    fetch_data and fetch_page, so results (and keyset pages) come straight
+    off the index. The other selected columns are included, which also
+    lets LIKE filters on OrderNumber/SeparatorName scan the narrow index
+    instead of the table.
+
+    Args:
+        table_name (str): Records table
+
+    Returns:
+        str: CREATE INDEX statement
+    """
+    index_name = date_index_name(table_name)
+    include = ', '.join(COVERING_INCLUDE_COLUMNS)
+    return _create_index_if_missing(
+        table_name, index_name,
+        f"CREATE NONCLUSTERED INDEX {index_name} ON {table_name} (DateOfSeparation DESC, Id DESC) INCLUDE ({include})"
+    )
+
+
+def build_duplicate_key(table_name):
+    """Build the unique index on DUPLICATE_KEY_COLUMNS
+
+    save_data relies on it to reject duplicate records, and the NOT EXISTS
+    check of merge_data becomes an index seek.
+
+    Args:
+        table_name (str): Records table
+
+    Returns:
+        str: CREATE UNIQUE INDEX statement
+    """
+    index_name = duplicate_key_name(table_name)
+    key_columns = ', '.join(DUPLICATE_KEY_COLUMNS)
+    return _create_index_if_missing(
+        table_name, index_name,
+        f"CREATE UNIQUE NONCLUSTERED INDEX {index_name} ON {table_name} ({key_columns})"
+    )
+
+
+def count_duplicate_keys(cursor, table_name):
+    """Count the key values stored more than once (the unique index can't be created while any exist)
+
+    Args:
+        cursor: Open pyodbc cursor
+        table_name (str): Records table
+
+    Returns:
+        int: Number of duplicated keys
+    """
+    key_columns = ', '.join(DUPLICATE_KEY_COLUMNS)
+    cursor.execute(
+        f"SELECT COUNT(*) FROM (SELECT 1 AS Duplicate FROM {table_name} "
+        f"GROUP BY {key_columns} HAVING COUNT(*) > 1) d"
+    )
+    return cursor.fetchone()[0]
+
+
+def list_indexes(cursor, table_name):
+    """List the indexes of a table
+
+    Args:
+        cursor: Open pyodbc cursor
+        table_name (str): Records table
+
+    Returns:
+        list: dicts with name, type, unique, keys and included columns
+    """
+    cursor.execute(INDEX_COLUMNS_QUERY, (table_name,))
+
+    indexes = {}
+    for name, type_desc, is_unique, column, descending, included in cursor.fetchall():
+        index = indexes.setdefault(name, {
+            'name': name, 'type': type_desc, 'unique': bool(is_unique), 'keys': [], 'included': []
+        })
+        if included:
+            index['included'].append(column)
+        else:
+            index['keys'].append(f"{column} DESC" if descending else column)
+    return list(indexes.values())
+
+
+def missing_indexes(cursor, table_name):
+    """Read SQL Server's missing-index suggestions for a table
+
+    The suggestions are collected since the last server restart and need
+    the VIEW SERVER STATE (VIEW DATABASE STATE on Azure SQL) permission.
+
+    Args:
+        cursor: Open pyodbc cursor
+        table_name (str): Records table
+
+    Returns:
+        list: dicts with the suggested columns, usage and estimated improvement
+    """
+    cursor.execute(MISSING_INDEX_QUERY, (table_name,))
+    suggestions = []
+    for row in cursor.fetchall():
+        equality, inequality, included, seeks, scans, cost, impact, improvement = row
+        keys = ', '.join(columns for columns in (equality, inequality) if columns)
+        suggestion = {
+            'keys': keys,
+            'included': included or '',
+            'seeks': seeks,
+            'scans': scans,
+            'impact': impact,
+            'improvement': improvement,
+            'statement': f"CREATE NONCLUSTERED INDEX ON {table_name} ({keys})"
+        }
+        if included:
+            suggestion['statement'] += f" INCLUDE ({included})"
+        suggestions.append(suggestion)
+    return suggestions
+
+
+def profile_query(cursor, query, params=()):
+    """Run a query with SET STATISTICS IO, TIME and PROFILE turned on
+
+    The statistics come back as informational messages (logical reads per
+    table, CPU and elapsed time) and the executed plan as an extra result
+    set with the actual rows of each operator. The settings are turned off
+    again before the connection returns to the pool.
+
+    Args:
+        cursor: Open pyodbc cursor
+        query (str): Query to profile
+        params: Query parameters
+
+    Returns:
+        dict: {'rows': rows returned, 'messages': statistics lines, 'plan': (rows, executes, operator) tuples}
+    """
+    result = {'rows': 0, 'messages': [], 'plan': []}
+
+    def collect_messages():
+        for _, message in getattr(cursor, 'messages', None) or []:
+            result['messages'].append(message.split(']')[-1].strip())
+
+    cursor.execute("SET STATISTICS IO ON; SET STATISTICS TIME ON; SET STATISTICS PROFILE ON")
+    try:
+        cursor.execute(query, params)
+        result['rows'] = len(cursor.fetchall())
+        collect_messages()
+
+        # The executed plan follows the query results
+        while cursor.nextset():
+            if cursor.description:
+                columns = [column[0] for column in cursor.description]
+                for row in cursor.fetchall():
+                    values = dict(zip(columns, row))
+                    result['plan'].append((values.get('Rows'), values.get('Executes'), values.get('StmtText')))
+            collect_messages()
+    finally:
+        cursor.execute("SET STATISTICS IO OFF; SET STATISTICS TIME OFF; SET STATISTICS PROFILE OFF")
+
+    return result
@@ -0,0 +1,49 @@
+import os
+import logging
+
+# Registry key written by the installer and setup_environment.py
+REGISTRY_PATH = r"Software\MPR Labs\MPR Labs - MPR Separator\Settings"
+
+# Driver used when the registry doesn't name one
+DEFAULT_SQL_DRIVER = "ODBC Driver 18 for SQL Server"
+
+logger = logging.getLogger(__name__)
+
+def get_registry_setting(name, default=None):
+    """Read a value from the application's registry settings
+
+    Args:
+        name (str): Value name under the Settings key
+        default: Value returned when the key or value doesn't exist
+    """
+    try:
+        import winreg
+        registry_key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REGISTRY_PATH, 0, winreg.KEY_READ)
+        try:
+            value, _ = winreg.QueryValueEx(registry_key, name)
+        finally:
+            winreg.CloseKey(registry_key)
+        return value
+    except Exception:
+        return default
+
+def get_sql_driver():
+    """Get the ODBC driver name from the registry, with a default"""
+    sql_driver = get_registry_setting("SqlDriver")
+    if sql_driver:
+        logger.info(f"Using SQL driver from registry: {sql_driver}")
+        return sql_driver
+
+    logger.info(f"Using default SQL driver: {DEFAULT_SQL_DRIVER}")
+    return DEFAULT_SQL_DRIVER
+
+def get_data_path():
+    """Get the application data directory, creating it if needed"""
+    data_path = get_registry_setting("DataPath")
+    if not data_path:
+        # Default to local appdata if registry key not found
+        data_path = os.path.join(os.environ.get("LOCALAPPDATA", ""), "MPR Labs - MPR Separator", "Data")
+
+    # Ensure data directory exists
+    os.makedirs(data_path, exist_ok=True)
+    return data_path
@@ -1,18 +1,66 @@
 import pandas as pd
+import numpy as np
 import pyodbc
 import os
+import copy
 from datetime import datetime
 import logging
 import sys
+import time
 
 # Add project root to sys.path if needed
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from AzureKeyVault import AzureKeyVaultClient
+from src.services.connection_pool import get_pool
+from src.services.local_cache import date_bound, get_local_cache, remove_database_files
+from src.services.query_cache import get_query_cache, make_key
+from src.services.record_queries import (
+    DEFAULT_SORT_COLUMN, RECORD_COLUMNS, SORT_COLUMNS, build_fetch_query, build_order_by, build_where
+)
+from src.services.reports import (
+    SUMMARY_KEYS_TABLE, build_summary_query, build_summary_rebuild, build_summary_refresh,
+    can_use_daily_summary, daily_summary_exists, daily_summary_table, summary_to_dataframe
+)
+from src.services.settings import get_data_path, get_sql_driver
+
+# Number of rows sent to SQL Server per executemany round trip
+DEFAULT_BATCH_SIZE = 1000
+
+# Number of rows per DataFrame chunk yielded by fetch_iter
+DEFAULT_CHUNK_SIZE = 10000
+
+# IDs per DELETE statement (SQL Server accepts at most 2100 parameters)
+DEFAULT_DELETE_CHUNK_SIZE = 1000
+
+# Rows per page when the grid loads results incrementally
+DEFAULT_PAGE_SIZE = 500
+
+# Seconds a resolved connection string is reused before secrets are read again
+CONNECTION_STRING_TTL = 900
+
+# File name of the encrypted Key Vault secret cache under the data path
+SECRET_CACHE_FILE = "secrets.cache"
+
+# File name of the encrypted snapshot of the records mirror under the data path
+LOCAL_CACHE_FILE = "records_cache.dat"
+
+# Unencrypted mirror written by earlier versions, deleted on start
+LEGACY_LOCAL_CACHE_FILE = "records_cache.sqlite"
+
+# Savepoint taken after each saved batch so a duplicate key only undoes its own batch
+SAVE_BATCH_SAVEPOINT = "SeparatorBatch"
+
+# Columns that identify a duplicate record in the records table
+DUPLICATE_KEY_COLUMNS = ('OrderNumber', 'SeparatorName')
 
 class SQLService:
-    def __init__(self):
+    def __init__(self, key_vault_client=None):
         self.connection = None
         self.cursor = None
+        self.pool = None
+        self._conn_str = None
+        self._conn_str_expires = 0
+        self._iter_cursor = None
         
         # Set up logging
         logging.basicConfig(
@@ -21,137 +69,260 @@ class SQLService:
         )
         self.logger = logging.getLogger(__name__)
         
+        # Optional SQLite mirror answering record queries (set MPR_LOCAL_CACHE=1 to enable).
+        # It holds the whole table in memory, and edits or deletes made by other
+        # clients only show up after the next reconciliation (up to 15 minutes)
+        self.local_cache = None
+        try:
+            data_path = get_data_path()
+            remove_database_files(os.path.join(data_path, LEGACY_LOCAL_CACHE_FILE))
+            if os.environ.get("MPR_LOCAL_CACHE", "0") == "1":
+                table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+                self.local_cache = get_local_cache(os.path.join(data_path, LOCAL_CACHE_FILE), table_name)
+        except Exception as e:
+            self.logger.warning(f"Local record cache disabled: {str(e)}")
+        
+        # Shared cache of recent query results (set MPR_QUERY_CACHE=0 to disable)
+        self.query_cache = get_query_cache() if os.environ.get("MPR_QUERY_CACHE", "1") != "0" else None
+        
+        # Use the provided secret client (shared or fake) when given
+        if key_vault_client is not None:
+            self.key_vault_client = key_vault_client
+            return
+        
         # Initialize Key Vault client - use environment variable if available
         key_vault_url = os.environ.get("KEY_VAULT_URI", "https://mprkv2024az.vault.azure.net/")
+        
+        # Optional encrypted secret cache under the data path (set KEY_VAULT_DISK_CACHE=0 to disable)
+        cache_path = None
+        if os.environ.get("KEY_VAULT_DISK_CACHE", "1") != "0":
+            try:
+                cache_path = os.path.join(get_data_path(), SECRET_CACHE_FILE)
+            except Exception as e:
+                self.logger.warning(f"Secret disk cache disabled: {str(e)}")
+        
         try:
-            self.key_vault_client = AzureKeyVaultClient(vault_url=key_vault_url)
+            self.key_vault_client = AzureKeyVaultClient(vault_url=key_vault_url, cache_path=cache_path)
             self.logger.info(f"Azure Key Vault client initialized with URL: {key_vault_url}")
         except Exception as e:
             self.logger.warning(f"Failed to initialize Azure Key Vault client: {str(e)}. Will fall back to environment variables if needed.")
             self.key_vault_client = None
         
-    def connect(self):
-        """Connect to the SQL Server database using secure credential management"""
-        try:
-            conn_str = None
+    def _get_connection_string(self):
+        """Resolve the connection string, reusing it until CONNECTION_STRING_TTL expires"""
+        if self._conn_str and time.monotonic() < self._conn_str_expires:
+            return self._conn_str
+        
+        conn_str = None
+        
+        # Priority 1: Try to get connection string from Key Vault
+        if self.key_vault_client:
+            try:
+                self.logger.info("Attempting to retrieve connection string from Azure Key Vault")
+                conn_str = self.key_vault_client.get_secret("SqlConnString")
+                self.logger.info("Successfully retrieved connection string from Azure Key Vault")
+            except Exception as kv_error:
+                self.logger.warning(f"Could not retrieve connection string from Key Vault: {str(kv_error)}")
+        
+        # Priority 2: Try to get connection string from environment variables
+        if not conn_str:
+            conn_str = os.environ.get("DB_CONN_STR")
+            if conn_str:
+                self.logger.info("Using connection string from environment variable DB_CONN_STR")
+            else:
+                self.logger.info("Connection string not available from Key Vault or environment variables")
+        
+        # Priority 3: Build connection string from individual parameters
+        if not conn_str:
+            # Try to get individual parameters from Key Vault first
+            server = None
+            database = None
+            username = None
+            password = None
             
-            # Priority 1: Try to get connection string from Key Vault
             if self.key_vault_client:
                 try:
-                    self.logger.info("Attempting to retrieve connection string from Azure Key Vault")
-                    conn_str = self.key_vault_client.get_secret("SqlConnString")
-                    self.logger.info("Successfully retrieved connection string from Azure Key Vault")
+                    server = self.key_vault_client.get_secret("SqlServerName")
+                    database = self.key_vault_client.get_secret("SqlDatabaseName")
+                    username = self.key_vault_client.get_secret("SqlUsername")
+                    password = self.key_vault_client.get_secret("SqlPassword")
+                    self.logger.info("Using database credentials from Azure Key Vault")
                 except Exception as kv_error:
-                    self.logger.warning(f"Could not retrieve connection string from Key Vault: {str(kv_error)}")
+                    self.logger.warning(f"Could not retrieve all SQL parameters from Key Vault: {str(kv_error)}")
             
-            # Priority 2: Try to get connection string from environment variables
-            if not conn_str:
-                conn_str = os.environ.get("DB_CONN_STR")
-                if conn_str:
-                    self.logger.info("Using connection string from environment variable DB_CONN_STR")
-                else:
-                    self.logger.info("Connection string not available from Key Vault or environment variables")
-            
-            # Priority 3: Build connection string from individual parameters
-            if not conn_str:
-                # Try to get individual parameters from Key Vault first
-                server = None
-                database = None
-                username = None
-                password = None
-                
-                if self.key_vault_client:
-                    try:
-                        server = self.key_vault_client.get_secret("SqlServerName")
-                        database = self.key_vault_client.get_secret("SqlDatabaseName")
-                        username = self.key_vault_client.get_secret("SqlUsername")
-                        password = self.key_vault_client.get_secret("SqlPassword")
-                        self.logger.info("Using database credentials from Azure Key Vault")
-                    except Exception as kv_error:
-                        self.logger.warning(f"Could not retrieve all SQL parameters from Key Vault: {str(kv_error)}")
-                
-                # Fall back to environment variables if Key Vault retrieval failed
-                if not server or not database or not username or not password:
-                    server = os.environ.get("DB_SERVER", "")
-                    database = os.environ.get("DB_NAME", "")
-                    username = os.environ.get("DB_USERNAME", "")
-                    password = os.environ.get("DB_PASSWORD", "")
-                    self.logger.info("Using database credentials from environment variables")
-                
-                # Validate we have the required parameters
-                if not server or not database:
-                    raise ValueError("Database connection parameters not available from Key Vault or environment variables")
-                
-                # Try to get SQL driver from registry
-                try:
-                    import winreg
-                    reg_path = r"Software\MPR Labs\MPR Labs - MPR Separator\Settings"
-                    registry_key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path, 0, winreg.KEY_READ)
-                    sql_driver, _ = winreg.QueryValueEx(registry_key, "SqlDriver")
-                    winreg.CloseKey(registry_key)
-                    self.logger.info(f"Using SQL driver from registry: {sql_driver}")
-                except Exception as reg_error:
-                    # Default to ODBC Driver 18 if registry key not found
-                    sql_driver = "ODBC Driver 18 for SQL Server"
-                    self.logger.info(f"Using default SQL driver: {sql_driver}")
-                
-                # Create connection string from components
-                conn_str = (
-                    f"DRIVER={{{sql_driver}}};"
-                    f"SERVER={server};"
-                    f"DATABASE={database};"
-                    f"UID={username};"
-                    f"PWD={password};"
-                    f"Encrypt=yes;TrustServerCertificate=yes;Connection Timeout=30;"
-                )
-                
-                # Try to get data path from registry
+            # Fall back to environment variables if Key Vault retrieval failed
+            if not server or not database or not username or not password:
+                server = os.environ.get("DB_SERVER", "")
+                database = os.environ.get("DB_NAME", "")
+                username = os.environ.get("DB_USERNAME", "")
+                password = os.environ.get("DB_PASSWORD", "")
+                self.logger.info("Using database credentials from environment variables")
+            
+            # Validate we have the required parameters
+            if not server or not database:
+                raise ValueError("Database connection parameters not available from Key Vault or environment variables")
+            
+            # Create connection string from components
+            conn_str = (
+                f"DRIVER={{{get_sql_driver()}}};"
+                f"SERVER={server};"
+                f"DATABASE={database};"
+                f"UID={username};"
+                f"PWD={password};"
+                f"Encrypt=yes;TrustServerCertificate=yes;Connection Timeout=30;"
+            )
+        
+        self._conn_str = conn_str
+        self._conn_str_expires = time.monotonic() + CONNECTION_STRING_TTL
+        return conn_str
+    
+    def clone(self):
+        """Create a service sharing this one's secrets, for use on another thread"""
+        service = copy.copy(self)
+        service.connection = None
+        service.cursor = None
+        service.pool = None
+        service._iter_cursor = None
+        return service
+    
+    def cancel(self):
+        """Cancel the statement currently running on this service (safe from another thread)"""
+        for cursor in (self.cursor, self._iter_cursor):
+            if cursor:
                 try:
-                    import winreg
-                    reg_path = r"Software\MPR Labs\MPR Labs - MPR Separator\Settings"
-                    registry_key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path, 0, winreg.KEY_READ)
-                    data_path, _ = winreg.QueryValueEx(registry_key, "DataPath")
-                    winreg.CloseKey(registry_key)
-                    self.logger.info(f"Using data path from registry: {data_path}")
-                except Exception as reg_error:
-                    # Default to local appdata if registry key not found
-                    data_path = os.path.join(os.environ.get("LOCALAPPDATA", ""), "MPR Labs - MPR Separator", "Data")
-                    self.logger.info(f"Using default data path: {data_path}")
-                
-                # Ensure data directory exists
-                os.makedirs(data_path, exist_ok=True)
+                    cursor.cancel()
+                    self.logger.info("Cancelled running database query")
+                except pyodbc.Error as e:
+                    self.logger.warning(f"Could not cancel database query: {str(e)}")
+    
+    def invalidate_credentials(self):
+        """Forget the resolved connection string and cached Key Vault secrets"""
+        if self._conn_str:
+            get_pool(self._conn_str).close_all()
+        self._conn_str = None
+        if self.key_vault_client and hasattr(self.key_vault_client, 'invalidate'):
+            self.key_vault_client.invalidate()
+    
+    def _is_auth_error(self, error):
+        """Check whether a connection error means the credentials were rejected"""
+        error_msg = str(error)
+        return "28000" in error_msg or "Login failed" in error_msg
+    
+    def _acquire_connection(self):
+        """Borrow a pooled connection, refreshing secrets once if the login is rejected
+        
+        Returns:
+            tuple: (pool, connection)
+        """
+        pool = get_pool(self._get_connection_string())
+        try:
+            return pool, pool.acquire()
+        except pyodbc.Error as e:
+            if not self._is_auth_error(e):
+                raise
             
-            # Connect to the database
-            self.connection = pyodbc.connect(conn_str)
+            # Credentials may have been rotated: refresh secrets and retry once
+            self.logger.warning("Database rejected cached credentials, refreshing secrets from Key Vault")
+            self.invalidate_credentials()
+            pool = get_pool(self._get_connection_string())
+            return pool, pool.acquire()
+    
+    def connect(self):
+        """Borrow a connection from the shared pool using secure credential management"""
+        try:
+            # Reuse a warm connection when one is available
+            self.pool, self.connection = self._acquire_connection()
             self.cursor = self.connection.cursor()
             
-            self.logger.info("Connected to SQL Server database successfully")
+            self.logger.debug("Connected to SQL Server database successfully")
             return True
             
         except Exception as e:
             self.logger.error(f"Database connection error: {str(e)}")
+            if self.connection and self.pool:
+                self.pool.release(self.connection, discard=True)
             self.connection = None
             self.cursor = None
             raise
     
     def disconnect(self):
-        """Close the database connection"""
+        """Return the database connection to the pool"""
         if self.cursor:
-            self.cursor.close()
+            try:
+                self.cursor.close()
+            except pyodbc.Error:
+                pass
         
         if self.connection:
-            self.connection.close()
-            self.logger.info("Disconnected from SQL Server database")
+            if self.pool:
+                self.pool.release(self.connection)
+            else:
+                self.connection.close()
+            self.logger.debug("Released SQL Server database connection")
             
         self.cursor = None
         self.connection = None
     
-    def save_data(self, df, progress_callback=None):
+    def _is_duplicate_error(self, error):
+        """Check whether a pyodbc IntegrityError was caused by a duplicate key"""
+        error_msg = str(error)
+        return ("UNIQUE KEY" in error_msg or "UNIQUE constraint" in error_msg
+                or "duplicate key" in error_msg)
+    
+    def _prepare_insert_rows(self, df):
+        """Convert a DataFrame into INSERT parameter tuples in a single columnar pass
+        
+        Args:
+            df: DataFrame with OrderNumber, SeparatorName, DateOfSeparation and Analysis
+            
+        Returns:
+            list: Tuples of (order_number, separator_name, date_str, analysis)
+        """
+        total_records = len(df)
+        
+        # Text columns are stringified once for the whole frame
+        if 'OrderNumber' in df.columns:
+            order_numbers = df['OrderNumber'].astype(str).tolist()
+        else:
+            order_numbers = [''] * total_records
+        
+        if 'SeparatorName' in df.columns:
+            separator_names = df['SeparatorName'].astype(str).tolist()
+        else:
+            separator_names = [''] * total_records
+        
+        # Format dates as yyyy-mm-dd, keeping missing dates as NULL
+        if 'DateOfSeparation' in df.columns:
+            dates = pd.to_datetime(df['DateOfSeparation'], errors='coerce')
+            date_strs = dates.dt.strftime('%Y-%m-%d').astype(object)
+            date_strs = date_strs.where(dates.notna(), None).tolist()
+        else:
+            date_strs = [None] * total_records
+        
+        # Convert analysis to 1 or 0
+        if 'Analysis' in df.columns:
+            analysis_values = df['Analysis'].astype(bool).astype(int).tolist()
+        else:
+            analysis_values = [0] * total_records
+        
+        return list(zip(order_numbers, separator_names, date_strs, analysis_values))
+    
+    def save_data(self, df, progress_callback=None, batch_size=DEFAULT_BATCH_SIZE, bulk=True):
         """Save DataFrame to database with progress reporting
         
+        Rows are sent in batches using pyodbc's fast_executemany and the whole
+        save is one transaction, committed together with the daily summary rows
+        of the saved days. If a batch hits a duplicate key, the transaction is
+        rolled back to a savepoint taken before that batch and the batch is
+        retried row by row so duplicates can be skipped. An error rolls back
+        every row; canceling from the progress callback commits the rows saved
+        so far.
+        
         Args:
             df: DataFrame with data to save
             progress_callback: Optional function to call with progress percentage
+            batch_size: Number of rows sent to the server per batch
+            bulk: Set to False to insert one row per round trip
             
         Returns:
             int: Number of records saved
@@ -168,71 +339,85 @@ class SQLService:
                 if not self.connect():
                     raise ValueError("Failed to establish database connection")
             
+            # Check if cursor is available before executing
+            if not self.cursor or not self.connection:
+                raise ValueError("Database cursor is not available")
+            
             # Get the table name from environment variables, with a default
             table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
             
+            # SQL query for insertion (using parameters to prevent SQL injection)
+            insert_query = f"""
+            INSERT INTO {table_name} (OrderNumber, SeparatorName, DateOfSeparation, Analysis)
+            VALUES (?, ?, ?, ?)
+            """
+            
             # Prepare data for insertion
-            total_records = len(df)
-            for i, row in df.iterrows():
-                # Extract data from the row
-                order_number = str(row.get('OrderNumber', ''))
-                separator_name = str(row.get('SeparatorName', ''))
-                
-                # Format date properly
-                date_value = row.get('DateOfSeparation')
-                if pd.isna(date_value):
-                    date_str = None
-                else:
-                    date_str = pd.to_datetime(date_value).strftime('%Y-%m-%d')
+            rows = self._prepare_insert_rows(df)
+            total_records = len(rows)
+            if not bulk:
+                batch_size = 1
+            batch_size = max(1, int(batch_size))
+            self.cursor.fast_executemany = bulk
+            savepoint = False
+            processed = 0
+            
+            for start in range(0, total_records, batch_size):
+                batch = rows[start:start + batch_size]
                 
-                # Convert analysis to 1 or 0
-                analysis = 1 if row.get('Analysis', False) else 0
+                try:
+                    # Send the whole batch in one round trip
+                    self.cursor.executemany(insert_query, batch)
+                    saved, skipped = len(batch), 0
+                except pyodbc.IntegrityError as e:
+                    if not self._is_duplicate_error(e):
+                        # Re-raise if it's another type of integrity error
+                        raise
+                    
+                    if len(batch) == 1:
+                        # A failed single-row INSERT leaves nothing behind
+                        saved, skipped = 0, 1
+                    else:
+                        # Discard the partial batch and retry it row by row
+                        if savepoint:
+                            self.cursor.execute(f"ROLLBACK TRANSACTION {SAVE_BATCH_SAVEPOINT}")
+                        else:
+                            # Nothing was saved before this batch
+                            self.connection.rollback()
+                        saved, skipped = self._insert_rows_individually(insert_query, batch)
                 
-                # SQL query for insertion (using parameters to prevent SQL injection)
-                insert_query = f"""
-                INSERT INTO {table_name} (OrderNumber, SeparatorName, DateOfSeparation, Analysis)
-                VALUES (?, ?, ?, ?)
-                """
+                records_saved += saved
+                failed_records += skipped
+                processed = start + len(batch)
                 
-                # Check if cursor is available before executing
-                if self.cursor:
-                    try:
-                        # Execute the query
-                        self.cursor.execute(insert_query, (order_number, separator_name, date_str, analysis))
-                        records_saved += 1
-                    except pyodbc.IntegrityError as e:
-                        # Log but continue - allows us to skip duplicate records
-                        error_msg = str(e)
-                        if "UNIQUE KEY" in error_msg or "UNIQUE constraint" in error_msg:
-                            self.logger.warning(f"Skipping duplicate record: {order_number}, {separator_name}")
-                            failed_records += 1
-                        else:
-                            # Re-raise if it's another type of integrity error
-                            raise
-                else:
-                    raise ValueError("Database cursor is not available")
+                # Mark the saved rows so a later duplicate only undoes its own batch
+                # (the transaction is open once a row was inserted)
+                if records_saved and batch_size > 1 and processed < total_records:
+                    self.cursor.execute(f"SAVE TRANSACTION {SAVE_BATCH_SAVEPOINT}")
+                    savepoint = True
                 
                 # Report progress if callback provided
-                if progress_callback and i % max(1, total_records // 100) == 0:
-                    percent = (i / total_records) * 100
+                if progress_callback:
+                    percent = (processed / total_records) * 100
                     # Check if user canceled
                     if not progress_callback(percent):
                         break
             
-            # Commit the transaction
-            if self.connection:
-                self.connection.commit()
-                if failed_records > 0:
-                    self.logger.info(f"Successfully saved {records_saved} records to database, {failed_records} records skipped due to duplicates")
-                else:
-                    self.logger.info(f"Successfully saved {records_saved} records to database")
+            # Recount the rollup rows of the saved days and commit everything at once
+            if records_saved:
+                self._refresh_summary_for_rows(rows[:processed])
+            self.connection.commit()
+            
+            if failed_records > 0:
+                self.logger.info(f"Successfully saved {records_saved} records to database, {failed_records} records skipped due to duplicates")
             else:
-                raise ValueError("Database connection is not available")
+                self.logger.info(f"Successfully saved {records_saved} records to database")
             
         except Exception as e:
             self.logger.error(f"Error saving data to database: {str(e)}")
             
-            # Rollback in case of error
+            # Rollback in case of error; no record of this save is kept
+            records_saved = 0
             if self.connection:
                 self.connection.rollback()
                 
@@ -241,6 +426,10 @@ class SQLService:
         finally:
             # Disconnect from the database
             self.disconnect()
+            
+            # New records reach the local cache with the next delta pull
+            if records_saved:
+                self._records_changed(lambda cache: cache.expire())
         
         # Final progress update
         if progress_callback:
@@ -248,46 +437,454 @@ class SQLService:
         
         return records_saved
     
-    def fetch_data(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False):
-        """Fetch data from the database with optional filters"""
+    def merge_data(self, df, progress_callback=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Import a DataFrame through a session temp table with set-based duplicate handling
+        
+        All rows are bulk loaded into a #SeparatorStaging temp table, then a single
+        INSERT ... WHERE NOT EXISTS copies the rows whose duplicate key is not yet
+        in the records table. Duplicates never raise on the server.
+        
+        Args:
+            df: DataFrame with data to import
+            progress_callback: Optional function to call with progress percentage
+            batch_size: Number of rows sent to the staging table per batch
+            
+        Returns:
+            dict: {'inserted': rows added, 'skipped': rows ignored as duplicates}
+        """
+        result = {'inserted': 0, 'skipped': 0}
+        if df is None or df.empty:
+            return result
+        
         try:
             # Connect to the database
             if not self.connection or not self.cursor:
                 if not self.connect():
                     raise ValueError("Failed to establish database connection")
             
+            # Check if cursor is available before executing
+            if not self.cursor or not self.connection:
+                raise ValueError("Database cursor is not available")
+            
             # Get the table name from environment variables, with a default
             table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
             
-            # Build the SQL query with filters
-            query = f"SELECT Id, OrderNumber, SeparatorName, DateOfSeparation, Analysis FROM {table_name} WHERE 1=1"
-            params = []
+            # Create the staging table for this session
+            self.cursor.execute("IF OBJECT_ID('tempdb..#SeparatorStaging') IS NOT NULL DROP TABLE #SeparatorStaging")
+            self.cursor.execute("""
+            CREATE TABLE #SeparatorStaging (
+                RowNum INT IDENTITY(1,1) PRIMARY KEY,
+                OrderNumber NVARCHAR(100),
+                SeparatorName NVARCHAR(255),
+                DateOfSeparation DATE,
+                Analysis BIT
+            )
+            """)
+            
+            # Bulk load every row into the staging table
+            staging_query = """
+            INSERT INTO #SeparatorStaging (OrderNumber, SeparatorName, DateOfSeparation, Analysis)
+            VALUES (?, ?, ?, ?)
+            """
+            rows = self._prepare_insert_rows(df)
+            total_records = len(rows)
+            batch_size = max(1, int(batch_size))
+            self.cursor.fast_executemany = True
             
-            # Add date filters if specified
-            if from_date:
-                query += " AND DateOfSeparation >= ?"
-                params.append(from_date)
+            for start in range(0, total_records, batch_size):
+                self.cursor.executemany(staging_query, rows[start:start + batch_size])
+                
+                # Report progress if callback provided (staging is 90% of the work)
+                if progress_callback:
+                    percent = (min(start + batch_size, total_records) / total_records) * 90
+                    # Check if user canceled
+                    if not progress_callback(percent):
+                        self.connection.rollback()
+                        self.logger.info("Import canceled before merging staged records")
+                        return result
             
-            if to_date:
-                query += " AND DateOfSeparation <= ?"
-                params.append(to_date)
+            # Copy only new records, keeping the first occurrence of duplicates within the file
+            key_columns = ', '.join(DUPLICATE_KEY_COLUMNS)
+            key_match = ' AND '.join(f"t.{col} = s.{col}" for col in DUPLICATE_KEY_COLUMNS)
+            merge_query = f"""
+            INSERT INTO {table_name} (OrderNumber, SeparatorName, DateOfSeparation, Analysis)
+            SELECT s.OrderNumber, s.SeparatorName, s.DateOfSeparation, s.Analysis
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY {key_columns} ORDER BY RowNum) AS DuplicateRank
+                FROM #SeparatorStaging
+            ) s
+            WHERE s.DuplicateRank = 1
+              AND NOT EXISTS (SELECT 1 FROM {table_name} t WHERE {key_match})
+            """
+            self.cursor.execute(merge_query)
+            result['inserted'] = max(0, self.cursor.rowcount)
+            result['skipped'] = total_records - result['inserted']
             
-            # Add order number filter if specified
-            if order_number:
-                query += " AND OrderNumber LIKE ?"
-                params.append(f"%{order_number}%")
+            # Recount the rollup rows of the imported days in the same transaction
+            if result['inserted'] and self._track_summary_changes():
+                self._collect_summary_keys("SELECT DISTINCT DateOfSeparation, SeparatorName FROM #SeparatorStaging")
+                self._refresh_daily_summary()
             
-            # Add separator name filter if specified
-            if separator_name:
-                query += " AND SeparatorName LIKE ?"
-                params.append(f"%{separator_name}%")
+            # Commit the transaction
+            self.connection.commit()
+            self.logger.info(f"Merged {result['inserted']} new records into database, {result['skipped']} records skipped as duplicates")
             
-            # Add analysis filter if specified
-            if analysis_only:
-                query += " AND Analysis = 1"
+            # New records reach the local cache with the next delta pull
+            self._records_changed(lambda cache: cache.expire())
             
-            # Order by date descending
-            query += " ORDER BY DateOfSeparation DESC"
+        except Exception as e:
+            self.logger.error(f"Error merging data into database: {str(e)}")
+            
+            # Rollback in case of error
+            if self.connection:
+                self.connection.rollback()
+                
+            raise
+            
+        finally:
+            # Drop the staging table before disconnecting
+            if self.cursor:
+                try:
+                    self.cursor.execute("IF OBJECT_ID('tempdb..#SeparatorStaging') IS NOT NULL DROP TABLE #SeparatorStaging")
+                    self.connection.commit()
+                except Exception as drop_error:
+                    self.logger.warning(f"Could not drop staging table: {str(drop_error)}")
+            
+            # Disconnect from the database
+            self.disconnect()
+        
+        # Final progress update
+        if progress_callback:
+            progress_callback(100)
+        
+        return result
+    
+    def _insert_rows_individually(self, insert_query, rows):
+        """Insert rows one at a time, skipping duplicates
+        
+        Args:
+            insert_query: Parameterized INSERT statement
+            rows: List of parameter tuples
+            
+        Returns:
+            tuple: (records saved, records skipped as duplicates)
+        """
+        saved = 0
+        skipped = 0
+        for params in rows:
+            try:
+                self.cursor.execute(insert_query, params)
+                saved += 1
+            except pyodbc.IntegrityError as e:
+                # Log but continue - allows us to skip duplicate records
+                if self._is_duplicate_error(e):
+                    self.logger.warning(f"Skipping duplicate record: {params[0]}, {params[1]}")
+                    skipped += 1
+                else:
+                    raise
+        return saved, skipped
+    
+    def _track_summary_changes(self):
+        """Start collecting the (day, separator) keys a write touches
+        
+        Only done when the rollup table exists (see setup_database.py). The
+        keys go to a session temp table, and _refresh_daily_summary recounts
+        them before the write is committed.
+        
+        Returns:
+            bool: True when the rollup table must be refreshed
+        """
+        table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+        if not daily_summary_exists(self.cursor, table_name):
+            return False
+        
+        self.cursor.execute(f"IF OBJECT_ID('tempdb..{SUMMARY_KEYS_TABLE}') IS NOT NULL DROP TABLE {SUMMARY_KEYS_TABLE}")
+        self.cursor.execute(f"CREATE TABLE {SUMMARY_KEYS_TABLE} (Day DATE NULL, SeparatorName NVARCHAR(255) NULL)")
+        return True
+    
+    def _collect_summary_keys(self, query, params=()):
+        """Add the (DateOfSeparation, SeparatorName) rows selected by query to the collected keys"""
+        self.cursor.execute(f"INSERT INTO {SUMMARY_KEYS_TABLE} (Day, SeparatorName) {query}", params)
+    
+    def _refresh_daily_summary(self):
+        """Recount the rollup rows of the collected keys inside the current transaction"""
+        table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+        self.cursor.execute(build_summary_refresh(table_name))
+        self._drop_summary_keys()
+    
+    def _drop_summary_keys(self):
+        """Drop the collected keys so the temp table doesn't go back to the pool with the connection
+        
+        Writes that changed nothing commit without a refresh, so they drop it
+        here; rolled back writes lose it with the transaction that created it.
+        """
+        self.cursor.execute(f"IF OBJECT_ID('tempdb..{SUMMARY_KEYS_TABLE}') IS NOT NULL DROP TABLE {SUMMARY_KEYS_TABLE}")
+    
+    def _refresh_summary_for_rows(self, rows):
+        """Recount the rollup rows of inserted records inside the current transaction
+        
+        Args:
+            rows: Insert parameter tuples (OrderNumber, SeparatorName, DateOfSeparation, Analysis)
+        """
+        if not self._track_summary_changes():
+            return
+        
+        keys = list(dict.fromkeys((row[2], row[1]) for row in rows))
+        fast_executemany = self.cursor.fast_executemany
+        self.cursor.fast_executemany = True
+        for start in range(0, len(keys), DEFAULT_BATCH_SIZE):
+            self.cursor.executemany(
+                f"INSERT INTO {SUMMARY_KEYS_TABLE} (Day, SeparatorName) VALUES (?, ?)",
+                keys[start:start + DEFAULT_BATCH_SIZE]
+            )
+        self.cursor.fast_executemany = fast_executemany
+        self._refresh_daily_summary()
+    
+    def rebuild_daily_summary(self):
+        """Create the rollup table if needed and recount it from the records table
+        
+        Returns:
+            int: Number of rows in the rollup table
+        """
+        try:
+            # Connect to the database
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    raise ValueError("Failed to establish database connection")
+            
+            table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+            for statement in build_summary_rebuild(table_name):
+                self.cursor.execute(statement)
+            
+            self.cursor.execute(f"SELECT COUNT(*) FROM {daily_summary_table(table_name)}")
+            summary_rows = self.cursor.fetchone()[0]
+            
+            # Commit the transaction
+            self.connection.commit()
+            self.logger.info(f"Rebuilt {daily_summary_table(table_name)} with {summary_rows} rows")
+            
+            if self.query_cache:
+                self.query_cache.invalidate()
+            return summary_rows
+            
+        except Exception as e:
+            self.logger.error(f"Error rebuilding daily summary: {str(e)}")
+            if self.connection:
+                self.connection.rollback()
+            raise
+            
+        finally:
+            # Disconnect from the database
+            self.disconnect()
+    
+    def _build_where(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False):
+        """Build the WHERE clause shared by the record queries (see record_queries.build_where)
+        
+        Returns:
+            tuple: (where_clause, params)
+        """
+        return build_where(from_date, to_date, order_number, separator_name, analysis_only)
+    
+    def _build_mirror_where(self, from_date=None, to_date=None, order_number=None, separator_name=None,
+                            analysis_only=False):
+        """Build the WHERE clause for the local mirror
+        
+        The mirror stores dates as ISO text, so the date filters are converted
+        with date_bound to the value SQL Server would compare them with.
+        
+        Returns:
+            tuple: (where_clause, params)
+        """
+        return build_where(date_bound(from_date), date_bound(to_date), order_number, separator_name, analysis_only)
+    
+    def _native_value(self, value, column):
+        """Convert a pandas value of a record column to the type pyodbc returns (and binds) for it
+        
+        Page cursors made from mirror results may be sent to SQL Server with
+        the next page, and pyodbc can't bind numpy scalars.
+        """
+        if pd.isna(value):
+            return None
+        if column == 'DateOfSeparation':
+            return pd.Timestamp(value).to_pydatetime().date()
+        if column == 'Analysis':
+            return bool(value)
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+    
+    def _build_fetch_query(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False,
+                           sort_column=DEFAULT_SORT_COLUMN, descending=True):
+        """Build the filtered SELECT used by fetch_data and fetch_iter
+        
+        Returns:
+            tuple: (query, params)
+        """
+        # Get the table name from environment variables, with a default
+        table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+        return build_fetch_query(table_name, from_date, to_date, order_number, separator_name, analysis_only,
+                                 sort_column, descending)
+    
+    def _order_by(self, sort_column=DEFAULT_SORT_COLUMN, descending=True):
+        """Build the ORDER BY clause, with Id as the tie-breaker (see record_queries.build_order_by)"""
+        return build_order_by(sort_column, descending)
+    
+    def _keyset_condition(self, after, sort_column=DEFAULT_SORT_COLUMN, descending=True):
+        """Build the condition selecting the rows after a page cursor
+        
+        Pages are ordered by the sort column and then Id, both in the same
+        direction. SQL Server sorts NULL below every value, so NULLs come
+        last in descending order and first in ascending order.
+        
+        Args:
+            after: (sort value, Id) of the last row of the previous page
+            sort_column (str): One of SORT_COLUMNS
+            descending (bool): Sort direction
+            
+        Returns:
+            tuple: (condition, params)
+        """
+        if sort_column not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by column '{sort_column}'")
+        
+        last_value, last_id = after
+        beyond = "<" if descending else ">"
+        
+        if sort_column == 'Id':
+            return f" AND Id {beyond} ?", [last_id]
+        
+        if last_value is None:
+            if descending:
+                # Already in the NULL rows at the end
+                return f" AND {sort_column} IS NULL AND Id < ?", [last_id]
+            # Finish the NULL rows, then every non-NULL value
+            return f" AND (({sort_column} IS NULL AND Id > ?) OR {sort_column} IS NOT NULL)", [last_id]
+        
+        condition = (f" AND ({sort_column} {beyond} ?"
+                     f" OR ({sort_column} = ? AND Id {beyond} ?)")
+        if descending:
+            # NULL rows follow every value
+            condition += f" OR {sort_column} IS NULL"
+        condition += ")"
+        return condition, [last_value, last_value, last_id]
+    
+    def _rows_to_dataframe(self, rows, cursor):
+        """Convert fetched pyodbc rows into a DataFrame with typed columns"""
+        # Make sure cursor.description is available
+        if not cursor.description:
+            return pd.DataFrame(columns=RECORD_COLUMNS)
+        
+        # Convert to DataFrame
+        columns = [column[0] for column in cursor.description]
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        
+        # Convert Analysis from 0/1 to boolean
+        if 'Analysis' in df.columns and not df.empty:
+            df['Analysis'] = df['Analysis'].astype(bool)
+        
+        return df
+    
+    def _query_local_cache(self, where, params, order_by, limit=None):
+        """Answer a record query from the local mirror after a delta sync
+        
+        Until the mirror's first fill completes, queries go to SQL Server.
+        When SQL Server can't be reached, a mirror that was filled before
+        answers on its own, so searches keep working offline.
+        
+        Returns:
+            DataFrame: The records, or None when the query must go to SQL Server
+        """
+        if not self.local_cache:
+            return None
+        
+        # The first fill copies the whole table, so it runs in the background
+        # and SQL Server answers until it is complete
+        if not self.local_cache.is_ready():
+            self.local_cache.start_fill(self)
+            return None
+        
+        try:
+            self.local_cache.sync(self)
+        except Exception as e:
+            self.logger.warning(f"Could not sync the local record cache, answering from the last copy: {str(e)}")
+        
+        try:
+            return self.local_cache.query(where, params, order_by, limit)
+        except Exception as e:
+            self.logger.warning(f"Local record cache query failed: {str(e)}")
+            return None
+    
+    def _records_changed(self, change):
+        """Drop cached query results and apply a change committed on SQL Server to the local mirror
+        
+        A failure only leaves the mirror stale until the next reconciliation.
+        
+        Args:
+            change: Function called with the LocalCache
+        """
+        if self.query_cache:
+            self.query_cache.invalidate()
+        if not self.local_cache:
+            return
+        try:
+            change(self.local_cache)
+        except Exception as e:
+            self.logger.warning(f"Could not update the local record cache: {str(e)}")
+    
+    def fetch_data(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False,
+                   sort_column=DEFAULT_SORT_COLUMN, descending=True):
+        """Fetch data from the database with optional filters
+        
+        Identical queries made again within the query cache TTL are answered
+        from the cache.
+        
+        Args:
+            sort_column (str): Column to order by, one of SORT_COLUMNS
+            descending (bool): Sort direction
+        """
+        params = dict(from_date=from_date, to_date=to_date, order_number=order_number, separator_name=separator_name,
+                      analysis_only=analysis_only, sort_column=sort_column, descending=descending)
+        return self._cached_query('fetch_data', self._fetch_data, params)
+    
+    def _cached_query(self, name, fetch, params):
+        """Run a record query through the shared query cache
+        
+        Args:
+            name (str): Query name, part of the cache key
+            fetch: Method running the query with params as keyword arguments
+            params (dict): Query parameters
+        """
+        if not self.query_cache:
+            return fetch(**params)
+        
+        key = make_key(name, **params)
+        result = self.query_cache.get(key)
+        if result is not None:
+            self.logger.debug(f"Query cache hit for {name} ({self.query_cache.stats()})")
+            return result
+        
+        result = fetch(**params)
+        self.query_cache.put(key, result)
+        return result
+    
+    def _fetch_data(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False,
+                    sort_column=DEFAULT_SORT_COLUMN, descending=True):
+        """Run the fetch_data query on the local mirror or SQL Server"""
+        try:
+            # Routine searches are answered by the local mirror when it is enabled
+            if self.local_cache:
+                where, params = self._build_mirror_where(from_date, to_date, order_number, separator_name, analysis_only)
+                df = self._query_local_cache(where, params, self._order_by(sort_column, descending))
+                if df is not None:
+                    return df
+            
+            # Connect to the database
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    raise ValueError("Failed to establish database connection")
+            
+            query, params = self._build_fetch_query(from_date, to_date, order_number, separator_name, analysis_only,
+                                                    sort_column, descending)
             
             # Check if cursor is available before executing
             if not self.cursor:
@@ -299,28 +896,183 @@ class SQLService:
             # Fetch all results
             rows = self.cursor.fetchall()
             
-            # Make sure cursor.description is available
-            if not self.cursor.description:
-                return pd.DataFrame(columns=['Id', 'OrderNumber', 'SeparatorName', 'DateOfSeparation', 'Analysis'])
+            return self._rows_to_dataframe(rows, self.cursor)
             
-            # Convert to DataFrame
-            columns = [column[0] for column in self.cursor.description]
-            df = pd.DataFrame.from_records(rows, columns=columns)
+        except Exception as e:
+            self.logger.error(f"Error fetching data from database: {str(e)}")
+            raise
+            
+        finally:
+            # Disconnect from the database
+            self.disconnect() 
+
+    def fetch_page(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False,
+                   page_size=DEFAULT_PAGE_SIZE, after=None, sort_column=DEFAULT_SORT_COLUMN, descending=True):
+        """Fetch one page of records with keyset pagination
+        
+        Each page continues from the last row of the previous one instead of
+        using OFFSET, so later pages cost the same as the first.
+        
+        Args:
+            page_size (int): Maximum number of rows in the page
+            after: Cursor returned with the previous page, or None for the first page
+            sort_column (str): Column to order by, one of SORT_COLUMNS
+            descending (bool): Sort direction (must not change between pages)
+            
+        Returns:
+            tuple: (DataFrame, cursor) - cursor is None when there are no more rows
+        """
+        params = dict(from_date=from_date, to_date=to_date, order_number=order_number, separator_name=separator_name,
+                      analysis_only=analysis_only, page_size=page_size, after=after, sort_column=sort_column,
+                      descending=descending)
+        return self._cached_query('fetch_page', self._fetch_page, params)
+    
+    def _fetch_page(self, from_date=None, to_date=None, order_number=None, separator_name=None, analysis_only=False,
+                    page_size=DEFAULT_PAGE_SIZE, after=None, sort_column=DEFAULT_SORT_COLUMN, descending=True):
+        """Run one fetch_page query on the local mirror or SQL Server"""
+        try:
+            table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+            condition, condition_params = "", []
+            if after is not None:
+                condition, condition_params = self._keyset_condition(after, sort_column, descending)
             
-            # Convert Analysis from 0/1 to boolean
-            if 'Analysis' in df.columns and not df.empty:
-                df['Analysis'] = df['Analysis'].astype(bool)
+            # Routine searches are answered by the local mirror when it is enabled
+            if self.local_cache:
+                where, params = self._build_mirror_where(from_date, to_date, order_number, separator_name, analysis_only)
+                df = self._query_local_cache(where + condition, params + condition_params,
+                                             self._order_by(sort_column, descending), limit=page_size)
+                if df is not None:
+                    next_cursor = None
+                    if len(df) == page_size:
+                        last_row = df.iloc[-1]
+                        next_cursor = (self._native_value(last_row[sort_column], sort_column), int(last_row['Id']))
+                    return df, next_cursor
             
-            return df
+            where, params = self._build_where(from_date, to_date, order_number, separator_name, analysis_only)
+            where += condition
+            params += condition_params
             
+            # Connect to the database
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    raise ValueError("Failed to establish database connection")
+            
+            query = (f"SELECT TOP (?) Id, OrderNumber, SeparatorName, DateOfSeparation, Analysis "
+                     f"FROM {table_name}{where}{self._order_by(sort_column, descending)}")
+            
+            self.cursor.execute(query, [page_size] + params)
+            rows = self.cursor.fetchall()
+            df = self._rows_to_dataframe(rows, self.cursor)
+            
+            # A full page may be followed by more rows
+            next_cursor = None
+            if len(rows) == page_size:
+                last_row = rows[-1]
+                next_cursor = (getattr(last_row, sort_column), last_row.Id)
+            
+            return df, next_cursor
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching page from database: {str(e)}")
+            raise
+            
+        finally:
+            # Disconnect from the database
+            self.disconnect()
+    
+    def fetch_iter(self, from_date=None, to_date=None, order_number=None, separator_name=None,
+                   analysis_only=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield query results as DataFrame chunks of at most chunk_size rows
+        
+        Only one chunk of pyodbc rows is held at a time. The generator uses its
+        own pooled connection, so the caller can stop early (break out of the
+        loop or call close()) and the pending query is cancelled.
+        
+        Args:
+            chunk_size (int): Number of rows fetched per round trip
+            
+        Yields:
+            DataFrame: The next chunk of records
+        """
+        query, params = self._build_fetch_query(from_date, to_date, order_number, separator_name, analysis_only)
+        pool, connection = self._acquire_connection()
+        cursor = None
+        exhausted = False
+        
+        try:
+            cursor = connection.cursor()
+            self._iter_cursor = cursor
+            cursor.execute(query, params)
+            
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    exhausted = True
+                    break
+                yield self._rows_to_dataframe(rows, cursor)
+                
         except Exception as e:
             self.logger.error(f"Error fetching data from database: {str(e)}")
             raise
             
+        finally:
+            self._iter_cursor = None
+            if cursor:
+                try:
+                    # Stop the server from streaming rows nobody will read
+                    if not exhausted:
+                        cursor.cancel()
+                    cursor.close()
+                except pyodbc.Error:
+                    pass
+            pool.release(connection)
+    
+    def fetch_separator_summary(self, from_date=None, to_date=None, separator_name=None, by_day=True):
+        """Count orders and analyses per separator (and per day) on the server
+        
+        Args:
+            from_date (str): Optional first day (yyyy-MM-dd)
+            to_date (str): Optional last day (yyyy-MM-dd)
+            separator_name (str): Optional separator name filter
+            by_day (bool): One row per separator and day instead of per separator
+            
+        Returns:
+            DataFrame: Summary rows (see src.services.reports)
+        """
+        params = dict(from_date=from_date, to_date=to_date, separator_name=separator_name, by_day=by_day)
+        return self._cached_query('separator_summary', self._fetch_separator_summary, params)
+    
+    def _fetch_separator_summary(self, from_date=None, to_date=None, separator_name=None, by_day=True):
+        """Run the summary query on SQL Server"""
+        try:
+            # Connect to the database
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    raise ValueError("Failed to establish database connection")
+            
+            table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+            
+            # Read the rollup table instead of the records when it is enabled, exists and the filters allow
+            use_daily_summary = (
+                can_use_daily_summary(from_date, to_date)
+                and daily_summary_exists(self.cursor, table_name)
+            )
+            query, params = build_summary_query(table_name, from_date, to_date, separator_name, by_day,
+                                                use_daily_summary)
+            
+            self.cursor.execute(query, params)
+            rows = self.cursor.fetchall()
+            columns = [column[0] for column in self.cursor.description]
+            return summary_to_dataframe(rows, columns, by_day)
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching separator summary from database: {str(e)}")
+            raise
+            
         finally:
             # Disconnect from the database
-            self.disconnect() 
-
+            self.disconnect()
+    
     def load_data(self, days=7):
         """Load data from the database with a default filter of the past 7 days
         
@@ -357,8 +1109,10 @@ class SQLService:
             # Get the table name from environment variables, with a default
             table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
             
-            # SQL query for deletion
-            delete_query = f"DELETE FROM {table_name} WHERE Id = ?"
+            # SQL query for deletion (also collecting the rollup key of the deleted record)
+            track_summary = self._track_summary_changes()
+            output = f" OUTPUT DELETED.DateOfSeparation, DELETED.SeparatorName INTO {SUMMARY_KEYS_TABLE} (Day, SeparatorName)" if track_summary else ""
+            delete_query = f"DELETE FROM {table_name}{output} WHERE Id = ?"
             
             # Execute the deletion
             if self.cursor:
@@ -366,6 +1120,10 @@ class SQLService:
                 
                 # Check if a row was affected
                 rows_affected = self.cursor.rowcount
+                if track_summary and rows_affected > 0:
+                    self._refresh_daily_summary()
+                elif track_summary:
+                    self._drop_summary_keys()
                 
                 # Commit the transaction
                 if self.connection:
@@ -373,6 +1131,7 @@ class SQLService:
                     
                     if rows_affected > 0:
                         self.logger.info(f"Successfully deleted record with ID {record_id}")
+                        self._records_changed(lambda cache: cache.apply_delete([record_id]))
                         return True
                     else:
                         self.logger.warning(f"No record found with ID {record_id}")
@@ -399,6 +1158,41 @@ class SQLService:
             self.logger.error(f"Error loading all data from database: {str(e)}")
             raise 
 
+    def _build_set_clause(self, data):
+        """Build the SET clause of an UPDATE from the fields in data
+        
+        Args:
+            data (dict): Dictionary containing the fields to update
+            
+        Returns:
+            tuple: (set clause, parameters) - the clause is empty when there is nothing to update
+        """
+        set_clauses = []
+        parameters = []
+        
+        # Extract fields to update
+        if 'OrderNumber' in data:
+            set_clauses.append("OrderNumber = ?")
+            parameters.append(str(data['OrderNumber']))
+            
+        if 'SeparatorName' in data:
+            set_clauses.append("SeparatorName = ?")
+            parameters.append(str(data['SeparatorName']))
+            
+        if 'DateOfSeparation' in data:
+            set_clauses.append("DateOfSeparation = ?")
+            date_str = None
+            if data['DateOfSeparation']:
+                date_str = pd.to_datetime(data['DateOfSeparation']).strftime('%Y-%m-%d')
+            parameters.append(date_str)
+            
+        if 'Analysis' in data:
+            set_clauses.append("Analysis = ?")
+            analysis = 1 if data['Analysis'] else 0
+            parameters.append(analysis)
+        
+        return ', '.join(set_clauses), parameters
+    
     def update_record(self, record_id, data):
         """Update a record in the database
         
@@ -419,47 +1213,36 @@ class SQLService:
             table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
             
             # Prepare SET clause and parameters
-            set_clauses = []
-            parameters = []
-            
-            # Extract fields to update
-            if 'OrderNumber' in data:
-                set_clauses.append("OrderNumber = ?")
-                parameters.append(str(data['OrderNumber']))
-                
-            if 'SeparatorName' in data:
-                set_clauses.append("SeparatorName = ?")
-                parameters.append(str(data['SeparatorName']))
-                
-            if 'DateOfSeparation' in data:
-                set_clauses.append("DateOfSeparation = ?")
-                date_str = None
-                if data['DateOfSeparation']:
-                    date_str = pd.to_datetime(data['DateOfSeparation']).strftime('%Y-%m-%d')
-                parameters.append(date_str)
-                
-            if 'Analysis' in data:
-                set_clauses.append("Analysis = ?")
-                analysis = 1 if data['Analysis'] else 0
-                parameters.append(analysis)
+            set_clause, parameters = self._build_set_clause(data)
             
             # If no fields to update, return early
-            if not set_clauses:
+            if not set_clause:
                 self.logger.warning("No fields to update")
                 return False
             
             # Build the UPDATE query
-            update_query = f"UPDATE {table_name} SET {', '.join(set_clauses)} WHERE Id = ?"
+            update_query = f"UPDATE {table_name} SET {set_clause} WHERE Id = ?"
             
             # Add the ID parameter
             parameters.append(record_id)
             
+            # Collect the rollup keys of the record before and after the change
+            track_summary = self._track_summary_changes()
+            key_query = f"SELECT DateOfSeparation, SeparatorName FROM {table_name} WHERE Id = ?"
+            if track_summary:
+                self._collect_summary_keys(key_query, (record_id,))
+            
             # Execute the update
             if self.cursor:
                 self.cursor.execute(update_query, parameters)
                 
                 # Check if a row was affected
                 rows_affected = self.cursor.rowcount
+                if track_summary and rows_affected > 0:
+                    self._collect_summary_keys(key_query, (record_id,))
+                    self._refresh_daily_summary()
+                elif track_summary:
+                    self._drop_summary_keys()
                 
                 # Commit the transaction
                 if self.connection:
@@ -467,6 +1250,7 @@ class SQLService:
                     
                     if rows_affected > 0:
                         self.logger.info(f"Successfully updated record with ID {record_id}")
+                        self._records_changed(lambda cache: cache.apply_update([record_id], set_clause, parameters[:-1]))
                         return True
                     else:
                         self.logger.warning(f"No record found with ID {record_id}")
@@ -482,4 +1266,189 @@ class SQLService:
             
         finally:
             # Disconnect from the database
-            self.disconnect()
\ No newline at end of file
+            self.disconnect()
+    
+    def _stage_ids(self, record_ids, batch_size=DEFAULT_BATCH_SIZE):
+        """Load record IDs into a #SeparatorIds temp table for set-based statements
+        
+        Args:
+            record_ids: IDs to stage (ints or numeric strings; duplicates are ignored)
+            batch_size: Number of IDs sent per batch
+            
+        Returns:
+            list: The distinct IDs that were staged, in their original order
+        """
+        ids = list(dict.fromkeys(int(record_id) for record_id in record_ids))
+        
+        self.cursor.execute("IF OBJECT_ID('tempdb..#SeparatorIds') IS NOT NULL DROP TABLE #SeparatorIds")
+        self.cursor.execute("CREATE TABLE #SeparatorIds (Id INT PRIMARY KEY)")
+        
+        self.cursor.fast_executemany = True
+        for start in range(0, len(ids), batch_size):
+            self.cursor.executemany(
+                "INSERT INTO #SeparatorIds (Id) VALUES (?)",
+                [(record_id,) for record_id in ids[start:start + batch_size]]
+            )
+        return ids
+    
+    def _drop_staged_ids(self):
+        """Drop the #SeparatorIds temp table before the connection goes back to the pool"""
+        if not self.cursor:
+            return
+        try:
+            self.cursor.execute("IF OBJECT_ID('tempdb..#SeparatorIds') IS NOT NULL DROP TABLE #SeparatorIds")
+            self.connection.commit()
+        except Exception as drop_error:
+            self.logger.warning(f"Could not drop ID staging table: {str(drop_error)}")
+    
+    def update_records(self, record_ids, data):
+        """Apply the same change to many records in one transaction
+        
+        The IDs are bulk loaded into a #SeparatorIds temp table and a single
+        UPDATE joined to it changes every record, instead of one round trip
+        and commit per record.
+        
+        Args:
+            record_ids: IDs of the records to update
+            data (dict): Dictionary containing the fields to update
+            
+        Returns:
+            int: Number of records updated
+        """
+        set_clause, parameters = self._build_set_clause(data)
+        if not set_clause:
+            self.logger.warning("No fields to update")
+            return 0
+        if not record_ids:
+            return 0
+        
+        try:
+            # Connect to the database
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    raise ValueError("Failed to establish database connection")
+            
+            # Get the table name from environment variables, with a default
+            table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+            
+            ids = self._stage_ids(record_ids)
+            
+            # Collect the rollup keys of the records before and after the change
+            track_summary = self._track_summary_changes()
+            key_query = f"SELECT t.DateOfSeparation, t.SeparatorName FROM {table_name} t INNER JOIN #SeparatorIds s ON s.Id = t.Id"
+            if track_summary:
+                self._collect_summary_keys(key_query)
+            
+            # Update every staged record at once
+            update_query = f"""
+            UPDATE t SET {set_clause}
+            FROM {table_name} t
+            INNER JOIN #SeparatorIds s ON s.Id = t.Id
+            """
+            self.cursor.execute(update_query, parameters)
+            rows_affected = max(0, self.cursor.rowcount)
+            if track_summary and rows_affected > 0:
+                self._collect_summary_keys(key_query)
+                self._refresh_daily_summary()
+            elif track_summary:
+                self._drop_summary_keys()
+            
+            # Commit the transaction
+            self.connection.commit()
+            
+            if rows_affected < len(ids):
+                self.logger.warning(f"{len(ids) - rows_affected} of {len(ids)} records were not found")
+            self.logger.info(f"Successfully updated {rows_affected} records")
+            self._records_changed(lambda cache: cache.apply_update(ids, set_clause, parameters))
+            return rows_affected
+            
+        except Exception as e:
+            self.logger.error(f"Error updating records in database: {str(e)}")
+            if self.connection:
+                self.connection.rollback()
+            raise
+            
+        finally:
+            # Drop the ID table, then disconnect from the database
+            self._drop_staged_ids()
+            self.disconnect()
+    
+    def delete_records(self, record_ids, progress_callback=None, chunk_size=DEFAULT_DELETE_CHUNK_SIZE):
+        """Delete many records in one transaction
+        
+        The IDs are deleted chunk by chunk on a single connection, and the IDs
+        each DELETE actually removed come back through OUTPUT DELETED.Id. The
+        transaction is only committed after the last chunk, so a failure or a
+        cancel leaves every record in place.
+        
+        Args:
+            record_ids: IDs of the records to delete
+            progress_callback: Optional function to call with progress percentage;
+                returning False cancels the whole delete
+            chunk_size: Number of IDs per DELETE statement (at most 2000)
+            
+        Returns:
+            dict: {'deleted': records removed, 'missing': IDs that were not found}
+        """
+        result = {'deleted': 0, 'missing': []}
+        ids = list(dict.fromkeys(int(record_id) for record_id in record_ids))
+        if not ids:
+            return result
+        
+        chunk_size = max(1, min(int(chunk_size), 2000))
+        deleted_ids = set()
+        
+        try:
+            # Connect to the database
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    raise ValueError("Failed to establish database connection")
+            
+            # Get the table name from environment variables, with a default
+            table_name = os.environ.get("DB_TABLE", "SeparatorRecords")
+            
+            # Rollup keys of the deleted records are collected by the same statement
+            track_summary = self._track_summary_changes()
+            output = f" OUTPUT DELETED.DateOfSeparation, DELETED.SeparatorName INTO {SUMMARY_KEYS_TABLE} (Day, SeparatorName)" if track_summary else ""
+            
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                placeholders = ', '.join('?' * len(chunk))
+                self.cursor.execute(
+                    f"DELETE FROM {table_name}{output} OUTPUT DELETED.Id WHERE Id IN ({placeholders})",
+                    chunk
+                )
+                deleted_ids.update(row[0] for row in self.cursor.fetchall())
+                
+                # Report progress if callback provided
+                if progress_callback:
+                    percent = (min(start + chunk_size, len(ids)) / len(ids)) * 100
+                    # Check if user canceled
+                    if not progress_callback(percent):
+                        self.connection.rollback()
+                        self.logger.info("Delete canceled, no records were removed")
+                        return result
+            
+            if track_summary and deleted_ids:
+                self._refresh_daily_summary()
+            elif track_summary:
+                self._drop_summary_keys()
+            
+            # Commit the transaction
+            self.connection.commit()
+            
+        except Exception as e:
+            self.logger.error(f"Error deleting records from database: {str(e)}")
+            if self.connection:
+                self.connection.rollback()
+            raise
+            
+        finally:
+            # Disconnect from the database
+            self.disconnect()
+        
+        result['deleted'] = len(deleted_ids)
+        result['missing'] = [record_id for record_id in ids if record_id not in deleted_ids]
+        self.logger.info(f"Deleted {result['deleted']} records, {len(result['missing'])} not found")
+        self._records_changed(lambda cache: cache.apply_delete(deleted_ids))
+        return result
\ No newline at end of file
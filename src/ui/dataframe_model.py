@@ -0,0 +1,315 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+import numpy as np
+import pandas as pd
+
+# Column positions in the records table
+SELECT_COLUMN = 0
+ORDER_COLUMN = 1
+NAME_COLUMN = 2
+DATE_COLUMN = 3
+ANALYSIS_COLUMN = 4
+
+class DataFrameTableModel(QAbstractTableModel):
+    """Table model that renders records on demand from DataFrame columns
+
+    Display values are prepared once per load as columnar arrays, so no Qt
+    item objects are created per row. The selection checkboxes live in a
+    boolean numpy array. Order Number keeps the record ID in UserRole, and
+    the Date and Analysis columns keep their timestamp and 0/1 value in
+    UserRole, matching the old QStandardItem layout.
+
+    Sorting reorders the arrays with one argsort over a column's keys
+    instead of comparing items one pair at a time.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = ["Select", "Order Number", "Separator Name", "Date of Separation", "Analysis"]
+        self._more_loader = None  # Called when the view scrolls past the loaded rows
+        self._loading_more = False
+        self._set_arrays(None)
+
+    def _set_arrays(self, df):
+        """Build the columnar arrays backing the model from a DataFrame"""
+        self._store_arrays(self._build_arrays(df))
+
+    def _arrays(self):
+        """Get the columnar arrays in _build_arrays order"""
+        return (self._ids, self._orders, self._names, self._date_text,
+                self._date_keys, self._analysis, self._checked)
+
+    def _store_arrays(self, arrays):
+        """Replace the columnar arrays (given in _build_arrays order)"""
+        (self._ids, self._orders, self._names, self._date_text,
+         self._date_keys, self._analysis, self._checked) = arrays
+
+    def _build_arrays(self, df):
+        """Convert a DataFrame into the model's columnar arrays
+
+        Returns:
+            tuple: (ids, orders, names, date_text, date_keys, analysis, checked)
+        """
+        if df is None or df.empty:
+            return (
+                np.empty(0, dtype=object),
+                np.empty(0, dtype=object),
+                np.empty(0, dtype=object),
+                np.empty(0, dtype=object),
+                np.empty(0, dtype=float),
+                np.empty(0, dtype=bool),
+                np.empty(0, dtype=bool)
+            )
+
+        row_count = len(df)
+
+        # Store ID as data but don't display it
+        if 'Id' in df.columns:
+            ids = df['Id'].astype(str).to_numpy(dtype=object, copy=True)
+        else:
+            ids = np.full(row_count, '', dtype=object)
+
+        orders = self._text_column(df, 'OrderNumber', row_count)
+        names = self._text_column(df, 'SeparatorName', row_count)
+
+        # Format dates once and keep the timestamps for proper sorting
+        if 'DateOfSeparation' in df.columns:
+            dates = pd.to_datetime(df['DateOfSeparation'], errors='coerce')
+            missing = dates.isna().to_numpy()
+            date_text = dates.dt.strftime('%Y-%m-%d').to_numpy(dtype=object, copy=True)
+            date_text[missing] = ''
+            date_keys = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[s]').astype('int64').astype(float)
+            date_keys[missing] = np.nan
+        else:
+            date_text = np.full(row_count, '', dtype=object)
+            date_keys = np.full(row_count, np.nan)
+
+        if 'Analysis' in df.columns:
+            analysis = df['Analysis'].fillna(False).astype(bool).to_numpy(copy=True)
+        else:
+            analysis = np.zeros(row_count, dtype=bool)
+
+        return ids, orders, names, date_text, date_keys, analysis, np.zeros(row_count, dtype=bool)
+
+    def _text_column(self, df, column, row_count):
+        """Get a column as an array of display strings"""
+        if column not in df.columns:
+            return np.full(row_count, '', dtype=object)
+        return df[column].astype(str).to_numpy(dtype=object, copy=True)
+
+    def set_dataframe(self, df):
+        """Replace the displayed records with the rows of a DataFrame"""
+        self.beginResetModel()
+        self._set_arrays(df)
+        self._more_loader = None
+        self._loading_more = False
+        self.endResetModel()
+
+    def append_dataframe(self, df):
+        """Add the rows of a DataFrame after the displayed records (e.g. the next page)"""
+        self._loading_more = False
+        if df is None or df.empty:
+            return
+
+        first = len(self._ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(df) - 1)
+        arrays = self._build_arrays(df)
+        self._store_arrays([np.concatenate([current, new]) for current, new in zip(self._arrays(), arrays)])
+        self.endInsertRows()
+
+    def _sort_keys(self, column):
+        """Get one numeric sort key per row for a column
+
+        Text compares case-insensitively and missing dates sort before
+        every real date, as SQL Server orders NULL.
+        """
+        if column in (ORDER_COLUMN, NAME_COLUMN):
+            values = self._orders if column == ORDER_COLUMN else self._names
+            # Rank the distinct values once, then sort the ranks
+            codes, _ = pd.factorize(pd.Series(values, dtype=object).str.lower(), sort=True)
+            return codes.astype(float)
+        if column == DATE_COLUMN:
+            return np.where(np.isnan(self._date_keys), -np.inf, self._date_keys)
+        if column == ANALYSIS_COLUMN:
+            return self._analysis.astype(float)
+        if column == SELECT_COLUMN:
+            return self._checked.astype(float)
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Reorder the loaded rows by a column
+
+        Args:
+            column (int): Column to sort by
+            order: Qt.SortOrder.AscendingOrder or Qt.SortOrder.DescendingOrder
+        """
+        keys = self._sort_keys(column)
+        if keys is None or len(keys) < 2:
+            return
+
+        # Negating keeps equal rows in their current order in both directions
+        if order == Qt.SortOrder.DescendingOrder:
+            keys = -keys
+        permutation = np.argsort(keys, kind='stable')
+
+        self.layoutAboutToBeChanged.emit()
+        self._store_arrays([array[permutation] for array in self._arrays()])
+
+        # Move selections and other persistent indexes with their rows
+        new_rows = np.empty(len(permutation), dtype=np.int64)
+        new_rows[permutation] = np.arange(len(permutation))
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(int(new_rows[index.row()]), index.column()) for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def set_more_loader(self, loader):
+        """Set the function that requests more rows when the view reaches the end
+
+        Args:
+            loader: Callable with no arguments, or None when every row is loaded
+        """
+        self._more_loader = loader
+        self._loading_more = False
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._more_loader is not None and not self._loading_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        # The rows arrive later through append_dataframe
+        self._loading_more = True
+        self._more_loader()
+
+    def clear(self):
+        """Remove all records from the model"""
+        self.set_dataframe(None)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+
+        if column == SELECT_COLUMN:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self._checked[row] else Qt.CheckState.Unchecked
+
+        elif column == ORDER_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._orders[row]
+            if role == Qt.ItemDataRole.UserRole:
+                return self._ids[row]
+
+        elif column == NAME_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._names[row]
+
+        elif column == DATE_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._date_text[row]
+            if role == Qt.ItemDataRole.UserRole:
+                key = self._date_keys[row]
+                return None if np.isnan(key) else float(key)
+
+        elif column == ANALYSIS_COLUMN:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self._analysis[row] else Qt.CheckState.Unchecked
+            if role == Qt.ItemDataRole.UserRole:
+                return 1 if self._analysis[row] else 0
+
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Toggle the selection checkbox (the only editable cell)"""
+        if not index.isValid() or index.column() != SELECT_COLUMN or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+
+        self._checked[index.row()] = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == SELECT_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def setHorizontalHeaderLabels(self, labels):
+        """Set the column titles (same API as QStandardItemModel)"""
+        self._headers = list(labels)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(self._headers) - 1)
+
+    def record_id(self, row):
+        """Get the record ID stored for a row"""
+        return self._ids[row]
+
+    def row_values(self, row):
+        """Get the displayed values of a row as a dictionary"""
+        return {
+            'OrderNumber': self._orders[row],
+            'SeparatorName': self._names[row],
+            'DateOfSeparation': self._date_text[row],
+            'Analysis': bool(self._analysis[row])
+        }
+
+    def checked_rows(self):
+        """Get the rows whose selection checkbox is checked"""
+        return np.flatnonzero(self._checked).tolist()
+
+    def set_all_checked(self, checked):
+        """Check or uncheck the selection checkbox of every row"""
+        if not len(self._checked):
+            return
+        self._checked[:] = checked
+        self.dataChanged.emit(
+            self.index(0, SELECT_COLUMN),
+            self.index(len(self._checked) - 1, SELECT_COLUMN),
+            [Qt.ItemDataRole.CheckStateRole]
+        )
+
+    def update_row(self, row, data):
+        """Update the displayed values of a row with changed fields
+
+        Args:
+            row: Row index in the model
+            data: Dictionary with OrderNumber, SeparatorName, DateOfSeparation and/or Analysis
+        """
+        if 'OrderNumber' in data:
+            self._orders[row] = str(data['OrderNumber'])
+        if 'SeparatorName' in data:
+            self._names[row] = str(data['SeparatorName'])
+        if 'DateOfSeparation' in data:
+            date_value = pd.to_datetime(data['DateOfSeparation'], errors='coerce')
+            if pd.isna(date_value):
+                self._date_text[row] = ''
+                self._date_keys[row] = np.nan
+            else:
+                self._date_text[row] = date_value.strftime('%Y-%m-%d')
+                self._date_keys[row] = float(date_value.timestamp())
+        if 'Analysis' in data:
+            self._analysis[row] = bool(data['Analysis'])
+
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._headers) - 1))
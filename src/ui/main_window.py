@@ -4,7 +4,7 @@ from PySide6.QtWidgets import (
     QTableView, QHeaderView, QCheckBox, QDateEdit, QDialog, QFormLayout, QLineEdit, QDialogButtonBox,
     QGroupBox, QFrame, QMenu, QToolBar, QComboBox, QProgressDialog, QApplication
 )
-from PySide6.QtCore import Qt, QDate, QSortFilterProxyModel, QModelIndex, QTranslator, QCoreApplication, QTimer, QThread, Signal, QObject
+from PySide6.QtCore import Qt, QDate, QModelIndex, QTranslator, QCoreApplication, QTimer, QThread, QThreadPool, QRunnable, Signal, QObject
 from PySide6.QtGui import QStandardItemModel, QStandardItem, QIcon, QPixmap, QBrush, QColor
 from PySide6.QtWidgets import QProgressBar
 
@@ -13,13 +13,23 @@ import os
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
+import threading
 
-from src.data.data_model import DataModel
+from src.data.data_model import DataModel, STD_COLUMNS
+from src.data.importer import StreamingImporter, scan_missing_values
+from src.data.readers import read_head
+from src.ui.dataframe_model import DataFrameTableModel, SELECT_COLUMN, DATE_COLUMN
+from src.ui.report_window import ReportWindow
 from src.services.sql_service import SQLService
+from src.services.query_worker import QueryRunner
 from src.services.translator import LanguageManager
 from src.services.updater import Updater
 APP_VERSION = "1.0.1"
 GITHUB_REPO = "marcospr3421/MPRSeparator"  # Replace with your actual GitHub username and repo
+PREVIEW_ROWS = 100  # Rows read from an import file for the preview dialog
+PAGE_SIZE = 500  # Rows fetched per page of search results
+# Database column behind each table column (sortable ones only)
+SORT_FIELDS = [None, 'OrderNumber', 'SeparatorName', 'DateOfSeparation', 'Analysis']
 
 class UpdateDownloader(QObject):
     """Worker class for downloading updates in a separate thread"""
@@ -48,29 +58,67 @@ class UpdateDownloader(QObject):
         finally:
             self.finished.emit()
 
-class SortableTableModel(QStandardItemModel):
-    """Custom model that handles sorting properly for different data types"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.sort_order = {}  # Track sort order for each column
-        
-    def sort(self, column, order):
-        # Skip the checkbox column (column 0)
-        if column == 0:
-            return
-            
-        # For date column, use the timestamp data for proper sorting
-        if column == 3:  # Date column
-            self.setSortRole(Qt.ItemDataRole.UserRole)
-        # For analysis column, use the boolean value for sorting
-        elif column == 4:  # Analysis column
-            self.setSortRole(Qt.ItemDataRole.UserRole)
-        else:
-            # Use display text for other columns
-            self.setSortRole(Qt.ItemDataRole.DisplayRole)
-            
-        # Call the parent sort method
-        super().sort(column, order)
+class ImportScanSignals(QObject):
+    """Signals for ImportScanWorker (QRunnable can't define signals itself)"""
+    progress = Signal(object)  # running counts from scan_missing_values
+    finished = Signal(str)     # error message, empty when the scan ended normally
+
+class ImportScanWorker(QRunnable):
+    """Worker class for counting missing values in an import file on the thread pool"""
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.stop_event = threading.Event()
+        self.signals = ImportScanSignals()
+        
+    def run(self):
+        """Scan the whole file, reporting counts after each chunk"""
+        error = ''
+        try:
+            # A separate DataModel so the scan never touches the window's data
+            for counts in scan_missing_values(self.file_path, DataModel(), stop=self.stop_event):
+                self.signals.progress.emit(counts)
+        except Exception as e:
+            # Reported in the preview dialog through the finished signal
+            error = str(e)
+        self.signals.finished.emit(error)
+    
+    def cancel(self):
+        """Stop the scan after the current chunk"""
+        self.stop_event.set()
+
+class ImportSignals(QObject):
+    """Signals for ImportWorker (QRunnable can't define signals itself)"""
+    progress = Signal(float)         # percentage of the file saved
+    finished = Signal(object, str)   # importer totals, error message (empty on success)
+
+class ImportWorker(QRunnable):
+    """Worker class for reading and saving an import file on the thread pool"""
+    def __init__(self, file_path, sql_service):
+        super().__init__()
+        self.file_path = file_path
+        self.stop_event = threading.Event()
+        self.signals = ImportSignals()
+        # The reader thread gets its own DataModel and the writes their own service,
+        # so nothing here is shared with the GUI thread
+        self.importer = StreamingImporter(file_path, DataModel(), sql_service.merge_data)
+        
+    def run(self):
+        """Import the whole file, reporting progress after each chunk"""
+        error = ''
+        try:
+            self.importer.run(progress_callback=self._report_progress)
+        except Exception as e:
+            error = str(e)
+        self.signals.finished.emit(self.importer.result, error)
+    
+    def _report_progress(self, percent):
+        self.signals.progress.emit(percent)
+        return not self.stop_event.is_set()
+    
+    def cancel(self):
+        """Stop the import after the chunk being saved"""
+        self.stop_event.set()
 
 class MainWindow(QMainWindow):
     def __init__(self, language_manager, show_language_selector=False):
@@ -83,20 +131,22 @@ class MainWindow(QMainWindow):
         # Setup the automatic update checker
         self.setup_update_checker()
     
-    def update_progress(self, progress_dialog):
+    def update_progress(self, progress_dialog, label=None):
         """Create a callback function for updating progress
         
         Args:
             progress_dialog: The QProgressDialog to update
+            label: Optional text shown before the percentage
             
         Returns:
             Callback function that takes percentage value
         """
+        label = label or self.tr('Saving to database...')
+        
         def callback(percent):
-            # Calculate percentage in the 80-100% range (since db save is 80-100%)
-            value = 80 + int(percent * 0.2)
-            progress_dialog.setValue(value)
-            progress_dialog.setLabelText(f"{self.tr('Saving to database...')} {percent:.0f}%")
+            # Reading and saving overlap, so the whole 0-100% range tracks the file
+            progress_dialog.setValue(int(percent))
+            progress_dialog.setLabelText(f"{label} {percent:.0f}%")
             
             # Process events to update UI
             QCoreApplication.processEvents()
@@ -111,6 +161,15 @@ class MainWindow(QMainWindow):
         self.data_model = DataModel()
         self.sql_service = SQLService()
         
+        # Run searches off the GUI thread
+        self.search_runner = QueryRunner(self.sql_service, self)
+        self.search_runner.result_ready.connect(self.on_search_finished)
+        self.search_runner.error.connect(self.on_search_failed)
+        self.search_filters = {}
+        self.import_worker = None  # ImportWorker saving a file, if any
+        self.search_sort = None  # {'sort_column', 'descending'} chosen from the header, None for the default order
+        self.next_page_cursor = None
+        
         # Initialize language manager
         if self.language_manager:
             self.language_manager = self.language_manager
@@ -286,6 +345,7 @@ class MainWindow(QMainWindow):
         # Update action buttons
         self.select_all_checkbox.setText(self.tr("Select All"))
         self.edit_selected_button.setText(self.tr("Edit Selected"))
+        self.report_button.setText(self.tr("Reports"))
         # The all_records_button was removed from the UI
         # The delete_selected_button is commented out in setup_action_buttons,
         # so we don't need to check for it here
@@ -385,15 +445,8 @@ class MainWindow(QMainWindow):
         """Create the data table view"""
         self.table_view = QTableView()
         
-        # Use the custom sortable model
-        self.table_model = SortableTableModel()
-        
-        # Create a proxy model for sorting
-        self.proxy_model = QSortFilterProxyModel()
-        self.proxy_model.setSourceModel(self.table_model)
-        
-        # Setup custom sorting
-        self.proxy_model.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        # Use the DataFrame-backed model (cells are rendered on demand)
+        self.table_model = DataFrameTableModel()
         
         # Set headers for the table
         self.table_model.setHorizontalHeaderLabels([
@@ -404,11 +457,12 @@ class MainWindow(QMainWindow):
             self.tr("Analysis")
         ])
         
-        # Set the proxy model to the view
-        self.table_view.setModel(self.proxy_model)
+        # The view shows the model directly; on_sort_changed does the sorting
+        self.table_view.setModel(self.table_model)
         
-        # Configure the header for sorting
+        # Configure the header for sorting (clicking a section flips the indicator)
         header = self.table_view.horizontalHeader()
+        header.setSectionsClickable(True)
         header.setSortIndicatorShown(True)
         header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)  # Default no sort
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
@@ -416,9 +470,6 @@ class MainWindow(QMainWindow):
         # Connect sorting signal
         header.sortIndicatorChanged.connect(self.on_sort_changed)
         
-        # Enable sorting
-        self.table_view.setSortingEnabled(True)
-        
         # Make the select column narrower
         self.table_view.setColumnWidth(0, 50)
         
@@ -448,6 +499,10 @@ class MainWindow(QMainWindow):
         
         # Add reset button here (moved from filter section)
         
+        # Separator productivity report (grouped on the server)
+        self.report_button = QPushButton(self.tr("Reports"))
+        self.report_button.clicked.connect(self.show_report_window)
+        
         # Create search button
         self.search_button = QPushButton(self.tr("Search Database"))
         self.search_button.clicked.connect(self.search_database)
@@ -459,10 +514,16 @@ class MainWindow(QMainWindow):
         button_layout.addLayout(selection_layout)
         button_layout.addWidget(self.edit_selected_button)
         button_layout.addWidget(self.reset_button)  # Add the reset button here, next to Edit Selected
+        button_layout.addWidget(self.report_button)
         button_layout.addWidget(self.search_button)
         
         self.main_layout.addLayout(button_layout)
     
+    def show_report_window(self):
+        """Open the separator productivity report"""
+        report_window = ReportWindow(self.sql_service, self)
+        report_window.exec()
+    
     def import_file(self):
         """Import data from CSV or XLSX file"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -476,85 +537,11 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            # Create progress dialog
-            progress = QProgressDialog(self.tr("Reading file..."), self.tr("Cancel"), 0, 100, self)
-            progress.setWindowTitle(self.tr("Importing Data"))
-            progress.setWindowModality(Qt.WindowModality.WindowModal)
-            progress.setValue(0)
-            progress.show()
-            
-            # Update progress - file reading (20%)
-            progress.setValue(10)
-            progress.setLabelText(self.tr("Reading file data..."))
-            
-            # Import data based on file extension
-            if file_path.endswith('.csv'):
-                df = pd.read_csv(file_path)
-            elif file_path.endswith('.xlsx'):
-                df = pd.read_excel(file_path)
-            else:
-                raise ValueError("Unsupported file format")
-            
-            # Update progress - processing (40%)
-            progress.setValue(40)
-            progress.setLabelText(self.tr("Processing data..."))
-            
-            # Show preview dialog
-            if progress.wasCanceled():
-                return
-                
-            # Close progress during preview display
-            progress.close()
+            # Only the first rows are read for the preview; the rest is streamed on save
+            preview_df = read_head(file_path, PREVIEW_ROWS)
             
-            if self.show_import_preview(df, os.path.basename(file_path)):
-                # Reopen progress dialog for saving
-                progress = QProgressDialog(self.tr("Saving data..."), self.tr("Cancel"), 0, 100, self)
-                progress.setWindowTitle(self.tr("Saving Data"))
-                progress.setWindowModality(Qt.WindowModality.WindowModal)
-                progress.setValue(60)
-                progress.show()
-                
-                # Process and validate data
-                self.data_model.set_dataframe(df)
-                
-                # Update progress - saving (80%)
-                progress.setValue(80)
-                progress.setLabelText(self.tr("Saving to database..."))
-                
-                if progress.wasCanceled():
-                    return
-                    
-                # Automatically save the imported data to the database
-                try:
-                    records_saved = self.sql_service.save_data(df, progress_callback=self.update_progress(progress))
-                    
-                    # Complete progress
-                    progress.setValue(100)
-                    progress.setLabelText(self.tr("Import complete"))
-                    
-                    self.statusBar().showMessage(f"{self.tr('Imported and saved')} {records_saved} {self.tr('records to database from')} {os.path.basename(file_path)}")
-                    
-                    # Refresh the view by performing a search to display what was saved
-                    self.search_database()
-                    
-                    QMessageBox.information(
-                        self, 
-                        self.tr("Import Successful"), 
-                        f"{self.tr('Successfully imported and saved')} {records_saved} {self.tr('records to the database.')}",
-                    )
-                    
-                except Exception as e:
-                    QMessageBox.warning(
-                        self, 
-                        self.tr("Save Warning"), 
-                        f"{self.tr('Data was imported, but could not be saved to database:')} {str(e)}"
-                    )
-                    # Display data in the table without saving to DB
-                    self.display_data()
-                    self.statusBar().showMessage(f"{self.tr('Imported')} {len(df)} {self.tr('records from')} {os.path.basename(file_path)} {self.tr('(not saved to database)')}")
-                
-                finally:
-                    progress.close()
+            if self.show_import_preview(preview_df, os.path.basename(file_path), file_path):
+                self.start_import(file_path)
     
         except Exception as e:
             QMessageBox.critical(
@@ -563,12 +550,76 @@ class MainWindow(QMainWindow):
                 f"{self.tr('Failed to import data:')} {str(e)}"
             )
     
-    def show_import_preview(self, df, filename):
+    def start_import(self, file_path):
+        """Save a file to the database on the thread pool, showing a progress dialog
+        
+        Chunks are read and normalized on a background thread while the
+        previous chunk is being saved, so the file is never fully in memory
+        and the window stays responsive throughout.
+        
+        Args:
+            file_path (str): CSV or XLSX file confirmed in the preview
+        """
+        filename = os.path.basename(file_path)
+        progress = QProgressDialog(self.tr("Saving data..."), self.tr("Cancel"), 0, 100, self)
+        progress.setWindowTitle(self.tr("Saving Data"))
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setAutoClose(False)
+        progress.setValue(0)
+        progress.show()
+        
+        # The worker writes through its own service so cursors are never shared between threads
+        worker = ImportWorker(file_path, self.sql_service.clone())
+        self.import_worker = worker
+        
+        def on_progress(percent):
+            # Reading and saving overlap, so the whole 0-100% range tracks the file
+            if not progress.wasCanceled():
+                progress.setValue(int(percent))
+                progress.setLabelText(f"{self.tr('Saving to database...')} {percent:.0f}%")
+        
+        def on_finished(result, error):
+            self.import_worker = None
+            progress.close()
+            records_saved = result['inserted']
+            self.statusBar().showMessage(f"{self.tr('Imported and saved')} {records_saved} {self.tr('records to database from')} {filename}")
+            
+            if error:
+                QMessageBox.warning(
+                    self, 
+                    self.tr("Save Warning"), 
+                    f"{self.tr('Import stopped after saving')} {records_saved} {self.tr('records to the database:')} {error}"
+                )
+                return
+            
+            # Refresh the view by performing a search to display what was saved
+            self.search_database()
+            
+            message = f"{self.tr('Successfully imported and saved')} {records_saved} {self.tr('records to the database.')}"
+            if result['skipped'] > 0:
+                message += f"\n{result['skipped']} {self.tr('duplicate records were skipped.')}"
+            
+            QMessageBox.information(
+                self, 
+                self.tr("Import Successful"), 
+                message,
+            )
+        
+        # Connect signals
+        worker.signals.progress.connect(on_progress)
+        worker.signals.finished.connect(on_finished)
+        progress.canceled.connect(worker.cancel)
+        
+        QThreadPool.globalInstance().start(worker)
+    
+    def show_import_preview(self, df, filename, file_path=None):
         """Show a preview of the data to be imported and get user confirmation
         
         Args:
-            df: DataFrame with data to preview
+            df: DataFrame with the first rows of the file
             filename: Name of the file being imported
+            file_path: Optional path of the file; when given, the whole file is
+                scanned in the background and the validation counts fill in as it goes
             
         Returns:
             bool: True if user confirmed import, False otherwise
@@ -582,7 +633,7 @@ class MainWindow(QMainWindow):
         
         # Add info label
         info_text = (f"Preview of data from {filename}. "
-                    f"Found {len(df)} records. "
+                    f"Showing the first {len(df)} records. "
                     "Please verify the data before importing.")
         info_label = QLabel(info_text)
         layout.addWidget(info_label)
@@ -592,36 +643,27 @@ class MainWindow(QMainWindow):
         preview_model = QStandardItemModel()
         
         # Set up table headers
-        headers = list(df.columns)
+        headers = [str(col) for col in df.columns]
         preview_model.setHorizontalHeaderLabels(headers)
         
-        # Add sample data (first 100 rows max)
-        sample_rows = min(100, len(df))
-        for i in range(sample_rows):
-            row_items = []
-            for col in headers:
-                value = str(df.iloc[i].get(col, ''))
-                item = QStandardItem(value)
-                row_items.append(item)
-            preview_model.appendRow(row_items)
+        # Add sample data (first 100 rows max), converted to text in one pass
+        sample = df.head(100).fillna('').astype(str).to_numpy()
+        for values in sample:
+            preview_model.appendRow([QStandardItem(value) for value in values])
             
         preview_table.setModel(preview_model)
         preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         
-        # Add preview message
-        if len(df) > sample_rows:
-            preview_message = QLabel(f"Showing {sample_rows} of {len(df)} records")
-            layout.addWidget(preview_message)
-            
         layout.addWidget(preview_table)
         
         # Add data validation report
         validation_group = QGroupBox("Data Validation")
         validation_layout = QVBoxLayout(validation_group)
         
-        # Check for missing required columns
+        # Check for missing required columns (file headers may use any of the known aliases)
         required_columns = ['OrderNumber', 'SeparatorName', 'DateOfSeparation']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        file_columns = {STD_COLUMNS.get(str(col).strip().lower(), str(col).strip()) for col in df.columns}
+        missing_columns = [col for col in required_columns if col not in file_columns]
         
         if missing_columns:
             validation_message = QLabel(f"⚠️ Missing required columns: {', '.join(missing_columns)}")
@@ -632,27 +674,27 @@ class MainWindow(QMainWindow):
             
         validation_layout.addWidget(validation_message)
         
-        # Check for empty values in key columns
-        if 'OrderNumber' in df.columns:
-            missing_orders = df['OrderNumber'].isna().sum()
-            if missing_orders > 0:
-                order_message = QLabel(f"⚠️ {missing_orders} records missing Order Number")
-                order_message.setStyleSheet("color: red")
-                validation_layout.addWidget(order_message)
-                
-        if 'SeparatorName' in df.columns:
-            missing_names = df['SeparatorName'].isna().sum()
-            if missing_names > 0:
-                name_message = QLabel(f"⚠️ {missing_names} records missing Separator Name")
-                name_message.setStyleSheet("color: red")
-                validation_layout.addWidget(name_message)
-                
-        if 'DateOfSeparation' in df.columns:
-            missing_dates = df['DateOfSeparation'].isna().sum()
-            if missing_dates > 0:
-                date_message = QLabel(f"⚠️ {missing_dates} records missing Date")
-                date_message.setStyleSheet("color: red")
-                validation_layout.addWidget(date_message)
+        # Missing values in key columns, filled in by the background scan
+        scan_label = QLabel()
+        validation_layout.addWidget(scan_label)
+        missing_labels = {}
+        for column, text in (('OrderNumber', "records missing Order Number"),
+                             ('SeparatorName', "records missing Separator Name"),
+                             ('DateOfSeparation', "records missing Date")):
+            label = QLabel()
+            label.setStyleSheet("color: red")
+            label.setVisible(False)
+            validation_layout.addWidget(label)
+            missing_labels[column] = (label, text)
+        
+        def show_counts(counts, done=False):
+            for column, (label, text) in missing_labels.items():
+                label.setText(f"⚠️ {counts[column]} {text}")
+                label.setVisible(counts[column] > 0)
+            if done:
+                scan_label.setText(f"✓ Checked all {counts['rows']} records")
+            else:
+                scan_label.setText(f"Checking file... {counts['rows']} records ({counts['fraction'] * 100:.0f}%)")
         
         layout.addWidget(validation_group)
         
@@ -662,69 +704,72 @@ class MainWindow(QMainWindow):
         button_box.rejected.connect(preview_dialog.reject)
         layout.addWidget(button_box)
         
+        scan_worker = None
+        if file_path:
+            # Scan the whole file on the thread pool while the dialog is open
+            latest_counts = {}
+            scan_label.setText("Checking file...")
+            scan_worker = ImportScanWorker(file_path)
+            
+            def on_scan_progress(counts):
+                latest_counts.update(counts)
+                show_counts(counts)
+            
+            def on_scan_finished(error):
+                if error:
+                    scan_label.setText(f"⚠️ Could not check the whole file: {error}")
+                elif latest_counts and not scan_worker.stop_event.is_set():
+                    show_counts(latest_counts, done=True)
+            
+            # Connect signals
+            scan_worker.signals.progress.connect(on_scan_progress)
+            scan_worker.signals.finished.connect(on_scan_finished)
+            
+            QThreadPool.globalInstance().start(scan_worker)
+        else:
+            # Without the file, report on the rows that were read
+            counts = {'rows': len(df), 'fraction': 1.0}
+            for column in required_columns:
+                counts[column] = int(df[column].isna().sum()) if column in df.columns else 0
+            show_counts(counts, done=True)
+        
         # Execute dialog
-        return preview_dialog.exec() == QDialog.DialogCode.Accepted
+        accepted = preview_dialog.exec() == QDialog.DialogCode.Accepted
+        
+        if scan_worker is not None:
+            # Stop the scan; the import reads the file again anyway
+            scan_worker.cancel()
+        
+        return accepted
     
     def display_data(self):
         """Display the current data in the table view"""
-        # Clear the model
-        self.table_model.setRowCount(0)
-        
         # Get data from the model
         df = self.data_model.get_dataframe()
         
         if df is None or df.empty:
+            # Clear the model
+            self.table_model.clear()
             self.statusBar().showMessage("No data to display")
             return
         
-        # Fill the table with data
-        for i, row in df.iterrows():
-            # Add a checkbox for selection
-            select_item = QStandardItem()
-            select_item.setCheckable(True)
-            select_item.setCheckState(Qt.CheckState.Unchecked)
-            
-            # Store ID as item data but don't display it
-            id_value = str(row.get('Id', ''))
-            
-            order_item = QStandardItem(str(row.get('OrderNumber', '')))
-            # Store the ID as user data in the order item for reference
-            order_item.setData(id_value, Qt.ItemDataRole.UserRole)
-            
-            name_item = QStandardItem(str(row.get('SeparatorName', '')))
-            
-            # Format date if available
-            date_str = str(row.get('DateOfSeparation', ''))
-            if date_str and date_str != 'nan':
-                try:
-                    date_obj = pd.to_datetime(date_str)
-                    date_str = date_obj.strftime('%Y-%m-%d')
-                    # Store the original date for proper sorting
-                    date_item = QStandardItem(date_str)
-                    date_item.setData(date_obj.timestamp(), Qt.ItemDataRole.UserRole)
-                except:
-                    date_item = QStandardItem(date_str)
-            else:
-                date_item = QStandardItem(date_str)
-            
-            # Handle analysis boolean
-            analysis_value = row.get('Analysis', False)
-            analysis_item = QStandardItem()
-            analysis_item.setCheckable(True)
-            analysis_item.setCheckState(Qt.CheckState.Checked if analysis_value else Qt.CheckState.Unchecked)
-            # Store a numeric value for sorting
-            analysis_item.setData(1 if analysis_value else 0, Qt.ItemDataRole.UserRole)
-            
-            # Add the row to the table (without ID column)
-            row_items = [select_item, order_item, name_item, date_item, analysis_item]
-            self.table_model.appendRow(row_items)
+        # Hand the columns to the table model; rows are rendered on demand
+        self.table_model.set_dataframe(df)
         
         # Update status bar with record count
         record_count = len(df)
         self.statusBar().showMessage(f"Displaying {record_count} records")
         
-        # Reset sort indicator
-        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        # Reset sort indicator (the rows are already in their display order)
+        self.show_sort_indicator(-1, Qt.SortOrder.AscendingOrder)
+    
+    def show_sort_indicator(self, column, order):
+        """Show a sort indicator without sorting the table again"""
+        header = self.table_view.horizontalHeader()
+        header.blockSignals(True)
+        header.setSortIndicator(column, order)
+        header.blockSignals(False)
+        header.viewport().update()
     
     def set_today_filter(self):
         """Set date filter to today only - DEPRECATED"""
@@ -765,23 +810,16 @@ class MainWindow(QMainWindow):
     
     def get_selected_rows(self):
         """Get a list of row indices that are currently selected"""
-        selected_rows = []
-        for row in range(self.table_model.rowCount()):
-            select_item = self.table_model.item(row, 0)
-            if select_item and select_item.checkState() == Qt.CheckState.Checked:
-                selected_rows.append(row)
-        return selected_rows
+        return self.table_model.checked_rows()
     
     def get_selected_ids(self):
         """Get a list of IDs from the selected rows"""
         selected_ids = []
         for row in self.get_selected_rows():
-            # Get ID from the order item's user data
-            order_item = self.table_model.item(row, 1)  # Order Number is now column 1
-            if order_item:
-                id_value = order_item.data(Qt.ItemDataRole.UserRole)
-                if id_value:
-                    selected_ids.append(id_value)
+            # Get ID stored with the row
+            id_value = self.table_model.record_id(row)
+            if id_value:
+                selected_ids.append(id_value)
         return selected_ids
     
     def edit_selected_records(self):
@@ -792,9 +830,7 @@ class MainWindow(QMainWindow):
             # check if there's a current row selected in the table
             selected_indexes = self.table_view.selectionModel().selectedRows()
             if selected_indexes:
-                # Map proxy indexes to source model indexes
-                source_rows = [self.proxy_model.mapToSource(idx).row() for idx in selected_indexes]
-                self.open_edit_dialog(source_rows)
+                self.open_edit_dialog([idx.row() for idx in selected_indexes])
                 return
         
             QMessageBox.warning(
@@ -828,22 +864,37 @@ class MainWindow(QMainWindow):
         )
         
         if confirm == QMessageBox.StandardButton.Yes:
-            success_count = 0
-            fail_count = 0
+            progress = QProgressDialog(self.tr("Deleting records..."), self.tr("Cancel"), 0, 100, self)
+            progress.setWindowTitle(self.tr("Deleting Records"))
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.setValue(0)
+            progress.show()
             
-            for record_id in selected_ids:
-                try:
-                    if self.sql_service.delete_record(record_id):
-                        success_count += 1
-                    else:
-                        fail_count += 1
-                except Exception:
-                    fail_count += 1
+            # All selected records go in one transaction, chunk by chunk
+            try:
+                result = self.sql_service.delete_records(
+                    selected_ids,
+                    progress_callback=self.update_progress(progress, self.tr("Deleting records..."))
+                )
+                canceled = progress.wasCanceled()
+            except Exception as e:
+                QMessageBox.critical(
+                    self,
+                    "Delete Error",
+                    f"No records were deleted: {str(e)}"
+                )
+                return
+            finally:
+                progress.close()
+            
+            if canceled:
+                self.statusBar().showMessage("Delete canceled, no records were deleted")
+                return
             
             # Show results
-            message = f"Successfully deleted {success_count} record(s)."
-            if fail_count > 0:
-                message += f"\n{fail_count} record(s) could not be deleted."
+            message = f"Successfully deleted {result['deleted']} record(s)."
+            if result['missing']:
+                message += f"\n{len(result['missing'])} record(s) could not be deleted (not found)."
             
             QMessageBox.information(
                 self,
@@ -900,11 +951,12 @@ class MainWindow(QMainWindow):
         # If editing a single row, pre-fill the fields
         if len(rows) == 1:
             row = rows[0]
-            order_number = self.table_model.item(row, 1).text()  # Order Number (column 1)
-            separator_name = self.table_model.item(row, 2).text()  # Separator Name (column 2)
+            row_values = self.table_model.row_values(row)
+            order_number = row_values['OrderNumber']
+            separator_name = row_values['SeparatorName']
             
             # Date of separation
-            date_str = self.table_model.item(row, 3).text()  # Date (column 3)
+            date_str = row_values['DateOfSeparation']
             try:
                 # Try different date formats (both yyyy-MM-dd and dd-MM-yyyy)
                 date = QDate.fromString(date_str, "yyyy-MM-dd")
@@ -920,8 +972,7 @@ class MainWindow(QMainWindow):
                 original_values['DateOfSeparation'] = ""
             
             # Analysis checkbox
-            analysis_item = self.table_model.item(row, 4)  # Analysis (column 4)
-            is_checked = analysis_item and analysis_item.checkState() == Qt.CheckState.Checked
+            is_checked = row_values['Analysis']
             analysis_checkbox.setChecked(is_checked)
             
             # Set the text fields
@@ -934,8 +985,7 @@ class MainWindow(QMainWindow):
             original_values['Analysis'] = is_checked
             
             # Show record ID if available (as read-only)
-            order_item = self.table_model.item(row, 1)
-            record_id = order_item.data(Qt.ItemDataRole.UserRole) if order_item else ""
+            record_id = self.table_model.record_id(row)
             if record_id:
                 id_display = QLineEdit(str(record_id))
                 id_display.setReadOnly(True)
@@ -1023,72 +1073,46 @@ class MainWindow(QMainWindow):
         if not rows or not data:
             return
             
-        # Get current DataFrame
+        # Check if there is data loaded
         df = self.data_model.get_dataframe()
-        
-        # Check if DataFrame is valid
         if df is None or df.empty:
             return
             
         # Track which records were updated
         updated_ids = []
-        db_updated_ids = []
+        updated_rows = []
         
         for row in rows:
-            # Get the record ID from the order item's user data
-            order_item = self.table_model.item(row, 1)  # Order Number (column 1)
-            if not order_item:
-                continue
-                
-            record_id = order_item.data(Qt.ItemDataRole.UserRole)
+            # Get the record ID stored with the row
+            record_id = self.table_model.record_id(row)
             if not record_id:
                 continue
-                
-            # Find this record in the DataFrame by ID
-            if 'Id' in df.columns:
-                # Find the row in DataFrame by ID
-                row_filter = df['Id'].astype(str) == record_id
-                if not row_filter.any():
-                    continue
-                    
-                # Update the DataFrame with new data (only changed fields)
-                for key, value in data.items():
-                    if key in df.columns:
-                        df.loc[row_filter, key] = value
-                        
-                updated_ids.append(record_id)
-                
-                # Try to update the database if record has an ID
-                try:
-                    if self.sql_service.update_record(record_id, data):
-                        db_updated_ids.append(record_id)
-                except Exception as e:
-                    self.statusBar().showMessage(f"Error updating database: {str(e)}")
             
-            # Update the table view (only changed fields)
-            for key, value in data.items():
-                if key == 'OrderNumber':
-                    self.table_model.item(row, 1).setText(value)
-                elif key == 'SeparatorName':
-                    self.table_model.item(row, 2).setText(value)
-                elif key == 'DateOfSeparation':
-                    self.table_model.item(row, 3).setText(value)
-                elif key == 'Analysis':
-                    analysis_item = self.table_model.item(row, 4)
-                    if analysis_item:
-                        analysis_item.setCheckState(
-                            Qt.CheckState.Checked if value else Qt.CheckState.Unchecked
-                        )
-        
-        # Update the DataModel with the modified DataFrame
-        self.data_model.set_dataframe(df)
+            updated_ids.append(record_id)
+            updated_rows.append(row)
+        
+        # Update every record in the database with one statement
+        db_updated_count = 0
+        if updated_ids:
+            try:
+                db_updated_count = self.sql_service.update_records(updated_ids, data)
+            except Exception as e:
+                self.statusBar().showMessage(f"Error updating database: {str(e)}")
+        
+        # Update the table view (only changed fields)
+        for row in updated_rows:
+            self.table_model.update_row(row, data)
+        
+        # Update the loaded records in place (only changed fields)
+        if not self.data_model.update_rows(updated_ids, data):
+            updated_ids = []
         
         # Show a success message
         if updated_ids:
             message = f"Updated {len(updated_ids)} record(s) in view."
-            if db_updated_ids:
-                message += f"\n{len(db_updated_ids)} record(s) updated in database."
-            elif len(db_updated_ids) < len(updated_ids):
+            if db_updated_count:
+                message += f"\n{db_updated_count} record(s) updated in database."
+            if db_updated_count < len(updated_ids):
                 message += "\nSome records were not updated in the database."
                 
             QMessageBox.information(
@@ -1105,11 +1129,14 @@ class MainWindow(QMainWindow):
 
     def reset_filters_and_results(self):
         """Reset filters and clear results"""
+        # Stop any search still running
+        self.search_runner.cancel()
+        
         # Reset filters
         self.reset_filters()
         
         # Clear the table
-        self.table_model.setRowCount(0)
+        self.table_model.clear()
         
         # Clear the data model
         if self.data_model.original_df is not None:
@@ -1119,56 +1146,117 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage("Filters and results cleared")
         
     def search_database(self):
-        """Search the database with filters"""
-        try:
-            # Get filter values
-            order_number = self.order_edit.text().strip()
-            separator_name = self.name_edit.text().strip()
-            # record_id = self.id_edit.text().strip()  # Remove ID filter
-            analysis_only = self.analysis_checkbox.isChecked()
-            
-            # Show loading indicator
-            self.statusBar().showMessage(self.tr("Searching database..."))
-            
-            # Set default date range (last 7 days) if no filters are applied
-            from_date = None
-            to_date = None
-            
-            # Check if all filters are empty
-            if not order_number and not separator_name and not analysis_only:
-                # Use last 7 days as default
-                to_date = datetime.now().strftime('%Y-%m-%d')
-                from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-                self.statusBar().showMessage(self.tr("Searching for records from the last 7 days..."))
-            
-            # Perform search without ID parameter
-            result_df = self.sql_service.fetch_data(
-                from_date=from_date,
-                to_date=to_date,
-                order_number=order_number,
-                separator_name=separator_name,
-                # record_id=record_id,  # Remove ID parameter
-                analysis_only=analysis_only
-            )
-            
+        """Search the database with filters in the background
+        
+        A newer search cancels the one still running, and its results are dropped.
+        """
+        # Get filter values
+        order_number = self.order_edit.text().strip()
+        separator_name = self.name_edit.text().strip()
+        # record_id = self.id_edit.text().strip()  # Remove ID filter
+        analysis_only = self.analysis_checkbox.isChecked()
+        
+        # Show loading indicator
+        self.statusBar().showMessage(self.tr("Searching database..."))
+        
+        # Set default date range (last 7 days) if no filters are applied
+        from_date = None
+        to_date = None
+        
+        # Check if all filters are empty
+        if not order_number and not separator_name and not analysis_only:
+            # Use last 7 days as default
+            to_date = datetime.now().strftime('%Y-%m-%d')
+            from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+            self.statusBar().showMessage(self.tr("Searching for records from the last 7 days..."))
+        
+        # Remember the filters so later pages use the same query
+        self.search_filters = {
+            'from_date': from_date,
+            'to_date': to_date,
+            'order_number': order_number,
+            'separator_name': separator_name,
+            # 'record_id': record_id,  # Remove ID parameter
+            'analysis_only': analysis_only
+        }
+        self.fetch_first_page()
+    
+    def fetch_first_page(self):
+        """Fetch the first page of the current search on a worker thread
+        
+        The rest loads as the user scrolls. The rows come back in the
+        order chosen from the table header.
+        """
+        self.next_page_cursor = None
+        
+        # Stop the table from asking for pages of the previous search
+        self.table_model.set_more_loader(None)
+        
+        filters = dict(self.search_filters)
+        sort = dict(self.search_sort or {})
+        self.search_runner.run(
+            lambda service: service.fetch_page(**filters, **sort, page_size=PAGE_SIZE),
+            context={'last_7_days': bool(filters['from_date'] and filters['to_date']), 'more': False}
+        )
+    
+    def load_next_page(self):
+        """Fetch the page after the loaded rows (called when the table scrolls to the end)"""
+        if self.next_page_cursor is None:
+            self.table_model.set_more_loader(None)
+            return
+        
+        self.statusBar().showMessage(self.tr("Loading more records..."))
+        filters = dict(self.search_filters)
+        sort = dict(self.search_sort or {})
+        cursor = self.next_page_cursor
+        self.search_runner.run(
+            lambda service: service.fetch_page(**filters, **sort, page_size=PAGE_SIZE, after=cursor),
+            context={'last_7_days': bool(filters['from_date'] and filters['to_date']), 'more': True}
+        )
+    
+    def on_search_finished(self, result, context):
+        """Display a page of results from a background search"""
+        result_df, self.next_page_cursor = result
+        context = context or {}
+        
+        if context.get('more'):
+            # Add the page below the rows already shown
+            page_df = self.data_model.append_dataframe(result_df)
+            self.table_model.append_dataframe(page_df)
+        else:
             # Update the data model and display the results
-            self.data_model.set_dataframe(result_df)
+            self.data_model.set_dataframe(result_df, select_all=True)
             self.display_data()
             
-            # Update status bar
-            count = len(result_df) if result_df is not None else 0
-            if from_date and to_date and not order_number and not separator_name and not analysis_only:
-                self.statusBar().showMessage(self.tr(f"Found {count} records from the last 7 days"))
-            else:
-                self.statusBar().showMessage(self.tr(f"Found {count} records"))
-            
-        except Exception as e:
-            self.statusBar().showMessage(self.tr("Error searching database"))
-            QMessageBox.critical(
-                self,
-                self.tr("Search Error"),
-                str(e)
-            )
+            # The rows arrive in the order picked from the header
+            if self.search_sort:
+                column = SORT_FIELDS.index(self.search_sort['sort_column'])
+                order = Qt.SortOrder.DescendingOrder if self.search_sort['descending'] else Qt.SortOrder.AscendingOrder
+                self.show_sort_indicator(column, order)
+        
+        # Let the table ask for the next page when it is scrolled to the end
+        self.table_model.set_more_loader(self.load_next_page if self.next_page_cursor is not None else None)
+        
+        # Update status bar
+        count = self.table_model.rowCount()
+        if context.get('last_7_days'):
+            message = self.tr("Found {0} records from the last 7 days").format(count)
+        else:
+            message = self.tr("Found {0} records").format(count)
+        if self.next_page_cursor is not None:
+            message += f" ({self.tr('scroll down to load more')})"
+        self.statusBar().showMessage(message)
+    
+    def on_search_failed(self, message, context):
+        """Report an error from a background search"""
+        # Don't keep retrying the page that failed
+        self.table_model.set_more_loader(None)
+        self.statusBar().showMessage(self.tr("Error searching database"))
+        QMessageBox.critical(
+            self,
+            self.tr("Search Error"),
+            message
+        )
 
     def search_all_records(self):
         """Search for all records with no filters"""
@@ -1183,15 +1271,46 @@ class MainWindow(QMainWindow):
         self.search_database()
 
     def on_sort_changed(self, column, order):
-        """Handle changes in the sort indicator"""
+        """Handle changes in the sort indicator
+        
+        While only some pages of a search are loaded, the search runs again
+        with the ORDER BY pushed to SQL Server, since sorting the loaded rows
+        would leave out everything not fetched yet. Fully loaded results are
+        sorted in place by the table model.
+        """
         # Skip sorting for the checkbox column
-        if column == 0:
-            # Reset to no sorting
-            self.table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        if column == SELECT_COLUMN:
+            # Put back the indicator of the current order without sorting again
+            if self.search_sort:
+                sort_column = SORT_FIELDS.index(self.search_sort['sort_column'])
+                sort_order = Qt.SortOrder.DescendingOrder if self.search_sort['descending'] else Qt.SortOrder.AscendingOrder
+                self.show_sort_indicator(sort_column, sort_order)
+            else:
+                self.show_sort_indicator(-1, Qt.SortOrder.AscendingOrder)
             return
-            
+        
+        if column < 0:
+            # Back to the default order (newest first)
+            self.search_sort = None
+            if self.next_page_cursor is not None:
+                self.fetch_first_page()
+            else:
+                self.table_model.sort(DATE_COLUMN, Qt.SortOrder.DescendingOrder)
+            return
+        
+        self.search_sort = {
+            'sort_column': SORT_FIELDS[column],
+            'descending': order == Qt.SortOrder.DescendingOrder
+        }
+        
+        if self.next_page_cursor is not None:
+            # Only part of the results is loaded; let the database order all of them
+            self.statusBar().showMessage(self.tr("Searching database..."))
+            self.fetch_first_page()
+            return
+        
         # Apply the sort
-        self.proxy_model.sort(column, order)
+        self.table_model.sort(column, order)
         
         # Update status message with the current sort
         column_names = [
@@ -1207,9 +1326,7 @@ class MainWindow(QMainWindow):
 
     def handle_double_click(self, index):
         """Handle double-click on a table cell by opening the edit dialog for that row"""
-        # Get the source index from the proxy model
-        source_idx = self.proxy_model.mapToSource(index)
-        row = source_idx.row()
+        row = index.row()
         
         # Check if the row is valid
         if row >= 0 and row < self.table_model.rowCount():
@@ -1232,10 +1349,7 @@ class MainWindow(QMainWindow):
 
     def toggle_select_all(self, checked):
         """Toggle selection of all rows in the table"""
-        for row in range(self.table_model.rowCount()):
-            select_item = self.table_model.item(row, 0)
-            if select_item:
-                select_item.setCheckState(Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+        self.table_model.set_all_checked(checked)
         
         # Update status message
         if checked:
@@ -0,0 +1,235 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
+    QPushButton, QLabel, QLineEdit, QDateEdit, QCheckBox,
+    QTableView, QHeaderView, QMessageBox, QFileDialog
+)
+from PySide6.QtCore import Qt, QDate
+from PySide6.QtGui import QStandardItemModel, QStandardItem
+import pandas as pd
+
+from src.services.query_worker import QueryRunner
+
+class ReportWindow(QDialog):
+    """Separator productivity report
+
+    Orders and analyses are counted per separator (and per day) by SQL
+    Server, so only the summary rows are transferred.
+    """
+    def __init__(self, sql_service, parent=None):
+        super().__init__(parent)
+
+        self.sql_service = sql_service
+        self.summary_df = None
+
+        # Reports run in the background
+        self.query_runner = QueryRunner(self.sql_service, self)
+        self.query_runner.result_ready.connect(self.on_report_finished)
+        self.query_runner.error.connect(self.on_report_failed)
+
+        # Setup the UI
+        self.setWindowTitle(self.tr("Separator Report"))
+        self.setMinimumSize(700, 500)
+
+        self.main_layout = QVBoxLayout(self)
+        self.setup_filters()
+        self.setup_table()
+        self.setup_buttons()
+
+        # Show the last 30 days right away
+        self.run_report()
+
+    def setup_filters(self):
+        """Create the period and separator filters"""
+        filter_layout = QFormLayout()
+
+        # Period (last 30 days by default)
+        self.from_date = QDateEdit()
+        self.from_date.setCalendarPopup(True)
+        self.from_date.setDate(QDate.currentDate().addDays(-30))
+        filter_layout.addRow(self.tr("From Date:"), self.from_date)
+
+        self.to_date = QDateEdit()
+        self.to_date.setCalendarPopup(True)
+        self.to_date.setDate(QDate.currentDate())
+        filter_layout.addRow(self.tr("To Date:"), self.to_date)
+
+        # Separator name filter
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText(self.tr("All separators"))
+        filter_layout.addRow(self.tr("Separator Name:"), self.name_edit)
+
+        # Grouping
+        self.by_day_checkbox = QCheckBox(self.tr("One row per day"))
+        self.by_day_checkbox.setChecked(True)
+        filter_layout.addRow("", self.by_day_checkbox)
+
+        self.main_layout.addLayout(filter_layout)
+
+    def setup_table(self):
+        """Create the summary table"""
+        self.table_model = QStandardItemModel()
+        # Items keep a sort key next to the formatted text
+        self.table_model.setSortRole(Qt.ItemDataRole.UserRole)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.table_model)
+        self.table_view.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.main_layout.addWidget(self.table_view)
+
+        self.totals_label = QLabel()
+        self.main_layout.addWidget(self.totals_label)
+
+    def setup_buttons(self):
+        """Create the action buttons"""
+        button_layout = QHBoxLayout()
+
+        self.run_button = QPushButton(self.tr("Run Report"))
+        self.run_button.clicked.connect(self.run_report)
+
+        self.export_button = QPushButton(self.tr("Export to Excel..."))
+        self.export_button.clicked.connect(self.export_report)
+        self.export_button.setEnabled(False)
+
+        self.close_button = QPushButton(self.tr("Close"))
+        self.close_button.clicked.connect(self.close)
+
+        button_layout.addWidget(self.run_button)
+        button_layout.addWidget(self.export_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+
+        self.main_layout.addLayout(button_layout)
+
+    def run_report(self):
+        """Run the summary query on a worker thread"""
+        from_date = self.from_date.date().toString('yyyy-MM-dd')
+        to_date = self.to_date.date().toString('yyyy-MM-dd')
+        separator_name = self.name_edit.text().strip()
+        by_day = self.by_day_checkbox.isChecked()
+
+        self.run_button.setEnabled(False)
+        self.totals_label.setText(self.tr("Loading report..."))
+        self.query_runner.run(
+            lambda service: service.fetch_separator_summary(
+                from_date=from_date, to_date=to_date, separator_name=separator_name, by_day=by_day
+            ),
+            context={'by_day': by_day}
+        )
+
+    def on_report_finished(self, df, context):
+        """Show the summary rows"""
+        self.run_button.setEnabled(True)
+        self.summary_df = df
+        self.export_button.setEnabled(df is not None and not df.empty)
+        self.display_summary(df, context.get('by_day', True))
+
+    def on_report_failed(self, message, context):
+        """Report a failed summary query"""
+        self.run_button.setEnabled(True)
+        self.totals_label.setText("")
+        QMessageBox.critical(
+            self,
+            self.tr("Database Error"),
+            f"{self.tr('Failed to load the report:')} {message}"
+        )
+
+    def display_summary(self, df, by_day):
+        """Fill the table with summary rows"""
+        self.table_model.clear()
+
+        headers = [self.tr("Separator Name")]
+        if by_day:
+            headers.append(self.tr("Date"))
+        else:
+            headers.append(self.tr("Days"))
+        headers += [self.tr("Orders"), self.tr("Analysis"), self.tr("Analysis %")]
+        if not by_day:
+            headers.append(self.tr("Orders per Day"))
+        self.table_model.setHorizontalHeaderLabels(headers)
+
+        if df is None or df.empty:
+            self.totals_label.setText(self.tr("No records in this period"))
+            return
+
+        for row in df.itertuples(index=False):
+            items = [self.text_item(row.SeparatorName)]
+            if by_day:
+                items.append(self.text_item('' if pd.isna(row.Day) else row.Day.strftime('%Y-%m-%d')))
+            else:
+                items.append(self.number_item(row.Days))
+            items += [
+                self.number_item(row.Orders),
+                self.number_item(row.AnalysisCount),
+                self.number_item(row.AnalysisRatio * 100, f"{row.AnalysisRatio * 100:.1f}%")
+            ]
+            if not by_day:
+                per_day = '' if pd.isna(row.OrdersPerDay) else f"{row.OrdersPerDay:.1f}"
+                items.append(self.number_item(row.OrdersPerDay, per_day))
+            self.table_model.appendRow(items)
+
+        orders = int(df['Orders'].sum())
+        analysis = int(df['AnalysisCount'].sum())
+        ratio = analysis / orders * 100 if orders else 0
+        self.totals_label.setText(
+            f"{orders} {self.tr('orders')}, {analysis} {self.tr('in analysis')} ({ratio:.1f}%)"
+        )
+
+    def text_item(self, value):
+        """Create a table item for text, sorted case-insensitively"""
+        text = '' if value is None else str(value)
+        item = QStandardItem(text)
+        item.setData(text.lower(), Qt.ItemDataRole.UserRole)
+        return item
+
+    def number_item(self, value, text=None):
+        """Create a table item that sorts by its numeric value
+
+        Args:
+            value: Number used for sorting (missing values sort first)
+            text (str): Optional formatted text to show instead of the number
+        """
+        missing = pd.isna(value)
+        if text is None:
+            text = '' if missing else f"{value:g}"
+        item = QStandardItem(text)
+        item.setData(float('-inf') if missing else float(value), Qt.ItemDataRole.UserRole)
+        return item
+
+    def export_report(self):
+        """Save the summary rows to an Excel file"""
+        if self.summary_df is None or self.summary_df.empty:
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            self.tr("Export Report"),
+            "separator_report.xlsx",
+            "Excel Files (*.xlsx)"
+        )
+        if not file_path:
+            return
+
+        try:
+            self.summary_df.to_excel(file_path, index=False)
+            self.totals_label.setText(f"{self.tr('Report exported to')} {file_path}")
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                self.tr("Export Error"),
+                f"{self.tr('Failed to export the report:')} {str(e)}"
+            )
+
+    def done(self, result):
+        """Cancel a report still running when the dialog is dismissed
+
+        Esc, reject(), accept() and the close button all end here.
+        """
+        self.query_runner.cancel()
+        super().done(result)
+
+    def closeEvent(self, event):
+        """Cancel a report still running when the dialog is closed"""
+        self.query_runner.cancel()
+        super().closeEvent(event)
@@ -0,0 +1,34 @@
+"""Analysis flags keep their values whatever dtype the file or database gives them"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_model import DataModel
+
+
+@pytest.mark.parametrize('values', [
+    pd.Series([1, 0, None], dtype='Int64'),
+    pd.Series([True, False, None], dtype='boolean'),
+    pd.Series([1.0, 0.0, np.nan]),
+    pd.Series(['Yes', 'no', None]),
+    pd.Series([np.True_, np.False_, None], dtype=object),
+])
+def test_to_bool(values):
+    assert DataModel()._to_bool(values).tolist() == [True, False, False]
+
+
+def test_filtered_df_with_every_row_selected_is_a_copy():
+    model = DataModel()
+    model.set_dataframe(pd.DataFrame({
+        'OrderNumber': ['A1', 'A2'],
+        'SeparatorName': ['Ana', 'Eduardo'],
+        'DateOfSeparation': ['2025-04-03', '2025-04-04'],
+        'Analysis': [0, 1],
+    }), select_all=True)
+
+    filtered = model.filtered_df
+    filtered.loc[0, 'Analysis'] = True
+    filtered['Extra'] = 1
+
+    assert model.original_df['Analysis'].tolist() == [False, True]
+    assert 'Extra' not in model.original_df.columns
@@ -0,0 +1,62 @@
+"""Date filters on the local record mirror compare like SQL Server's DATE column"""
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.local_cache import LocalCache, date_bound
+from src.services.record_queries import build_order_by, build_where
+
+# One record per day from 2025-03-25 to 2025-04-10
+DAYS = [date(2025, 3, 25) + timedelta(days=i) for i in range(17)]
+
+
+@pytest.fixture
+def mirror():
+    cache = LocalCache(None, 'SeparatorRecords')
+    rows = [(i + 1, f"ORD{i}", 'Ana', day, i % 2, None) for i, day in enumerate(DAYS)]
+    with cache._transaction() as local:
+        cache._store_rows(local, rows)
+    return cache
+
+
+def mirror_days(cache, from_date=None, to_date=None):
+    where, params = build_where(date_bound(from_date), date_bound(to_date))
+    df = cache.query(where, params, build_order_by('DateOfSeparation', descending=False))
+    return [value.date() for value in df['DateOfSeparation']]
+
+
+@pytest.mark.parametrize('bound', [
+    '2025-04-03',
+    '2025-04-03 00:00:00',
+    '2025-04-03 15:30:00',
+    '2025-04-03T00:00:00',
+    date(2025, 4, 3),
+    datetime(2025, 4, 3),
+    pd.Timestamp('2025-04-03'),
+    np.datetime64('2025-04-03'),
+])
+def test_day_bounds_keep_the_whole_day(mirror, bound):
+    # Text is converted to DATE and midnight equals the day, so 2025-04-03 is included on both sides
+    assert mirror_days(mirror, from_date=bound) == [day for day in DAYS if day >= date(2025, 4, 3)]
+    assert mirror_days(mirror, to_date=bound) == [day for day in DAYS if day <= date(2025, 4, 3)]
+
+
+@pytest.mark.parametrize('bound', [
+    datetime(2025, 4, 3, 15, 30),
+    pd.Timestamp('2025-04-03 15:30:00'),
+    np.datetime64('2025-04-03T15:30:00'),
+])
+def test_datetime_bounds_compare_with_midnight(mirror, bound):
+    # SQL Server compares the DATE column as midnight of its day with a datetime parameter
+    assert mirror_days(mirror, from_date=bound) == [day for day in DAYS if day > date(2025, 4, 3)]
+    assert mirror_days(mirror, to_date=bound) == [day for day in DAYS if day <= date(2025, 4, 3)]
+
+
+def test_date_bound_forms():
+    assert date_bound(None) is None
+    assert date_bound('2025-04-03 00:00:00') == '2025-04-03'
+    assert date_bound(date(2025, 4, 3)) == '2025-04-03'
+    assert date_bound(datetime(2025, 4, 3)) == '2025-04-03'
+    assert date_bound(pd.Timestamp('2025-04-03 08:00')) == '2025-04-03 08:00:00.000000'
@@ -0,0 +1,11 @@
+"""Query cache keys only merge calls that run the same query"""
+from src.services.query_cache import make_key
+
+
+def test_empty_text_is_no_filter():
+    assert make_key('fetch_data', order_number='', analysis_only=0) == make_key('fetch_data', order_number=None, analysis_only=False)
+
+
+def test_padded_text_has_its_own_key():
+    # SQLService runs LIKE '% ABC%' for ' ABC', which is not the query for 'ABC'
+    assert make_key('fetch_data', order_number=' ABC') != make_key('fetch_data', order_number='ABC')
@@ -0,0 +1,13 @@
+"""Reports only read the daily rollup table when it is enabled"""
+from src.services.reports import can_use_daily_summary
+
+
+def test_daily_summary_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('MPR_DAILY_SUMMARY', raising=False)
+    assert not can_use_daily_summary('2025-04-01', '2025-04-30')
+
+
+def test_daily_summary_needs_whole_days(monkeypatch):
+    monkeypatch.setenv('MPR_DAILY_SUMMARY', '1')
+    assert can_use_daily_summary('2025-04-01', '2025-04-30')
+    assert not can_use_daily_summary('2025-04-01 08:00:00', '2025-04-30')
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Normalization Benchmark for MPR Separator
+
+Compares DataModel.normalize_dataframe with the previous implementation
+(rename one column at a time, per-element Analysis conversion, unhinted
+date parsing) on a generated frame shaped like an imported spreadsheet.
+
+Usage:
+    python tools/benchmark_normalize.py               # 1,000,000 rows
+    python tools/benchmark_normalize.py --rows 200000 --repeat 5
+
+Requirements:
+    - pandas, numpy
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Get the project root directory
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.data_model import DataModel, STD_COLUMNS, REQUIRED_COLUMNS
+
+def legacy_normalize(df):
+    """The normalization set_dataframe did before it was vectorized"""
+    model = DataModel()
+    df.columns = [col.strip() for col in df.columns]
+    for i, col in enumerate(df.columns):
+        lower_col = col.lower()
+        if lower_col in STD_COLUMNS:
+            df = df.rename(columns={col: STD_COLUMNS[lower_col]})
+
+    for col in REQUIRED_COLUMNS:
+        if col not in df.columns:
+            if col == 'Analysis':
+                df[col] = False
+            else:
+                df[col] = ''
+
+    df['DateOfSeparation'] = pd.to_datetime(df['DateOfSeparation'], errors='coerce')
+
+    if df['Analysis'].dtype == bool:
+        pass
+    elif df['Analysis'].dtype in [int, float]:
+        df['Analysis'] = df['Analysis'].astype(bool)
+    else:
+        df['Analysis'] = df['Analysis'].apply(model._str_to_bool)
+    return df
+
+def create_frame(rows, date_format):
+    """Build a raw frame with file-style headers and text values"""
+    rng = np.random.default_rng(42)
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 730, rows), unit='D')
+    return pd.DataFrame({
+        ' order ': [f"2000007{n:09d}" for n in rng.integers(0, 10**9, rows)],
+        'Separator Name': rng.choice(['Gabrieli', 'Eduardo', 'Maria', 'João', 'Ana'], rows),
+        'date': dates.strftime(date_format),
+        'analysis': rng.choice(['yes', 'no', 'True', 'false', '1', '0', ' Y '], rows),
+    })
+
+def best_time(func, frame, repeat):
+    """Best wall time of func over fresh copies of frame"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        df = frame.copy()
+        start = time.perf_counter()
+        result = func(df)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataModel.normalize_dataframe")
+    parser.add_argument('--rows', type=int, default=1000000, help="Rows in the generated frame")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'dates':<12}{'implementation':<16}{'seconds':>10}{'rows/s':>14}")
+    for label, date_format in (('yyyy-MM-dd', '%Y-%m-%d'), ('dd-MM-yyyy', '%d-%m-%Y')):
+        frame = create_frame(args.rows, date_format)
+
+        legacy_seconds, legacy_df = best_time(legacy_normalize, frame, args.repeat)
+        current_seconds, current_df = best_time(lambda df: DataModel().normalize_dataframe(df), frame, args.repeat)
+
+        for name, seconds in (('legacy', legacy_seconds), ('vectorized', current_seconds)):
+            print(f"{label:<12}{name:<16}{seconds:>10.3f}{args.rows / seconds:>14,.0f}")
+
+        # Flags must match exactly; dates are checked against the generated values
+        # (the legacy parser guesses month-first for ambiguous dd-MM-yyyy text)
+        assert (legacy_df['Analysis'] == current_df['Analysis']).all()
+        expected = pd.to_datetime(frame['date'], format=date_format)
+        legacy_wrong = int((legacy_df['DateOfSeparation'] != expected).sum())
+        current_wrong = int((current_df['DateOfSeparation'] != expected).sum())
+        print(f"{'':<12}speedup {legacy_seconds / current_seconds:.1f}x, "
+              f"wrong or missing dates: legacy {legacy_wrong}, vectorized {current_wrong}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Import Reader Benchmark for MPR Separator
+
+Times every installed reader engine on the same file, reading and normalizing
+it chunk by chunk the way the importer does, next to the old full
+pd.read_csv / pd.read_excel load, and checks that every engine produces the
+same records as the full load.
+
+Usage:
+    python tools/benchmark_readers.py                 # synthetic 50,000-row CSV and XLSX
+    python tools/benchmark_readers.py --rows 200000
+    python tools/benchmark_readers.py basePedidosSeparacao03_formatoBR.xlsx
+
+Requirements:
+    - pandas, openpyxl
+    - Optional: pyarrow, python-calamine
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Get the project root directory
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.data_model import DataModel
+from src.data.importer import DEFAULT_IMPORT_CHUNK_SIZE
+from src.data.readers import available_readers
+
+def create_sample_files(rows, directory):
+    """Write a CSV and an XLSX shaped like basePedidosSeparacao03_formatoBR.xlsx"""
+    rng = np.random.default_rng(42)
+    dates = pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+    created = pd.Timestamp('2025-05-23 18:51:13') + pd.to_timedelta(np.arange(rows), unit='ms')
+
+    df = pd.DataFrame({
+        # Numeric order numbers, stored by Excel as numbers (not text)
+        'OrderNumber': 2000007000000000 + rng.integers(0, 10**9, rows),
+        'SeparatorName': rng.choice(['Gabrieli', 'Eduardo', 'Maria', 'João', 'Ana'], rows),
+        # Brazilian dd-MM-yyyy text, as written by excel-date-converter.js
+        'DateOfSeparation': dates.strftime('%d-%m-%Y'),
+        'Analysis': rng.integers(0, 2, rows),
+        'CreatedAt': created.strftime('%d-%m-%Y %H:%M:%S.%f').str[:-3],
+    })
+
+    csv_path = os.path.join(directory, 'benchmark.csv')
+    xlsx_path = os.path.join(directory, 'benchmark.xlsx')
+    df.to_csv(csv_path, index=False)
+    df.to_excel(xlsx_path, index=False)
+    return [csv_path, xlsx_path]
+
+def time_full_load(file_path):
+    """Time the old path: load the whole file, then normalize it"""
+    start = time.perf_counter()
+    if file_path.endswith('.csv'):
+        df = pd.read_csv(file_path)
+    else:
+        df = pd.read_excel(file_path)
+    df = DataModel().normalize_dataframe(df)
+    return time.perf_counter() - start, len(df), int(df['DateOfSeparation'].isna().sum())
+
+def time_reader(reader, file_path, chunk_size):
+    """Time one reader engine, normalizing each chunk like the importer"""
+    data_model = DataModel()
+    rows = 0
+    missing_dates = 0
+    start = time.perf_counter()
+    for chunk, _ in reader.iter_chunks(file_path, chunk_size):
+        chunk = data_model.normalize_dataframe(chunk)
+        rows += len(chunk)
+        missing_dates += int(chunk['DateOfSeparation'].isna().sum())
+    return time.perf_counter() - start, rows, missing_dates
+
+def read_normalized(reader, file_path, chunk_size):
+    """Read a whole file with one engine and normalize it like the importer"""
+    data_model = DataModel()
+    chunks = [data_model.normalize_dataframe(chunk) for chunk, _ in reader.iter_chunks(file_path, chunk_size)]
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+def check_engines(file_path, chunk_size):
+    """Compare every engine's records with the full pd.read_csv / pd.read_excel load
+
+    Returns:
+        bool: True when every engine matches
+    """
+    if file_path.endswith('.csv'):
+        expected = pd.read_csv(file_path)
+    else:
+        expected = pd.read_excel(file_path)
+    expected = DataModel().normalize_dataframe(expected).astype(str)
+
+    all_match = True
+    for reader in available_readers(file_path):
+        actual = read_normalized(reader(), file_path, chunk_size).astype(str)
+        try:
+            pd.testing.assert_frame_equal(actual, expected[actual.columns], check_dtype=False)
+            print(f"{reader.name:<22}same records as the full load")
+        except AssertionError as e:
+            all_match = False
+            print(f"{reader.name:<22}DIFFERS from the full load: {e}")
+    return all_match
+
+def benchmark(file_path, chunk_size, repeat):
+    """Print the best of `repeat` runs for every engine able to read the file"""
+    print(f"\n{os.path.basename(file_path)} ({os.path.getsize(file_path) / 1024 / 1024:.1f} MB)")
+    print(f"{'engine':<22}{'seconds':>10}{'rows':>10}{'bad dates':>11}")
+
+    runs = [('full load (old)', lambda: time_full_load(file_path))]
+    for reader in available_readers(file_path):
+        runs.append((reader.name, lambda reader=reader: time_reader(reader(), file_path, chunk_size)))
+
+    for name, run in runs:
+        results = [run() for _ in range(repeat)]
+        seconds = min(result[0] for result in results)
+        _, rows, missing_dates = results[0]
+        print(f"{name:<22}{seconds:>10.3f}{rows:>10}{missing_dates:>11}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the import reader engines")
+    parser.add_argument('files', nargs='*', help="CSV or XLSX files (default: generated sample files)")
+    parser.add_argument('--rows', type=int, default=50000, help="Rows in the generated sample files")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_IMPORT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per engine (best is reported)")
+    args = parser.parse_args()
+
+    all_match = True
+    with tempfile.TemporaryDirectory() as directory:
+        files = args.files or create_sample_files(args.rows, directory)
+        for file_path in files:
+            benchmark(file_path, args.chunk_size, args.repeat)
+            all_match = check_engines(file_path, args.chunk_size) and all_match
+    return 0 if all_match else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
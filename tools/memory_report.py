@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Memory Report for MPR Separator
+
+Shows the bytes used by each record column before and after
+DataModel.compact_dataframe, for a CSV/XLSX file or for a generated frame
+shaped like a SQL Server result (object strings, int64 Id).
+
+Usage:
+    python tools/memory_report.py                    # 500,000 generated rows
+    python tools/memory_report.py --rows 1000000
+    python tools/memory_report.py sample_data.xlsx
+
+Requirements:
+    - pandas, numpy
+    - Optional: pyarrow (Arrow-backed OrderNumber strings)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Get the project root directory
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.data_model import DataModel, concat_chunks, memory_report
+from src.data.readers import iter_file_chunks
+
+def create_sql_frame(rows):
+    """Build a frame like pyodbc rows turned into a DataFrame"""
+    rng = np.random.default_rng(42)
+    names = [f"Separador {i:02d}" for i in range(40)]
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 730, rows), unit='D')
+    return pd.DataFrame({
+        'Id': np.arange(1, rows + 1, dtype=np.int64),
+        'OrderNumber': np.array([f"2000007{n:09d}" for n in rng.integers(0, 10**9, rows)], dtype=object),
+        'SeparatorName': np.array(rng.choice(names, rows), dtype=object),
+        'DateOfSeparation': dates,
+        'Analysis': rng.integers(0, 2, rows).astype(bool),
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-column memory before and after compaction")
+    parser.add_argument('file', nargs='?', help="CSV or XLSX file (default: generated SQL-like rows)")
+    parser.add_argument('--rows', type=int, default=500000, help="Rows in the generated frame")
+    args = parser.parse_args()
+
+    if args.file:
+        df = concat_chunks(chunk for chunk, _ in iter_file_chunks(args.file, 50000))
+    else:
+        df = create_sql_frame(args.rows)
+
+    model = DataModel()
+    before = model.normalize_dataframe(df.copy(), compact=False)
+    after = model.compact_dataframe(before.copy())
+
+    print(f"{len(after):,} rows")
+    print(memory_report(before, after))
+
+if __name__ == "__main__":
+    main()